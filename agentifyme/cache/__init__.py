@@ -0,0 +1,21 @@
+from .base import MISSING, Cache, CacheStats, CacheType, EvictionPolicy, NoCache
+from .coalesce import Coalescer
+from .decorator import cache, cache_factory
+from .disk import DiskCache
+from .keys import make_key
+from .memory import MemoryCache
+
+__all__ = [
+    "MISSING",
+    "Cache",
+    "CacheStats",
+    "CacheType",
+    "Coalescer",
+    "DiskCache",
+    "EvictionPolicy",
+    "MemoryCache",
+    "NoCache",
+    "cache",
+    "cache_factory",
+    "make_key",
+]
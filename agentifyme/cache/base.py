@@ -0,0 +1,186 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Generic, TypeVar
+
+try:
+    from opentelemetry import metrics
+
+    meter = metrics.get_meter("agentifyme.cache")
+    cache_hits = meter.create_counter("cache.hits", description="Number of cache lookups that found a value")
+    cache_misses = meter.create_counter("cache.misses", description="Number of cache lookups that found no value")
+    cache_evictions = meter.create_counter("cache.evictions", description="Number of entries evicted to stay within cache bounds")
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+T = TypeVar("T")
+
+
+class CacheType(str, Enum):
+    """Cache types."""
+
+    MEMORY = "memory"
+    DISK = "disk"
+    NONE = "none"
+
+
+class EvictionPolicy(str, Enum):
+    """Which entry is evicted first when a cache is over its bounds."""
+
+    LRU = "lru"  # least recently used
+    LFU = "lfu"  # least frequently used
+    TTL = "ttl"  # closest to expiring
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+MISSING: Any = _Missing()
+"""Sentinel returned by `Cache.lookup` on a miss, so that `None` can be cached."""
+
+
+@dataclass
+class CacheStats:
+    """Counters kept by every cache instance.
+
+    Attributes:
+        hits (int): Lookups that found a value.
+        misses (int): Lookups that found no value, including expired entries.
+        evictions (int): Entries removed to stay within the size bounds.
+        expirations (int): Entries removed because their TTL passed.
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Cache(ABC, Generic[T]):
+    """Abstract base class for cache implementations.
+
+    Backends implement `lookup`, `set`, `delete` and `clear`. `get` and the async
+    methods are built on top of them. Backends doing blocking I/O override `alookup`
+    and `aset` to run it off the event loop.
+
+    Args:
+        name (str): Name reported as the `cache` attribute on telemetry counters.
+
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self.stats = CacheStats()
+        self._attributes = {"cache": name, "backend": type(self).__name__}
+
+    @abstractmethod
+    def lookup(self, key: str) -> T | Any:
+        """Retrieve a value from the cache.
+
+        Args:
+            key: The key associated with the value to retrieve.
+
+        Returns:
+            The cached value, or `MISSING` if the key is not in the cache or has expired.
+
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        """Set a value in the cache.
+
+        Args:
+            key: The key to associate with the value.
+            value: The value to store in the cache. `None` is a valid value.
+            ttl: Seconds until the entry expires, overriding the cache default.
+
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove a key from the cache, returning whether it was present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+
+    def get(self, key: str, default: T | None = None) -> T | None:
+        """Retrieve a value from the cache, returning `default` on a miss."""
+        value = self.lookup(key)
+        return default if value is MISSING else value
+
+    def __contains__(self, key: str) -> bool:
+        return self.lookup(key) is not MISSING
+
+    def lookup_many(self, keys: list[str]) -> list[T | Any]:
+        """Retrieve the values of `keys`, in order, with `MISSING` for each miss."""
+        return [self.lookup(key) for key in keys]
+
+    def set_many(self, items: dict[str, T], ttl: float | None = None) -> None:
+        """Set several values in the cache."""
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    async def alookup(self, key: str) -> T | Any:
+        return self.lookup(key)
+
+    async def alookup_many(self, keys: list[str]) -> list[T | Any]:
+        return self.lookup_many(keys)
+
+    async def aset_many(self, items: dict[str, T], ttl: float | None = None) -> None:
+        self.set_many(items, ttl)
+
+    async def aget(self, key: str, default: T | None = None) -> T | None:
+        value = await self.alookup(key)
+        return default if value is MISSING else value
+
+    async def aset(self, key: str, value: T, ttl: float | None = None) -> None:
+        self.set(key, value, ttl)
+
+    def _record_hit(self) -> None:
+        self.stats.hits += 1
+        if OTEL_AVAILABLE:
+            cache_hits.add(1, self._attributes)
+
+    def _record_miss(self) -> None:
+        self.stats.misses += 1
+        if OTEL_AVAILABLE:
+            cache_misses.add(1, self._attributes)
+
+    def _record_eviction(self, count: int = 1) -> None:
+        self.stats.evictions += count
+        if OTEL_AVAILABLE:
+            cache_evictions.add(count, self._attributes)
+
+
+class NoCache(Cache[T]):
+    """A cache implementation that does not store any values.
+
+    Every lookup is a miss and `set` does nothing.
+    """
+
+    def lookup(self, key: str) -> Any:
+        self._record_miss()
+        return MISSING
+
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        pass
+
+    def delete(self, key: str) -> bool:
+        return False
+
+    def clear(self) -> None:
+        pass
@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# set as the result when the caller making the call is cancelled, so waiters take over
+_RETRY = object()
+
+
+class Coalescer(Generic[T]):
+    """Shares one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key makes the call and the others wait for its result, or
+    its exception. If that caller is cancelled, the waiters aren't: one of them makes
+    the call instead.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        store: Callable[[T], Awaitable[None]] | None = None,
+    ) -> tuple[T, bool]:
+        """Return the result of `call`, made once for all concurrent callers with `key`.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            call: Makes the call.
+            store: Saves the result, e.g. to a cache. Waiters get the result before it
+                is stored, and a failure to store it is logged, not raised.
+
+        Returns:
+            tuple[T, bool]: The result, and whether it came from another caller's call.
+
+        """
+        while (inflight := self._inflight.get(key)) is not None:
+            result = await asyncio.shield(inflight)
+            if result is not _RETRY:
+                return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                future.set_result(_RETRY)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Waiters re-raise the exception; keep the loop from warning when there are none.
+                future.exception()
+                raise
+            future.set_result(result)
+
+            if store is not None:
+                try:
+                    await store(result)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning(f"Failed to store the result for {key}: {e}")
+            return result, False
+        finally:
+            del self._inflight[key]
@@ -0,0 +1,110 @@
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from .base import MISSING, Cache, CacheType, NoCache
+from .coalesce import Coalescer
+from .disk import DiskCache
+from .keys import make_key
+from .memory import MemoryCache
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def cache_factory(cache_type: CacheType, **options: Any) -> Cache[Any]:
+    """Factory function to create a cache based on the given cache_type.
+
+    Args:
+        cache_type (CacheType): The type of cache to create.
+        **options: Passed to the cache constructor, e.g. `max_entries`, `max_bytes` or `ttl`.
+
+    Returns:
+        Cache: An instance of the cache based on the cache_type.
+
+    """
+    if cache_type == CacheType.MEMORY:
+        return MemoryCache(**options)
+    if cache_type == CacheType.DISK:
+        return DiskCache(**options)
+
+    # default to no cache
+    return NoCache()
+
+
+def cache(
+    cache_type: CacheType = CacheType.NONE,
+    *,
+    ttl: float | None = None,
+    negative_ttl: float | None = None,
+    cache_none: bool = True,
+    cache_instance: Cache[Any] | None = None,
+    **options: Any,
+) -> Callable[[F], F]:
+    """Decorator that caches the result of a function based on its arguments.
+
+    Works with both regular and coroutine functions. For coroutine functions, concurrent
+    calls with the same arguments share a single call instead of all missing the cache.
+
+    Args:
+        cache_type (CacheType, optional): The type of cache to use. Defaults to CacheType.NONE.
+        ttl (float | None): Seconds until a cached result expires.
+        negative_ttl (float | None): Seconds until a cached `None` result expires. Defaults to `ttl`.
+        cache_none (bool): Whether `None` results are cached at all.
+        cache_instance (Cache | None): Use this cache instead of creating one from `cache_type`.
+        **options: Passed to `cache_factory`.
+
+    Returns:
+        Callable[[F], F]: The decorated function.
+
+    """
+
+    def decorator(func: F) -> F:
+        _cache: Cache[Any] = cache_instance if cache_instance is not None else cache_factory(cache_type, **options)
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        def build_key(args: tuple, kwargs: dict) -> str:
+            # Exclude 'self' from args if present
+            if args and hasattr(args[0], func.__name__):
+                args = args[1:]
+            return make_key(prefix, *args, **kwargs)
+
+        def result_ttl(result: Any) -> float | None:
+            return negative_ttl if result is None and negative_ttl is not None else ttl
+
+        if inspect.iscoroutinefunction(func):
+            coalescer: Coalescer[Any] = Coalescer()
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = build_key(args, kwargs)
+                result = await _cache.alookup(key)
+                if result is not MISSING:
+                    return result
+
+                async def store(result: Any) -> None:
+                    if result is not None or cache_none:
+                        await _cache.aset(key, result, result_ttl(result))
+
+                result, _ = await coalescer.run(key, lambda: func(*args, **kwargs), store)
+                return result
+
+            async_wrapper.cache = _cache  # type: ignore[attr-defined]
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = build_key(args, kwargs)
+            result = _cache.lookup(key)
+            if result is not MISSING:
+                return result
+
+            result = func(*args, **kwargs)
+            if result is not None or cache_none:
+                _cache.set(key, result, result_ttl(result))
+            return result
+
+        wrapper.cache = _cache  # type: ignore[attr-defined]
+        return wrapper  # type: ignore
+
+    return decorator
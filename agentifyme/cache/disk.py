@@ -0,0 +1,183 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .base import MISSING, Cache, T
+
+
+class DiskCache(Cache[T]):
+    """A disk-based cache storing one pickle file per key.
+
+    Files are sharded into two levels of sub-directories by the hash of the key, so no
+    single directory grows too large. Writes go to a temporary file in the same shard
+    and are atomically renamed into place, so concurrent readers - including other
+    processes sharing the directory - never see a partial entry.
+
+    The cache keeps an index of entry sizes in least recently used order, built from
+    the files already on disk at start up, and evicts from it when `max_entries` or
+    `max_bytes` is exceeded. Async methods run the file I/O in a worker thread.
+
+    Args:
+        cache_dir (str): The directory where the cache files are stored.
+        max_entries (int | None): Maximum number of entries. None means unbounded.
+        max_bytes (int | None): Maximum total size of the cache files. None means unbounded.
+        ttl (float | None): Default seconds until an entry expires. None means never.
+        name (str): Name reported on telemetry counters.
+
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "/tmp/agentifyme-cache",
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        name: str = "disk",
+    ):
+        super().__init__(name)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _digest(self, key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], digest[2:4], digest)
+
+    def _load_index(self) -> None:
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    # left over from an interrupted write
+                    os.unlink(path)
+                    continue
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name, stat.st_size))
+
+        for _, digest, size in sorted(files):
+            self._index[digest] = size
+            self._size += size
+
+    def lookup(self, key: str) -> T | Any:
+        digest = self._digest(key)
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            self._record_miss()
+            return MISSING
+        except (pickle.UnpicklingError, EOFError, ValueError):
+            self._remove(digest)
+            self._record_miss()
+            return MISSING
+
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(digest)
+            self.stats.expirations += 1
+            self._record_miss()
+            return MISSING
+
+        with self._lock:
+            if digest in self._index:
+                self._index.move_to_end(digest)
+        self._record_hit()
+        return value
+
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+
+        digest = self._digest(key)
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._size += len(data) - self._index.pop(digest, 0)
+            self._index[digest] = len(data)
+            victims = self._victims()
+
+        for victim in victims:
+            self._unlink(victim)
+        if victims:
+            self._record_eviction(len(victims))
+
+    def delete(self, key: str) -> bool:
+        digest = self._digest(key)
+        existed = os.path.exists(self._path(digest))
+        self._remove(digest)
+        return existed
+
+    def clear(self) -> None:
+        with self._lock:
+            digests = list(self._index)
+            self._index.clear()
+            self._size = 0
+        for digest in digests:
+            self._unlink(digest)
+
+    async def alookup(self, key: str) -> T | Any:
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def aset(self, key: str, value: T, ttl: float | None = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def alookup_many(self, keys: list[str]) -> list[T | Any]:
+        return await asyncio.to_thread(self.lookup_many, keys)
+
+    async def aset_many(self, items: dict[str, T], ttl: float | None = None) -> None:
+        await asyncio.to_thread(self.set_many, items, ttl)
+
+    def _victims(self) -> list[str]:
+        victims = []
+        while self._index and (
+            (self.max_entries is not None and len(self._index) > self.max_entries) or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            digest, size = self._index.popitem(last=False)
+            self._size -= size
+            victims.append(digest)
+        return victims
+
+    def _remove(self, digest: str) -> None:
+        with self._lock:
+            self._size -= self._index.pop(digest, 0)
+        self._unlink(digest)
+
+    def _unlink(self, digest: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path(digest))
@@ -0,0 +1,33 @@
+import hashlib
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return {"__model__": type(obj).__qualname__, **obj.model_dump(mode="json")}
+    if isinstance(obj, set | frozenset):
+        return sorted(obj, key=lambda item: orjson.dumps(item, default=_default, option=_OPTIONS))
+    if isinstance(obj, bytes):
+        return obj.hex()
+    raise TypeError(f"Cannot build a stable cache key from {type(obj).__name__}")
+
+
+def make_key(*args: Any, **kwargs: Any) -> str:
+    """Build a stable hash of positional and keyword arguments.
+
+    Arguments are serialized with orjson using sorted keys, so equal dicts produce the
+    same key regardless of insertion order. Pydantic models are keyed on their dumped
+    fields, and sets are sorted. Objects with no stable serialization raise a
+    `TypeError` instead of falling back to `repr`, which could embed a memory address.
+
+    Returns:
+        str: Hex encoded SHA-256 digest.
+
+    """
+    payload = orjson.dumps([args, kwargs], default=_default, option=_OPTIONS)
+    return hashlib.sha256(payload).hexdigest()
@@ -0,0 +1,236 @@
+import heapq
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .base import MISSING, Cache, EvictionPolicy, T
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by `value` in bytes"""
+    if isinstance(value, bytes | bytearray | memoryview):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float | None
+
+
+class _LRUOrder:
+    """Evicts the least recently used key"""
+
+    def __init__(self):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def insert(self, key: str, entry: _Entry) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def access(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+
+class _LFUOrder:
+    """Evicts the least frequently used key, oldest first among equal counts"""
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+        self._buckets: defaultdict[int, OrderedDict[str, None]] = defaultdict(OrderedDict)
+        self._min_count = 0
+
+    def insert(self, key: str, entry: _Entry) -> None:
+        self._counts[key] = 1
+        self._buckets[1][key] = None
+        self._min_count = 1
+
+    def access(self, key: str) -> None:
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets[count + 1][key] = None
+
+    def remove(self, key: str) -> None:
+        count = self._counts.pop(key, None)
+        if count is None:
+            return
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count and self._buckets:
+                self._min_count = min(self._buckets)
+
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_count]))
+
+
+class _TTLOrder:
+    """Evicts the key closest to expiring; keys without a TTL go last, oldest first"""
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []
+        self._current: dict[str, int] = {}
+        self._counter = 0
+
+    def insert(self, key: str, entry: _Entry) -> None:
+        self._counter += 1
+        self._current[key] = self._counter
+        expires_at = entry.expires_at if entry.expires_at is not None else float("inf")
+        heapq.heappush(self._heap, (expires_at, self._counter, key))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [item for item in self._heap if self._current.get(item[2]) == item[1]]
+            heapq.heapify(self._heap)
+
+    def access(self, key: str) -> None:
+        pass
+
+    def remove(self, key: str) -> None:
+        self._current.pop(key, None)
+
+    def victim(self) -> str:
+        # Heap entries for removed or overwritten keys are discarded lazily
+        while True:
+            _, counter, key = self._heap[0]
+            if self._current.get(key) == counter:
+                return key
+            heapq.heappop(self._heap)
+
+
+_ORDERS = {
+    EvictionPolicy.LRU: _LRUOrder,
+    EvictionPolicy.LFU: _LFUOrder,
+    EvictionPolicy.TTL: _TTLOrder,
+}
+
+
+class MemoryCache(Cache[T]):
+    """A thread-safe in-memory cache bounded by entry count, size and TTL.
+
+    Args:
+        max_entries (int | None): Maximum number of entries. None means unbounded.
+        max_bytes (int | None): Maximum estimated size of all values. None means unbounded.
+        ttl (float | None): Default seconds until an entry expires. None means never.
+        policy (EvictionPolicy): Which entry to evict when a bound is exceeded.
+        sizeof (Callable[[Any], int]): Estimates the size of a value, used with `max_bytes`.
+        name (str): Name reported on telemetry counters.
+
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        policy: EvictionPolicy | str = EvictionPolicy.LRU,
+        sizeof: Callable[[Any], int] = estimate_size,
+        name: str = "memory",
+    ):
+        super().__init__(name)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = EvictionPolicy(policy)
+        self.sizeof = sizeof
+
+        self._entries: dict[str, _Entry] = {}
+        self._order = _ORDERS[self.policy]()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated size of all values, only tracked when `max_bytes` is set."""
+        return self._size
+
+    def lookup(self, key: str) -> T | Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._record_miss()
+                return MISSING
+
+            if entry.expires_at is not None and entry.expires_at <= time.time():
+                self._remove(key)
+                self.stats.expirations += 1
+                self._record_miss()
+                return MISSING
+
+            self._order.access(key)
+            self._record_hit()
+            return entry.value
+
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Would evict everything else and still not fit
+            self.delete(key)
+            return
+
+        entry = _Entry(value=value, size=size, expires_at=time.time() + ttl if ttl is not None else None)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._size += size
+            self._order.insert(key, entry)
+            self._evict()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._order = _ORDERS[self.policy]()
+            self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        self._order.remove(key)
+
+    def _over_bounds(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._size > self.max_bytes
+
+    def _evict(self) -> None:
+        evicted = 0
+        while self._entries and self._over_bounds():
+            self._remove(self._order.victim())
+            evicted += 1
+        if evicted:
+            self._record_eviction(evicted)
@@ -0,0 +1,210 @@
+import types
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from inspect import Parameter, Signature, signature
+from numbers import Number
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+
+def _is_union(tp: Any) -> bool:
+    origin = get_origin(tp)
+    return origin is Union or origin is types.UnionType
+
+
+def _convert_numeric(value: Any, target_type: type) -> Number:
+    """Convert a value to a numeric type with validation."""
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            if issubclass(target_type, int):
+                float_val = float(value)
+                if float_val.is_integer():
+                    return int(float_val)
+                raise ValueError(f"Float value {value} cannot be converted to integer without loss")
+            if issubclass(target_type, float):
+                return float(value)
+            if issubclass(target_type, Decimal):
+                return Decimal(value)
+        except (ValueError, InvalidOperation) as e:
+            raise ValueError(f"Cannot convert {value} to {target_type.__name__}: {str(e)}") from e
+
+    if isinstance(value, Number):
+        if issubclass(target_type, int) and isinstance(value, float):
+            if value.is_integer():
+                return int(value)
+            raise ValueError(f"Float value {value} cannot be converted to integer without loss")
+        return target_type(value)
+
+    raise ValueError(f"Cannot convert {type(value).__name__} to {target_type.__name__}")
+
+
+def _convert_dict_values(value: dict, type_hints: Any) -> dict:
+    """Convert dictionary values based on type hints."""
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected dict but got {type(value).__name__}")
+
+    dict_types = get_args(type_hints)
+    if not dict_types:
+        return value
+
+    key_type, value_type = dict_types
+    result = {}
+
+    for key, item in value.items():
+        k = key_type(key) if key_type is not Any and not isinstance(key, key_type) else key
+
+        if value_type is Any:
+            v = item
+        elif get_origin(value_type) is dict:
+            v = _convert_dict_values(item, value_type)
+        elif _is_union(value_type):
+            v = _convert_union_type(item, get_args(value_type))
+        elif value_type in (int, float, Decimal):
+            v = _convert_numeric(item, value_type)
+        elif not isinstance(item, value_type):
+            v = value_type(item)
+        else:
+            v = item
+
+        result[k] = v
+
+    return result
+
+
+def _convert_union_type(value: Any, union_types: tuple) -> Any:
+    """Convert a value to one of the possible union types."""
+    errors = []
+    for possible_type in union_types:
+        if possible_type is type(None):
+            continue
+        try:
+            if possible_type in (int, float, Decimal):
+                return _convert_numeric(value, possible_type)
+            return possible_type(value)
+        except (ValueError, TypeError) as e:
+            errors.append(str(e))
+    raise ValueError(f"Could not convert value to any of {union_types}: {'; '.join(errors)}")
+
+
+def _convert_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value
+
+
+def _convert_plain_dict(value: Any) -> dict:
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected dict but got {type(value).__name__}")
+    return value
+
+
+def compile_converter(param_type: Any) -> Callable[[Any], Any]:
+    """Resolve the conversion for `param_type` once, returning a function of the value only."""
+    # Handle dict type - check before any conversion
+    if param_type is dict:
+        return _convert_plain_dict
+    if get_origin(param_type) is dict:
+        return lambda value: _convert_dict_values(value, param_type)
+
+    if hasattr(param_type, "model_validate"):
+        return param_type.model_validate
+    if param_type == datetime:
+        return _convert_datetime
+    if param_type in (int, float, Decimal):
+        return lambda value: _convert_numeric(value, param_type)
+    if get_origin(param_type) is list and get_args(param_type) and get_args(param_type)[0] in (int, float, Decimal):
+        item_type = get_args(param_type)[0]
+        return lambda value: [_convert_numeric(item, item_type) for item in value]
+    if _is_union(param_type):
+        union_types = get_args(param_type)
+        return lambda value: _convert_union_type(value, union_types)
+    return param_type
+
+
+@dataclass(frozen=True, slots=True)
+class ParamPlan:
+    """How to build one argument from request input."""
+
+    name: str
+    param_type: Any
+    convert: Callable[[Any], Any]
+    has_default: bool
+    optional: bool
+
+
+class ArgumentPlan:
+    """Precomputed argument handling for a workflow or task function.
+
+    Holds the function's signature, return type and a converter per type-hinted
+    parameter, so building arguments for a request doesn't repeat any introspection.
+    """
+
+    __slots__ = ("__weakref__", "params", "return_type", "signature")
+
+    def __init__(self, func: Callable):
+        self.signature: Signature = signature(func)
+        type_hints = get_type_hints(func)
+        self.return_type: Any = type_hints.pop("return", None)
+
+        params = []
+        for param_name, param in self.signature.parameters.items():
+            param_type = type_hints.get(param_name)
+            if not param_type:
+                continue
+            params.append(
+                ParamPlan(
+                    name=param_name,
+                    param_type=param_type,
+                    convert=compile_converter(param_type),
+                    has_default=param.default is not Parameter.empty,
+                    optional=_is_union(param_type) and type(None) in get_args(param_type),
+                ),
+            )
+        self.params: tuple[ParamPlan, ...] = tuple(params)
+
+    def build(self, input_dict: dict[str, Any]) -> dict[str, Any]:
+        """Build function arguments from `input_dict`, converting values to the annotated types."""
+        args = {}
+        for param in self.params:
+            name = param.name
+            if name not in input_dict:
+                if param.has_default:
+                    continue
+                value = None
+            else:
+                value = input_dict[name]
+
+            if value is None:
+                if param.optional or param.has_default:
+                    args[name] = None
+                    continue
+                raise ValueError(f"Required parameter {name} cannot be None")
+
+            try:
+                args[name] = param.convert(value)
+            except ValueError as e:
+                # Use the original error message directly
+                raise ValueError(str(e)) from e
+
+        return args
+
+
+_plans: "weakref.WeakKeyDictionary[Callable, ArgumentPlan]" = weakref.WeakKeyDictionary()
+
+
+def get_argument_plan(func: Callable) -> ArgumentPlan:
+    """Return the argument plan for `func`, compiling it on first use."""
+    try:
+        return _plans[func]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak-referenceable, e.g. some builtins
+        return ArgumentPlan(func)
+
+    plan = ArgumentPlan(func)
+    _plans[func] = plan
+    return plan
@@ -3,11 +3,11 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable
 from contextlib import contextmanager
 from dataclasses import dataclass
-from inspect import signature
 from typing import Any, ClassVar
 
 from loguru import logger
 
+from agentifyme.components.arguments import ArgumentPlan, get_argument_plan
 from agentifyme.errors import (
     AgentifyMeError,
     AgentifyMeValidationError,
@@ -44,6 +44,7 @@ class BaseConfig:
 
         if name and name not in cls._registry:
             cls._registry[name] = component
+            component.config.compile_argument_plan()
 
     @classmethod
     def reset_registry(cls):
@@ -89,6 +90,21 @@ class BaseConfig:
         """
         return cls._registry
 
+    @property
+    def argument_plan(self) -> ArgumentPlan | None:
+        """Precomputed signature, type hints and argument converters of `func`."""
+        if self.func is None:
+            return None
+        return get_argument_plan(self.func)
+
+    def compile_argument_plan(self) -> None:
+        """Build the argument plan up front so that requests don't pay for it."""
+        try:
+            _ = self.argument_plan
+        except NameError as e:
+            # Forward references that can't be resolved yet; the plan is built on first use instead.
+            logger.debug(f"Deferring argument plan for {self.name}: {e}")
+
     def to_dict(self) -> dict[str, Any]:
         """Convert the component to a dictionary."""
         return {"name": self.config.name, "slug": self.config.slug, "description": self.config.description, "is_async": self.config.is_async}
@@ -154,7 +170,7 @@ class RunnableComponent(BaseComponent):
         if not self.config.func:
             return
 
-        sig = signature(self.config.func)
+        sig = self.config.argument_plan.signature
         try:
             sig.bind(**prepared_kwargs)
         except TypeError as e:
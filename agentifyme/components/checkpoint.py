@@ -0,0 +1,180 @@
+import asyncio
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+
+from agentifyme.cache import MISSING, make_key
+
+# seconds a checkpoint is kept, for runs that are never retried or completed
+DEFAULT_CHECKPOINT_TTL = 7 * 24 * 60 * 60
+
+
+class CheckpointStore(ABC):
+    """Durable storage for the outputs of completed tasks, grouped by workflow run."""
+
+    @abstractmethod
+    def get(self, run_id: str, key: str) -> Any:
+        """Return the output stored for `key` in the run, or `MISSING`."""
+
+    @abstractmethod
+    def put(self, run_id: str, key: str, value: Any) -> None:
+        """Store the output for `key` in the run."""
+
+    @abstractmethod
+    def clear(self, run_id: str) -> None:
+        """Delete everything stored for the run."""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """A checkpoint store backed by a SQLite database file.
+
+    Outputs are pickled like the disk cache entries. The database uses write-ahead
+    logging, so worker processes sharing the file don't block each other's reads, and
+    every `put` is committed before it returns.
+
+    Args:
+        path (str): Path of the database file, created if it doesn't exist.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (run_id TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (run_id, key))",
+            )
+
+    def get(self, run_id: str, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM checkpoints WHERE run_id = ? AND key = ?", (run_id, key)).fetchone()
+        if row is None:
+            return MISSING
+        try:
+            return pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {key} of run {run_id}: {e}")
+            return MISSING
+
+    def put(self, run_id: str, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, key, data, time.time()),
+            )
+
+    def clear(self, run_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+
+    def prune(self, older_than: float) -> int:
+        """Delete checkpoints written more than `older_than` seconds ago, returning how many."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (time.time() - older_than,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RunJournal:
+    """Records task outputs of one workflow run and replays them when the run is retried.
+
+    A task call is identified by the task name, a hash of its arguments and how many
+    calls with the same name and arguments came before it in the run. A retried run
+    that makes the same calls in the same order gets the recorded outputs back instead
+    of running the tasks again. Runs aren't retried locally: a retry is a new delivery
+    of the run, with the same run id, by the gateway.
+
+    Args:
+        run_id (str): The workflow run.
+        store (CheckpointStore): Where outputs are recorded.
+
+    """
+
+    def __init__(self, run_id: str, store: CheckpointStore):
+        self.run_id = run_id
+        self.store = store
+        self.replayed = 0
+        self.recorded = 0
+        self._occurrences: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def key(self, task_name: str, kwargs: dict[str, Any]) -> str | None:
+        """Return the checkpoint key of the next call, or None if its arguments can't be hashed."""
+        try:
+            digest = make_key(**kwargs)
+        except TypeError:
+            return None
+
+        call = f"{task_name}:{digest}"
+        # sync tasks may run in worker threads of the same run
+        with self._lock:
+            occurrence = self._occurrences.get(call, 0)
+            self._occurrences[call] = occurrence + 1
+        return f"{call}:{occurrence}"
+
+    def replay(self, key: str) -> Any:
+        value = self.store.get(self.run_id, key)
+        if value is not MISSING:
+            self.replayed += 1
+        return value
+
+    def record(self, key: str, value: Any) -> None:
+        try:
+            self.store.put(self.run_id, key, value)
+            self.recorded += 1
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            # the run carries on, this call just won't be replayed
+            logger.warning(f"Could not checkpoint {key} of run {self.run_id}: {e}")
+
+    async def areplay(self, key: str) -> Any:
+        """Like `replay`, reading the store from a worker thread."""
+        return await asyncio.to_thread(self.replay, key)
+
+    async def arecord(self, key: str, value: Any) -> None:
+        """Like `record`, writing to the store from a worker thread."""
+        await asyncio.to_thread(self.record, key, value)
+
+
+_journal: ContextVar[RunJournal | None] = ContextVar("checkpoint_journal", default=None)
+
+
+def get_journal() -> RunJournal | None:
+    """Return the journal of the run in progress, if it is checkpointed."""
+    return _journal.get()
+
+
+@contextmanager
+def checkpointed_run(run_id: str, store: CheckpointStore | None) -> Iterator[RunJournal | None]:
+    """Checkpoint the task calls made inside the block as part of run `run_id`.
+
+    Does nothing if `store` is None.
+    """
+    if store is None:
+        yield None
+        return
+
+    journal = RunJournal(run_id, store)
+    token = _journal.set(journal)
+    try:
+        yield journal
+    finally:
+        _journal.reset(token)
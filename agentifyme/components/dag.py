@@ -0,0 +1,273 @@
+import asyncio
+import contextvars
+import functools
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any
+
+from agentifyme.components.task import Task, TaskConfig
+from agentifyme.errors import (
+    AgentifyMeError,
+    AgentifyMeValidationError,
+    ErrorCategory,
+    ErrorContext,
+    ErrorSeverity,
+)
+
+from .utils import DependencyCycleError, find_cycle
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import Status, StatusCode
+
+    tracer = trace.get_tracer("agentifyme.components")
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+
+def dependency_argument(name: str) -> str:
+    """Name of the parameter that receives the output of the task `name`."""
+    return name.replace("-", "_")
+
+
+@dataclass
+class DagResult:
+    """Outcome of running a task graph.
+
+    Attributes:
+        outputs (dict[str, Any]): Output of every task that succeeded.
+        errors (dict[str, BaseException]): Exception of every task that failed.
+        skipped (list[str]): Tasks not run because a dependency failed.
+        durations (dict[str, float]): Run time of every task that ran, in seconds.
+        critical_path (list[str]): The chain of tasks that determined the total run time.
+        critical_path_duration (float): Time from the start of the run until the last task on the critical path finished.
+
+    """
+
+    outputs: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    durations: dict[str, float] = field(default_factory=dict)
+    critical_path: list[str] = field(default_factory=list)
+    critical_path_duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.skipped
+
+    def raise_for_errors(self) -> None:
+        """Raise an `AgentifyMeError` if any task failed, chained to the first failure."""
+        if not self.errors:
+            return
+        name, error = next(iter(self.errors.items()))
+        raise AgentifyMeError(
+            message=f"{len(self.errors)} tasks failed and {len(self.skipped)} were skipped, first failure in {name}: {error}",
+            error_code="TASK_GRAPH_FAILED",
+            category=ErrorCategory.EXECUTION,
+            severity=ErrorSeverity.ERROR,
+            context=ErrorContext(component_type="task", component_id=name),
+            execution_state={"failed": list(self.errors), "skipped": self.skipped},
+        ) from error
+
+
+class TaskGraph:
+    """Runs tasks in dependency order, concurrently where the dependencies allow.
+
+    Every task starts as soon as all of its dependencies have succeeded. A task
+    receives the output of each dependency as the parameter named after it, with
+    hyphens replaced by underscores, and any of the run inputs its signature accepts.
+    When a task fails, the tasks depending on it are skipped and the rest carry on.
+
+    Async tasks run on the event loop; sync tasks run on `executor`, or the default
+    thread pool if none is given.
+
+    Args:
+        tasks (dict[str, Task]): The tasks of the graph by name. Every dependency must be one of them.
+
+    Raises:
+        AgentifyMeValidationError: If a task depends on a task missing from the graph.
+        DependencyCycleError: If the dependencies form a cycle.
+
+    """
+
+    def __init__(self, tasks: dict[str, Task]):
+        self.tasks = tasks
+        self.dependencies = {name: list(task.config.dependencies) for name, task in tasks.items()}
+
+        for name, dependencies in self.dependencies.items():
+            missing = [dependency for dependency in dependencies if dependency not in tasks]
+            if missing:
+                raise AgentifyMeValidationError(
+                    message=f"Task {name} depends on unknown tasks: {', '.join(missing)}",
+                    error_code="UNKNOWN_TASK_DEPENDENCY",
+                    category=ErrorCategory.VALIDATION,
+                    context=ErrorContext(component_type="task", component_id=name),
+                )
+
+        cycle = find_cycle(self.dependencies)
+        if cycle:
+            raise DependencyCycleError(cycle)
+
+        self.dependents: dict[str, list[str]] = {name: [] for name in tasks}
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                self.dependents[dependency].append(name)
+
+    @classmethod
+    def from_registry(cls, targets: Iterable[str] | None = None) -> "TaskGraph":
+        """Build the graph of the registered tasks, or of `targets` and everything they depend on."""
+        registry = {name: component for name, component in TaskConfig.get_registry().items() if component.component_type == "task"}
+        if targets is None:
+            return cls(registry)
+
+        tasks = {}
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name in tasks:
+                continue
+            # unknown names are reported by the constructor
+            tasks[name] = TaskConfig.get(name)
+            pending.extend(dependency for dependency in tasks[name].config.dependencies if dependency in registry)
+        return cls(tasks)
+
+    def topological_order(self) -> list[str]:
+        """Return the task names ordered so that every task comes after its dependencies."""
+        remaining = {name: len(dependencies) for name, dependencies in self.dependencies.items()}
+        order = [name for name, count in remaining.items() if count == 0]
+        for name in order:
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+        return order
+
+    def _arguments(self, name: str, inputs: dict[str, Any], outputs: dict[str, Any]) -> dict[str, Any]:
+        parameters = self.tasks[name].config.argument_plan.signature.parameters
+        kwargs = {key: value for key, value in inputs.items() if key in parameters}
+        for dependency in self.dependencies[name]:
+            argument = dependency_argument(dependency)
+            if argument in parameters:
+                kwargs[argument] = outputs[dependency]
+        return kwargs
+
+    async def _run_task(self, name: str, kwargs: dict[str, Any], executor: Executor | None) -> Any:
+        task = self.tasks[name]
+        if task.config.is_async:
+            return await task.arun(**kwargs)
+        loop = asyncio.get_running_loop()
+        # carry the context over, like asyncio.to_thread does
+        call = functools.partial(contextvars.copy_context().run, task.run, **kwargs)
+        return await loop.run_in_executor(executor, call)
+
+    async def _run_node(self, name: str, kwargs: dict[str, Any], executor: Executor | None, result: DagResult) -> None:
+        if not OTEL_AVAILABLE:
+            result.outputs[name] = await self._run_task(name, kwargs, executor)
+            return
+
+        # the span records the exception and error status if the task fails
+        with tracer.start_as_current_span(name, attributes={"task.name": name, "dag.dependencies": self.dependencies[name]}) as span:
+            result.outputs[name] = await self._run_task(name, kwargs, executor)
+            span.set_status(Status(StatusCode.OK))
+
+    async def run(self, inputs: dict[str, Any] | None = None, executor: Executor | None = None) -> DagResult:
+        """Run every task of the graph.
+
+        Args:
+            inputs (dict[str, Any]): Arguments offered to every task, by parameter name.
+            executor (Executor): Where sync tasks run. Defaults to the event loop's default executor.
+
+        Returns:
+            DagResult: Outputs, failures and the critical path of the run.
+
+        """
+        if not OTEL_AVAILABLE:
+            return await self._run(inputs or {}, executor)
+
+        with tracer.start_as_current_span("dag.run", attributes={"dag.tasks": len(self.tasks)}) as span:
+            result = await self._run(inputs or {}, executor)
+            span.set_attributes(
+                {
+                    "dag.critical_path": result.critical_path,
+                    "dag.critical_path.duration": result.critical_path_duration,
+                    "dag.failed": list(result.errors),
+                    "dag.skipped": result.skipped,
+                },
+            )
+            span.set_status(Status(StatusCode.OK) if not result.errors else Status(StatusCode.ERROR, f"{len(result.errors)} tasks failed"))
+            return result
+
+    async def _run(self, inputs: dict[str, Any], executor: Executor | None) -> DagResult:
+        result = DagResult()
+        remaining = {name: len(dependencies) for name, dependencies in self.dependencies.items()}
+        started_at: dict[str, float] = {}
+        finished_at: dict[str, float] = {}
+        running: dict[asyncio.Task, str] = {}
+        origin = time.perf_counter()
+
+        def start(name: str) -> None:
+            kwargs = self._arguments(name, inputs, result.outputs)
+            started_at[name] = time.perf_counter() - origin
+            running[asyncio.create_task(self._run_node(name, kwargs, executor, result))] = name
+
+        skipped: set[str] = set()
+
+        def skip(name: str) -> None:
+            pending = [name]
+            while pending:
+                name = pending.pop()
+                if name in skipped:
+                    continue
+                skipped.add(name)
+                result.skipped.append(name)
+                pending.extend(self.dependents[name])
+
+        for name, count in remaining.items():
+            if count == 0:
+                start(name)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    name = running.pop(finished)
+                    finished_at[name] = time.perf_counter() - origin
+                    result.durations[name] = finished_at[name] - started_at[name]
+
+                    error = finished.exception()
+                    if error is not None:
+                        result.errors[name] = error
+                        for dependent in self.dependents[name]:
+                            skip(dependent)
+                        continue
+
+                    for dependent in self.dependents[name]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in skipped:
+                            start(dependent)
+        finally:
+            # only left over when the run itself is cancelled
+            for pending_task in running:
+                pending_task.cancel()
+
+        result.critical_path, result.critical_path_duration = self._critical_path(finished_at)
+        return result
+
+    def _critical_path(self, finished_at: dict[str, float]) -> tuple[list[str], float]:
+        """Walk back from the last task to finish through the dependency that finished last."""
+        if not finished_at:
+            return [], 0.0
+
+        last = max(finished_at, key=finished_at.get)
+        path = [last]
+        while True:
+            dependencies = [dependency for dependency in self.dependencies[path[-1]] if dependency in finished_at]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=finished_at.get))
+        path.reverse()
+        return path, finished_at[last]
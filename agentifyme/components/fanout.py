@@ -0,0 +1,167 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agentifyme.errors import (
+    AgentifyMeError,
+    ErrorCategory,
+    ErrorContext,
+    ErrorSeverity,
+)
+
+try:
+    from opentelemetry import metrics, trace
+    from opentelemetry.trace import Status, StatusCode
+
+    tracer = trace.get_tracer("agentifyme.components")
+    meter = metrics.get_meter("agentifyme.components")
+    fanout_items = meter.create_counter("task.map.items", description="Number of items run by task fan-outs, by status")
+    fanout_item_duration = meter.create_histogram("task.map.item.duration", unit="s", description="Duration of each item run by a task fan-out")
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+DEFAULT_CONCURRENCY = 16
+
+
+@dataclass
+class ItemResult:
+    """Outcome of one invocation in a fan-out."""
+
+    index: int
+    input: Any
+    value: Any = None
+    error: BaseException | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class MapResult:
+    """Outcomes of a fan-out, in the order of its inputs.
+
+    A failing item doesn't stop the others; its exception is kept on its `ItemResult`.
+    Use `raise_for_errors` to turn any failure into an exception.
+    """
+
+    name: str
+    items: list[ItemResult] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    @property
+    def values(self) -> list[Any]:
+        """Values of the successful items, in input order."""
+        return [item.value for item in self.items if item.ok]
+
+    @property
+    def succeeded(self) -> list[ItemResult]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> list[ItemResult]:
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        return all(item.ok for item in self.items)
+
+    def raise_for_errors(self) -> None:
+        """Raise an `AgentifyMeError` if any item failed, chained to the first failure."""
+        failed = self.failed
+        if not failed:
+            return
+        first = failed[0]
+        raise AgentifyMeError(
+            message=f"{len(failed)} of {len(self.items)} invocations of {self.name} failed, first at index {first.index}: {first.error}",
+            error_code="TASK_MAP_PARTIAL_FAILURE",
+            category=ErrorCategory.EXECUTION,
+            severity=ErrorSeverity.ERROR,
+            context=ErrorContext(component_type="task", component_id=self.name),
+            execution_state={"failed_indices": [item.index for item in failed]},
+        ) from first.error
+
+
+async def _run_item(func: Callable[[Any], Awaitable[Any]], result: ItemResult) -> None:
+    start_time = time.perf_counter()
+    try:
+        result.value = await func(result.input)
+    except Exception as e:
+        result.error = e
+    finally:
+        result.duration = time.perf_counter() - start_time
+
+
+async def _run_item_traced(name: str, func: Callable[[Any], Awaitable[Any]], result: ItemResult) -> None:
+    with tracer.start_as_current_span(f"{name}.map_item", attributes={"task.name": name, "task.map.index": result.index}) as span:
+        await _run_item(func, result)
+        if result.ok:
+            span.set_status(Status(StatusCode.OK))
+        else:
+            span.record_exception(result.error)
+            span.set_status(Status(StatusCode.ERROR, str(result.error)))
+        span.set_attribute("duration", result.duration)
+
+    status = "success" if result.ok else "error"
+    fanout_items.add(1, {"task.name": name, "status": status})
+    fanout_item_duration.record(result.duration, {"task.name": name, "status": status})
+
+
+async def fan_out(name: str, func: Callable[[Any], Awaitable[Any]], inputs: Iterable[Any], concurrency: int = DEFAULT_CONCURRENCY) -> MapResult:
+    """Await `func(input)` for every input with at most `concurrency` calls in flight.
+
+    A fixed pool of workers pulls inputs in order, so memory stays bounded by the
+    concurrency rather than the number of inputs. Each call runs in its own asyncio
+    task, and so its own copy of the context.
+
+    Args:
+        name (str): Name used for the spans, metrics and errors of the fan-out.
+        func (Callable): Coroutine function called once per input.
+        inputs (Iterable): The inputs, consumed lazily.
+        concurrency (int): Maximum number of calls running at once.
+
+    Returns:
+        MapResult: The outcome of every call, in input order.
+
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    if OTEL_AVAILABLE:
+        run_item = lambda item_result: _run_item_traced(name, func, item_result)  # noqa: E731
+    else:
+        run_item = lambda item_result: _run_item(func, item_result)  # noqa: E731
+    result = MapResult(name=name)
+    pending = enumerate(inputs)
+
+    async def worker() -> None:
+        # `pending` is shared, so each input is taken by exactly one worker and the
+        # results are appended in input order
+        for index, item in pending:
+            item_result = ItemResult(index=index, input=item)
+            result.items.append(item_result)
+            await asyncio.create_task(run_item(item_result))
+
+    async def run_workers() -> None:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    if OTEL_AVAILABLE:
+        with tracer.start_as_current_span(f"{name}.map", attributes={"task.name": name, "task.map.concurrency": concurrency}) as span:
+            await run_workers()
+            failed = len(result.failed)
+            span.set_attributes({"task.map.items": len(result.items), "task.map.failed": failed})
+            span.set_status(Status(StatusCode.OK) if not failed else Status(StatusCode.ERROR, f"{failed} items failed"))
+    else:
+        await run_workers()
+
+    return result
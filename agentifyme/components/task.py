@@ -1,15 +1,25 @@
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from typing import Any
 
 import orjson
 import wrapt
 
+from agentifyme.cache import MISSING
 from agentifyme.components.base import BaseConfig, RunnableComponent
+from agentifyme.components.checkpoint import get_journal
+from agentifyme.components.fanout import DEFAULT_CONCURRENCY, MapResult, fan_out
 from agentifyme.errors import AgentifyMeValidationError, ErrorCategory, ErrorContext
 
-from .utils import Param, get_function_metadata, validate_component_name
+from .utils import (
+    DependencyCycleError,
+    Param,
+    find_cycle,
+    get_function_metadata,
+    validate_component_name,
+)
 
 
 @dataclass
@@ -23,11 +33,13 @@ class TaskConfig(BaseConfig):
         func (Callable[..., Any]): The function associated with the task
         input_parameters (dict[str, Param]): Input parameters for the task
         output_parameters (list[Param]): Output parameters for the task
+        dependencies (list[str]): Names of the tasks that must complete before this task
 
     """
 
     input_parameters: dict[str, Param] = field(default_factory=dict)
     output_parameters: list[Param] = field(default_factory=list)
+    dependencies: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -37,11 +49,32 @@ class TaskConfig(BaseConfig):
             "is_async": self.is_async,
             "input_parameters": {name: param.to_dict() for name, param in self.input_parameters.items()},
             "output_parameters": [param.to_dict() for param in self.output_parameters],
+            "dependencies": self.dependencies,
         }
 
     def to_json(self) -> str:
         return orjson.dumps(self.to_dict())
 
+    @classmethod
+    def register(cls, component: "Task"):
+        """Register a task, rejecting it if its dependencies would form a cycle.
+
+        Raises:
+            DependencyCycleError: If the task depends on itself, directly or through other tasks.
+
+        """
+        graph = cls.dependency_graph()
+        graph[component.config.name.lower()] = component.config.dependencies
+        cycle = find_cycle(graph)
+        if cycle:
+            raise DependencyCycleError(cycle)
+        super().register(component)
+
+    @classmethod
+    def dependency_graph(cls) -> dict[str, list[str]]:
+        """Map the name of every registered task to the names of the tasks it depends on."""
+        return {name: component.config.dependencies for name, component in cls.get_registry().items() if component.component_type == "task"}
+
     @classmethod
     def get_tasks(cls) -> bytes:
         tasks = {}
@@ -62,7 +95,8 @@ class Task(RunnableComponent):
     def __init__(self, config: TaskConfig, **kwargs) -> None:
         super().__init__(component_type=self.component_type, config=config)
         self.config = config
-        self._result = None
+        # a context variable, so concurrent runs of the same task don't see each other's results
+        self._result: ContextVar[Any] = ContextVar(f"{config.name}_result", default=None)
 
     def _validate_task(self) -> None:
         """Validate that the task function is implemented."""
@@ -76,22 +110,74 @@ class Task(RunnableComponent):
 
     @property
     def result(self) -> Any:
-        """Get the result of the last task execution."""
-        return self._result
+        """Get the result of the last task execution in the current context."""
+        return self._result.get()
 
     def run(self, *args, **kwargs: Any) -> Any:
         with self, self.error_context(kwargs):
             self._validate_task()
             prepared_kwargs = self._prepare_kwargs(args, kwargs)
-            self._result = self.config.func(**prepared_kwargs)
-            return self._result
+            journal, key = self._checkpoint_key(prepared_kwargs)
+            result = MISSING if key is None else journal.replay(key)
+            if result is MISSING:
+                result = self.config.func(**prepared_kwargs)
+                if key is not None:
+                    journal.record(key, result)
+            self._result.set(result)
+            return result
 
     async def arun(self, *args, **kwargs: Any) -> Any:
         with self, self.error_context(kwargs):
             self._validate_task()
             prepared_kwargs = self._prepare_kwargs(args, kwargs)
-            self._result = await self.config.func(**prepared_kwargs)
-            return self._result
+            journal, key = self._checkpoint_key(prepared_kwargs)
+            result = MISSING if key is None else await journal.areplay(key)
+            if result is MISSING:
+                result = await self.config.func(**prepared_kwargs)
+                if key is not None:
+                    await journal.arecord(key, result)
+            self._result.set(result)
+            return result
+
+    def _checkpoint_key(self, prepared_kwargs: dict[str, Any]):
+        """Return the journal of the checkpointed run in progress and the key of this call, if any."""
+        journal = get_journal()
+        if journal is None:
+            return None, None
+        return journal, journal.key(self.config.name, prepared_kwargs)
+
+    async def _invoke(self, item: Any) -> Any:
+        if isinstance(item, Mapping):
+            args, kwargs = (), dict(item)
+        elif isinstance(item, tuple):
+            args, kwargs = item, {}
+        else:
+            args, kwargs = (item,), {}
+
+        if self.config.is_async:
+            return await self.arun(*args, **kwargs)
+        return await asyncio.to_thread(self.run, *args, **kwargs)
+
+    async def map(self, items: Iterable[Any], concurrency: int = DEFAULT_CONCURRENCY) -> MapResult:
+        """Run the task once per item, with at most `concurrency` runs at a time.
+
+        A mapping item is passed as keyword arguments, a tuple as positional arguments
+        and anything else as the first argument. Synchronous tasks run in worker threads.
+        Failures don't stop the other items; they are reported on the returned result.
+
+        Args:
+            items (Iterable[Any]): The inputs, one per run.
+            concurrency (int): Maximum number of runs in flight.
+
+        Returns:
+            MapResult: The outcome of every run, in the order of `items`.
+
+        """
+        return await fan_out(self.config.name, self._invoke, items, concurrency)
+
+    async def gather(self, *items: Any, concurrency: int = DEFAULT_CONCURRENCY) -> MapResult:
+        """Like `map`, with the items given as arguments."""
+        return await self.map(items, concurrency)
 
 
 def task(wrapped: Callable | None = None, *, name: str | None = None, description: str | None = None, dependencies: list[str] = None) -> Callable:
@@ -120,6 +206,7 @@ def task(wrapped: Callable | None = None, *, name: str | None = None, descriptio
             func=wrapped_func,
             input_parameters=func_metadata.input_parameters,
             output_parameters=func_metadata.output_parameters,
+            dependencies=[dependency.lower() for dependency in dependencies or []],
             is_async=asyncio.iscoroutinefunction(wrapped_func),
         )
 
@@ -141,12 +228,15 @@ def task(wrapped: Callable | None = None, *, name: str | None = None, descriptio
 
         wrapped = wrapper(wrapped_func)
         wrapped.__agentifyme = _task_instance
+        wrapped.map = _task_instance.map
+        wrapped.gather = _task_instance.gather
         wrapped.__agentifyme_metadata = {
             "type": "task",
             "name": _task.name,
             "description": _task.description,
             "input_parameters": {name: param.name for name, param in _task.input_parameters.items()},
             "output_parameters": [param.name for param in _task.output_parameters],
+            "dependencies": _task.dependencies,
         }
         return wrapped
 
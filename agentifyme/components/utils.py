@@ -449,3 +449,46 @@ class InvalidNameError(AgentifyMeError):
 def validate_component_name(name: str, component_type: str) -> None:
     if not re.match(r"^[a-zA-Z0-9]+(?:[-_][a-zA-Z0-9]+)*$", name):
         raise InvalidNameError(name=name, component_type=component_type)
+
+
+class DependencyCycleError(AgentifyMeError):
+    def __init__(self, cycle: list[str], component_type: str = "task"):
+        super().__init__(
+            message=f"{component_type} dependencies form a cycle: {' -> '.join(cycle)}",
+            error_code="DEPENDENCY_CYCLE",
+            category=ErrorCategory.VALIDATION,
+            context=ErrorContext(component_type=component_type, component_id=cycle[0]),
+            severity=ErrorSeverity.ERROR,
+        )
+        self.cycle = cycle
+
+
+def find_cycle(graph: dict[str, list[str]]) -> list[str] | None:
+    """Return a dependency cycle in `graph` as a list of names ending where it starts, if there is one.
+
+    `graph` maps each name to the names it depends on. Names that only appear as
+    dependencies are treated as having none.
+    """
+    visiting, done = set(), set()
+
+    for root in graph:
+        if root in done:
+            continue
+        # iterative depth-first search, so deep graphs don't hit the recursion limit
+        path = [root]
+        stack = [iter(graph.get(root, ()))]
+        visiting.add(root)
+        while stack:
+            dependency = next(stack[-1], None)
+            if dependency is None:
+                stack.pop()
+                node = path.pop()
+                visiting.discard(node)
+                done.add(node)
+            elif dependency in visiting:
+                return [*path[path.index(dependency) :], dependency]
+            elif dependency not in done:
+                path.append(dependency)
+                stack.append(iter(graph.get(dependency, ())))
+                visiting.add(dependency)
+    return None
@@ -1,7 +1,9 @@
 import asyncio
-from collections.abc import Callable
+import inspect
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass, field
 from datetime import timedelta
+from enum import Enum
 from typing import Any
 
 import orjson
@@ -18,6 +20,14 @@ from .utils import (
 )
 
 
+class ExecutionMode(str, Enum):
+    """How the worker runs a synchronous workflow."""
+
+    INLINE = "inline"  # On the event loop thread
+    THREAD = "thread"  # In a thread pool
+    PROCESS = "process"  # In a pool of worker processes
+
+
 @dataclass
 class WorkflowConfig(BaseConfig):
     """Represents a workflow.
@@ -31,12 +41,16 @@ class WorkflowConfig(BaseConfig):
         output_parameters (list[Param]): The list of output parameters for the workflow.
         schedule (Optional[Union[str, timedelta]]): The schedule for the workflow.
             Can be either a cron expression string or a timedelta object.
+        execution_mode (ExecutionMode): How the worker runs the workflow if it is synchronous.
+        is_streaming (bool): Whether the workflow is an async generator yielding its output in chunks.
 
     """
 
     input_parameters: dict[str, Param] = field(default_factory=dict)
     output_parameters: list[Param] = field(default_factory=list)
     schedule: str | timedelta | None = None
+    execution_mode: ExecutionMode = ExecutionMode.INLINE
+    is_streaming: bool = False
 
     @classmethod
     def normalize_schedule(cls, v: str | timedelta | None) -> str | None:
@@ -56,6 +70,8 @@ class WorkflowConfig(BaseConfig):
             "input_parameters": {name: param.to_dict() for name, param in self.input_parameters.items()},
             "output_parameters": [param.to_dict() for param in self.output_parameters],
             "schedule": self.schedule,
+            "execution_mode": self.execution_mode.value,
+            "is_streaming": self.is_streaming,
         }
 
     def to_json(self) -> str:
@@ -103,8 +119,39 @@ class Workflow(RunnableComponent):
             self.current_kwargs = self._prepare_kwargs(args, kwargs)
             return await self.config.func(**self.current_kwargs)
 
+    async def astream(self, *args, **kwargs: Any) -> AsyncIterator[Any]:
+        """Run a streaming workflow, yielding its chunks as they are produced."""
+        with self, self.error_context(kwargs):
+            self._validate_workflow()
+            self.current_kwargs = self._prepare_kwargs(args, kwargs)
+            async for chunk in self.config.func(**self.current_kwargs):
+                yield chunk
+
+
+def workflow(
+    wrapped: Callable | None = None,
+    *,
+    name: str | None = None,
+    description: str | None = None,
+    schedule: str | timedelta | None = None,
+    execution_mode: ExecutionMode | str = ExecutionMode.INLINE,
+) -> Callable:
+    """Decorator to create a workflow.
+
+    Args:
+        wrapped: The function to wrap
+        name: Optional name for the workflow
+        description: Optional description of the workflow
+        schedule: Optional cron expression or timedelta to run the workflow on
+        execution_mode: How the worker runs a synchronous workflow - `inline` on the event loop,
+            in a `thread` pool or in a `process` pool. Async workflows always run on the event loop.
+
+    An async generator function becomes a streaming workflow: the worker forwards each
+    yielded chunk to the caller as it is produced.
+
+    """
+    _execution_mode = ExecutionMode(execution_mode)
 
-def workflow(wrapped: Callable | None = None, *, name: str | None = None, description: str | None = None, schedule: str | timedelta | None = None) -> Callable:
     def decorator(wrapped_func):
         func_metadata = get_function_metadata(wrapped_func)
         _name = name or func_metadata.name
@@ -118,13 +165,19 @@ def workflow(wrapped: Callable | None = None, *, name: str | None = None, descri
             input_parameters=func_metadata.input_parameters,
             output_parameters=func_metadata.output_parameters,
             schedule=schedule,
-            is_async=asyncio.iscoroutinefunction(wrapped_func),
+            execution_mode=_execution_mode,
+            is_async=asyncio.iscoroutinefunction(wrapped_func) or inspect.isasyncgenfunction(wrapped_func),
+            is_streaming=inspect.isasyncgenfunction(wrapped_func),
         )
         _workflow_instance = Workflow(_workflow)
         WorkflowConfig.register(_workflow_instance)
 
         @wrapt.decorator
         def wrapper(wrapped_func, instance, args, kwargs):
+            if inspect.isasyncgenfunction(wrapped_func):
+                kwargs.update(zip(wrapped_func.__code__.co_varnames, args, strict=False))
+                return _workflow_instance.astream(**kwargs)
+
             if asyncio.iscoroutinefunction(wrapped_func):
 
                 async def run():
@@ -145,6 +198,8 @@ def workflow(wrapped: Callable | None = None, *, name: str | None = None, descri
             "input_parameters": {name: param.name for name, param in _workflow.input_parameters.items()},
             "output_parameters": [param.name for param in _workflow.output_parameters],
             "schedule": _workflow.schedule,
+            "execution_mode": _workflow.execution_mode.value,
+            "is_streaming": _workflow.is_streaming,
         }
         return wrapped
 
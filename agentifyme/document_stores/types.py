@@ -3,6 +3,8 @@ from typing import Any
 from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
 
+from agentifyme.ml.embedding.embeddings import EmbeddingVector
+
 
 class Document(BaseModel):
     """Class representing a document.
@@ -14,6 +16,16 @@ class Document(BaseModel):
 
 
 class VectorDocument(Document):
-    """Represents a document with an embedding."""
+    """Represents a document with an embedding.
+
+    The embedding is array-backed when numpy is installed, see `Vector`.
+    """
+
+    embedding: EmbeddingVector = SkipJsonSchema()
+
+
+class VectorSearchResult(BaseModel):
+    """A document found by a vector search, with its similarity to the query."""
 
-    embedding: list[float] = SkipJsonSchema()
+    document: VectorDocument
+    score: float = Field(description="Similarity to the query, higher is closer.")
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any
 
-from agentifyme.document_stores.types import VectorDocument
+from agentifyme.document_stores.types import VectorDocument, VectorSearchResult
+
+MetadataFilter = dict[str, Any] | Callable[[dict[str, Any]], bool]
 
 
 class VectorDocumentStore(ABC):
@@ -63,6 +67,45 @@ class VectorDocumentStore(ABC):
 
         """
 
+    def add_documents(self, collection_name: str, documents: Sequence[VectorDocument]):
+        """Add documents to a collection.
+
+        Stores that can write many documents at once override this.
+
+        Args:
+            collection_name: The name of the collection to add the documents to.
+            documents: The documents to add.
+
+        Returns:
+            None
+
+        """
+        for document in documents:
+            self.add_document(collection_name, document)
+
+    @abstractmethod
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filter: MetadataFilter | None = None,
+    ) -> list[VectorSearchResult]:
+        """Find the documents closest to a vector.
+
+        Args:
+            collection_name: The name of the collection to search.
+            query_vector: The vector to compare the documents to.
+            k: The maximum number of documents to return.
+            filter: Only documents whose metadata matches are returned. Either a dict of
+                required values, where a list or set value matches any of its items, or
+                a function of the metadata.
+
+        Returns:
+            The closest documents, closest first.
+
+        """
+
     @abstractmethod
     def delete_document(self, collection_name: str, document_id: str):
         """Delete a document from a collection.
@@ -0,0 +1,414 @@
+import os
+import shutil
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import orjson
+
+from agentifyme.document_stores.types import VectorDocument, VectorSearchResult
+from agentifyme.document_stores.vector.base import MetadataFilter, VectorDocumentStore
+from agentifyme.ml.embedding.vector import Vector, VectorBatch
+
+_VECTORS_FILE = "vectors.bin"
+# vectors saved by generation, so the documents file written last picks the matching one
+_VECTORS_PATTERN = "vectors.{generation}.bin"
+_DOCUMENTS_FILE = "documents.json"
+
+# rows scored at a time when assigning vectors to clusters, to bound memory
+_ASSIGN_CHUNK = 16_384
+
+
+class Metric(str, Enum):
+    """How the similarity of two vectors is measured."""
+
+    COSINE = "cosine"
+    DOT = "dot"
+    L2 = "l2"  # scored as the negated squared distance
+
+
+def _matches(metadata: dict[str, Any], filter: MetadataFilter) -> bool:
+    if callable(filter):
+        return filter(metadata)
+    for key, expected in filter.items():
+        value = metadata.get(key)
+        if isinstance(expected, list | tuple | set | frozenset):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _nearest_centroids(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid by euclidean distance for every row of `data`."""
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(len(data), dtype=np.int32)
+    for start in range(0, len(data), _ASSIGN_CHUNK):
+        chunk = data[start : start + _ASSIGN_CHUNK]
+        assignments[start : start + len(chunk)] = np.argmin(centroid_norms - 2 * chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def _kmeans(data: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroids(data, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        counts = np.bincount(assignments, minlength=k)
+        # empty clusters keep their previous centroid
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class _Collection:
+    """Rows of vectors with their ids, contents and metadata, plus an optional IVF index.
+
+    Vectors live in one float32 matrix that grows by doubling. Deleted rows are
+    tombstoned and dropped when the collection is saved. The squared norms of a loaded
+    collection are only computed when first needed.
+    """
+
+    def __init__(self, metric: Metric):
+        self.metric = metric
+        self.ids: list[str] = []
+        self.contents: list[str] = []
+        self.metadata: list[dict[str, Any]] = []
+        self.rows: dict[str, int] = {}
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self._norms: np.ndarray | None = np.empty(0, dtype=np.float32)
+        self.live = np.empty(0, dtype=bool)
+        self.generation = 0
+
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_size = 0
+        self._lists: list[np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def norms(self) -> np.ndarray:
+        if self._norms is None:
+            self._norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        return self._norms
+
+    @norms.setter
+    def norms(self, norms: np.ndarray) -> None:
+        self._norms = norms
+
+    @property
+    def dimensions(self) -> int | None:
+        return self.matrix.shape[1] if self.ids else None
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        if self.metric != Metric.COSINE:
+            return vectors
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def _reserve(self, rows: int, dimensions: int, filled: int) -> None:
+        capacity = self.matrix.shape[0]
+        if rows <= capacity and not isinstance(self.matrix, np.memmap):
+            return
+        # a memory-mapped matrix is read-only, so the first write copies it
+        grown = np.empty((max(rows, capacity * 2, 64), dimensions), dtype=np.float32)
+        if filled:
+            grown[:filled] = self.matrix[:filled]
+        self.norms = np.resize(self.norms, grown.shape[0])
+        self.matrix = grown
+        self.live = np.resize(self.live, grown.shape[0])
+        self.assignments = np.resize(self.assignments, grown.shape[0])
+
+    def add(self, documents: Sequence[VectorDocument]) -> None:
+        if not documents:
+            return
+        vectors = np.stack([np.asarray(document.embedding, dtype=np.float32) for document in documents])
+        dimensions = self.dimensions or vectors.shape[1]
+        if vectors.shape[1] != dimensions:
+            raise ValueError(f"Expected vectors with {dimensions} dimensions, got {vectors.shape[1]}")
+        vectors = self._prepare(vectors)
+
+        filled = len(self.ids)
+        positions = []
+        for document in documents:
+            row = self.rows.get(document.id)
+            if row is None:
+                row = len(self.ids)
+                self.rows[document.id] = row
+                self.ids.append(document.id)
+                self.contents.append(document.content)
+                self.metadata.append(document.metadata)
+            else:
+                self.contents[row] = document.content
+                self.metadata[row] = document.metadata
+            positions.append(row)
+
+        self._reserve(len(self.ids), dimensions, filled)
+        positions = np.asarray(positions)
+        # a later duplicate id in the same batch wins, as with separate adds
+        self.matrix[positions] = vectors
+        self.norms[positions] = np.einsum("ij,ij->i", vectors, vectors)
+        self.live[positions] = True
+        if self.centroids is not None:
+            self.assignments[positions] = _nearest_centroids(vectors, self.centroids)
+            self._lists = None
+
+    def delete(self, document_id: str) -> bool:
+        row = self.rows.pop(document_id, None)
+        if row is None:
+            return False
+        self.live[row] = False
+        return True
+
+    def document(self, row: int) -> VectorDocument:
+        # the rows were validated when added, and the embedding views the matrix
+        return VectorDocument.model_construct(
+            id=self.ids[row],
+            content=self.contents[row],
+            metadata=self.metadata[row],
+            embedding=Vector(self.matrix[row]),
+        )
+
+    def train(self, nlist: int, iterations: int = 10, sample_size: int = 65_536, seed: int = 0) -> None:
+        """Cluster the live vectors into `nlist` inverted lists."""
+        rows = np.flatnonzero(self.live[: len(self.ids)])
+        rng = np.random.default_rng(seed)
+        sample = rows if len(rows) <= sample_size else rng.choice(rows, sample_size, replace=False)
+        self.centroids = _kmeans(self.matrix[sample], min(nlist, len(sample)), iterations, rng)
+        self.assignments[: len(self.ids)] = _nearest_centroids(self.matrix[: len(self.ids)], self.centroids)
+        self.trained_size = len(rows)
+        self._lists = None
+
+    @property
+    def lists(self) -> list[np.ndarray]:
+        if self._lists is None:
+            order = np.argsort(self.assignments[: len(self.ids)], kind="stable")
+            bounds = np.searchsorted(self.assignments[: len(self.ids)][order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i] : bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    def scores(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        matrix = self.matrix[: len(self.ids)] if rows is None else self.matrix[rows]
+        similarities = matrix @ query
+        if self.metric == Metric.L2:
+            norms = self.norms[: len(self.ids)] if rows is None else self.norms[rows]
+            return 2 * similarities - norms - query @ query
+        return similarities
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the inverted lists of the `nprobe` centroids closest to the query."""
+        centroid_distances = np.einsum("ij,ij->i", self.centroids, self.centroids) - 2 * self.centroids @ query
+        probes = np.argpartition(centroid_distances, min(nprobe, len(self.centroids)) - 1)[:nprobe]
+        lists = self.lists
+        return np.concatenate([lists[probe] for probe in probes])
+
+    def save(self, directory: str) -> None:
+        """Write the live rows to `directory`.
+
+        The vectors go to a new file first and the documents file naming it replaces the
+        old one last, so a crash in between leaves the previous save readable.
+        """
+        os.makedirs(directory, exist_ok=True)
+        rows = np.flatnonzero(self.live[: len(self.ids)])
+        generation = self.generation + 1
+        vectors_file = _VECTORS_PATTERN.format(generation=generation)
+        VectorBatch(np.ascontiguousarray(self.matrix[rows])).save(os.path.join(directory, vectors_file))
+
+        documents = {
+            "metric": self.metric.value,
+            "generation": generation,
+            "vectors": vectors_file,
+            "ids": [self.ids[row] for row in rows],
+            "contents": [self.contents[row] for row in rows],
+            "metadata": [self.metadata[row] for row in rows],
+        }
+        tmp_path = os.path.join(directory, f"{_DOCUMENTS_FILE}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(documents))
+        os.replace(tmp_path, os.path.join(directory, _DOCUMENTS_FILE))
+        self.generation = generation
+
+        # older saves, including the unversioned vectors.bin
+        for name in os.listdir(directory):
+            if name != vectors_file and name.startswith("vectors.") and name.endswith(".bin"):
+                os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def load(cls, directory: str) -> "_Collection":
+        with open(os.path.join(directory, _DOCUMENTS_FILE), "rb") as f:
+            documents = orjson.loads(f.read())
+
+        collection = cls(Metric(documents["metric"]))
+        collection.ids = documents["ids"]
+        collection.contents = documents["contents"]
+        collection.metadata = documents["metadata"]
+        collection.rows = {document_id: row for row, document_id in enumerate(collection.ids)}
+        collection.generation = documents.get("generation", 0)
+        if collection.ids:
+            vectors_file = documents.get("vectors", _VECTORS_FILE)
+            collection.matrix = VectorBatch.load(os.path.join(directory, vectors_file)).matrix
+            collection._norms = None
+            collection.live = np.ones(len(collection.ids), dtype=bool)
+            collection.assignments = np.zeros(len(collection.ids), dtype=np.int32)
+        return collection
+
+
+class LocalVectorDocumentStore(VectorDocumentStore):
+    """A vector document store running in process, with optional files on disk.
+
+    Collections below `ivf_threshold` documents are searched exhaustively with one
+    matrix product. Larger collections build an IVF index: the vectors are clustered
+    with k-means into about sqrt(n) inverted lists, and a search only scores the
+    documents in the `nprobe` lists closest to the query. The index is rebuilt once
+    a collection has doubled since it was trained. Searches with a metadata filter
+    that leaves fewer than `k` candidates in the probed lists fall back to an
+    exhaustive search of the matching documents.
+
+    Cosine collections store their vectors normalized, so the embeddings of the
+    documents returned have unit length.
+
+    With a `path`, `save` writes every collection to a directory holding the vectors,
+    in the `VectorBatch` format, and a JSON file of ids, contents and metadata.
+    Collections found there are loaded on first use, with their vectors memory-mapped,
+    so opening a large store reads little until it is searched.
+
+    Args:
+        path (str | None): Directory the collections are saved to and loaded from.
+        metric (Metric | str): Similarity of new collections.
+        ivf_threshold (int): Number of documents from which a collection is indexed.
+        nprobe (int): Number of inverted lists searched per query.
+
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        metric: Metric | str = Metric.COSINE,
+        ivf_threshold: int = 50_000,
+        nprobe: int = 16,
+    ):
+        self.path = path
+        self.metric = Metric(metric)
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        # None for a collection saved under `path` that has not been loaded yet
+        self._collections: dict[str, _Collection | None] = {}
+
+        if path is not None and os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.isfile(os.path.join(path, name, _DOCUMENTS_FILE)):
+                    self._collections[name] = None
+
+    def _collection(self, collection_name: str, create: bool = False) -> _Collection:
+        collection = self._collections.get(collection_name)
+        if collection is None and collection_name in self._collections:
+            collection = self._collections[collection_name] = _Collection.load(os.path.join(self.path, collection_name))
+        if collection is None:
+            if not create:
+                raise KeyError(f"Collection {collection_name} not found")
+            collection = self._collections[collection_name] = _Collection(self.metric)
+        return collection
+
+    def list_collections(self) -> list[str]:
+        return list(self._collections)
+
+    def get_collection(self, collection_name: str) -> list[str]:
+        return list(self._collection(collection_name).rows)
+
+    def get_document(self, collection_name: str, document_id: str) -> VectorDocument:
+        collection = self._collection(collection_name)
+        row = collection.rows.get(document_id)
+        if row is None:
+            raise KeyError(f"Document {document_id} not found in collection {collection_name}")
+        return collection.document(row)
+
+    def get_documents(self, collection_name: str) -> list[VectorDocument]:
+        collection = self._collection(collection_name)
+        return [collection.document(row) for row in collection.rows.values()]
+
+    def add_document(self, collection_name: str, document: VectorDocument):
+        self.add_documents(collection_name, [document])
+
+    def add_documents(self, collection_name: str, documents: Sequence[VectorDocument]):
+        self._collection(collection_name, create=True).add(documents)
+
+    def delete_document(self, collection_name: str, document_id: str):
+        self._collection(collection_name).delete(document_id)
+
+    def delete_collection(self, collection_name: str):
+        self._collections.pop(collection_name, None)
+        if self.path is not None:
+            shutil.rmtree(os.path.join(self.path, collection_name), ignore_errors=True)
+
+    def save(self) -> None:
+        """Write every collection under `path`, dropping deleted documents from the files."""
+        if self.path is None:
+            raise ValueError("The store has no path to save to")
+        for name, collection in self._collections.items():
+            # a collection never loaded is unchanged on disk
+            if collection is not None:
+                collection.save(os.path.join(self.path, name))
+
+    def build_index(self, collection_name: str, nlist: int | None = None) -> None:
+        """Build the IVF index of a collection now, instead of on its first large search."""
+        collection = self._collection(collection_name)
+        collection.train(nlist or max(1, int(np.sqrt(len(collection)))))
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filter: MetadataFilter | None = None,
+    ) -> list[VectorSearchResult]:
+        collection = self._collection(collection_name)
+        if not len(collection) or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (collection.dimensions,):
+            raise ValueError(f"Expected a query vector with {collection.dimensions} dimensions, got shape {query.shape}")
+        query = collection._prepare(query[None, :])[0]
+
+        size = len(collection)
+        if size >= self.ivf_threshold and (collection.centroids is None or size >= 2 * collection.trained_size):
+            self.build_index(collection_name)
+
+        rows = None
+        if collection.centroids is not None:
+            rows = collection.candidates(query, self.nprobe)
+            rows = rows[collection.live[rows]]
+        if filter is not None:
+            rows = self._filtered(collection, rows, filter, k)
+        return self._top_k(collection, query, rows, k)
+
+    def _filtered(self, collection: _Collection, rows: np.ndarray | None, filter: MetadataFilter, k: int) -> np.ndarray:
+        if rows is not None:
+            matched = np.asarray([row for row in rows if _matches(collection.metadata[row], filter)], dtype=np.intp)
+            if len(matched) >= k:
+                return matched
+        # not enough matches near the query, search all the matching documents
+        return np.asarray([row for row in collection.rows.values() if _matches(collection.metadata[row], filter)], dtype=np.intp)
+
+    def _top_k(self, collection: _Collection, query: np.ndarray, rows: np.ndarray | None, k: int) -> list[VectorSearchResult]:
+        scores = collection.scores(query, rows)
+        if rows is None:
+            rows = np.arange(len(collection.ids))
+            scores = np.where(collection.live[: len(collection.ids)], scores, -np.inf)
+        if not len(rows):
+            return []
+
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            VectorSearchResult.model_construct(document=collection.document(int(rows[i])), score=float(scores[i]))
+            for i in top
+            if np.isfinite(scores[i])
+        ]
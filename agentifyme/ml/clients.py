@@ -0,0 +1,177 @@
+import asyncio
+import importlib
+import sys
+import threading
+import weakref
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+_limits: dict[str, Any] = {
+    "max_connections": DEFAULT_MAX_CONNECTIONS,
+    "max_keepalive_connections": DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    "keepalive_expiry": DEFAULT_KEEPALIVE_EXPIRY,
+}
+_http2 = HTTP2_AVAILABLE
+
+_clients: dict[tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def configure_http_pool(
+    max_connections: int | None = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int | None = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float | None = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool | None = None,
+) -> None:
+    """Set the connection pool limits of the provider clients created from now on.
+
+    Args:
+        max_connections (int | None): Connections open at once per client, None for no limit.
+        max_keepalive_connections (int | None): Idle connections kept open per client.
+        keepalive_expiry (float | None): Seconds an idle connection is kept open.
+        http2 (bool | None): Negotiate HTTP/2, which needs the `h2` package. Defaults to
+            whether it is installed.
+
+    """
+    global _limits, _http2
+    if http2 and not HTTP2_AVAILABLE:
+        raise ImportError("HTTP/2 needs the h2 package. Install it with `pip install httpx[http2]`.")
+    _limits = {
+        "max_connections": max_connections,
+        "max_keepalive_connections": max_keepalive_connections,
+        "keepalive_expiry": keepalive_expiry,
+    }
+    _http2 = HTTP2_AVAILABLE if http2 is None else http2
+
+
+def _http_client(client_class: type, asynchronous: bool) -> Any:
+    """Build an HTTP client with the SDK's defaults and the configured pool settings."""
+    sdk = sys.modules[client_class.__module__.partition(".")[0]]
+    http_client_class = sdk.DefaultAsyncHttpxClient if asynchronous else sdk.DefaultHttpxClient
+    # SDKs are built on httpx or on its httpx2 fork, and only accept their own objects
+    httpx_module = importlib.import_module(http_client_class.__mro__[1].__module__.partition(".")[0])
+    return http_client_class(limits=httpx_module.Limits(**_limits), http2=_http2)
+
+
+class _LoopLocalClient:
+    """Stands in for an async SDK client, with one client per running event loop.
+
+    The connection pool of an async client is bound to the event loop it first ran on,
+    and fails once that loop is closed, as with successive `asyncio.run` calls. Attribute
+    access is forwarded to the client of the running loop, built by `factory` on first
+    use in that loop.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+        self._default: Any = None  # used outside a running loop
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> Any:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            if loop is None:
+                if self._default is None:
+                    self._default = self._factory()
+                return self._default
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._factory()
+            return client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+
+def _create_client(client_class: type, asynchronous: bool, api_key: str, base_url: str | None, options: dict[str, Any]) -> Any:
+    http_client = _http_client(client_class, asynchronous=asynchronous)
+    return client_class(api_key=api_key, base_url=base_url, http_client=http_client, **options)
+
+
+def get_client(
+    client_class: type[T],
+    api_key: str,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    **options: Any,
+) -> T:
+    """Return the process-wide provider SDK client for these credentials.
+
+    Clients are keyed by class, base URL, API key and `options` like the organization,
+    so every model and embedding model talking to the same account shares one pool of
+    keep-alive connections instead of opening its own and paying the TLS handshakes
+    again. A `timeout` or `max_retries` gives a copy of the shared client with those
+    settings, still on the same connections.
+
+    Async clients are shared per event loop, since their connections can't outlive the
+    loop they were opened on. They are returned as a stand-in that forwards to the
+    client of the running loop.
+
+    Args:
+        client_class: An OpenAI, Anthropic or Groq SDK client class, sync or async.
+        api_key (str): The API key.
+        base_url (str | None): API endpoint, None for the provider's default.
+        timeout (float | None): Seconds before a request times out.
+        max_retries (int | None): Retries of failed requests by the SDK.
+        **options: Other arguments of the client class, like `organization`.
+
+    """
+    options = {name: value for name, value in options.items() if value is not None}
+    key = (client_class, str(base_url) if base_url is not None else None, api_key, tuple(sorted(options.items())))
+    # the SDKs name their async clients AsyncOpenAI, AsyncAnthropic, AsyncGroq
+    asynchronous = client_class.__name__.startswith("Async")
+
+    overrides = {}
+    if timeout is not None:
+        overrides["timeout"] = timeout
+    if max_retries is not None:
+        overrides["max_retries"] = max_retries
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if asynchronous:
+                client = _LoopLocalClient(lambda: _create_client(client_class, True, api_key, base_url, options))
+            else:
+                client = _create_client(client_class, False, api_key, base_url, options)
+            _clients[key] = client
+        if not overrides:
+            return cast(T, client)
+
+        override_key = (key, tuple(sorted(overrides.items())))
+        configured = _clients.get(override_key)
+        if configured is None:
+            if asynchronous:
+                configured = _LoopLocalClient(lambda: client._resolve().with_options(**overrides))
+            else:
+                configured = client.with_options(**overrides)
+            _clients[override_key] = configured
+        return cast(T, configured)
+
+
+def clear_clients() -> None:
+    """Forget the shared clients, so the next ones are created with the current pool settings.
+
+    Clients already handed out keep working until they are garbage collected.
+    """
+    with _lock:
+        _clients.clear()
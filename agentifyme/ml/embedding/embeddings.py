@@ -1,27 +1,91 @@
+import asyncio
+import base64
+import hashlib
 import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel
 
+from agentifyme.cache import MISSING, Cache
+from agentifyme.ml.clients import get_client
+from agentifyme.utilities.ratelimit import AsyncRateLimiter, estimate_tokens
+
 from .providers import EmbeddingModelType
 
+try:
+    import numpy as np
+
+    from .vector import Vector, VectorBatch
+
+    NUMPY_AVAILABLE = True
+    EmbeddingVector = Vector
+except ImportError:
+    NUMPY_AVAILABLE = False
+    EmbeddingVector = list[float]
+
+# OpenAI accepts up to 2048 inputs and 300k tokens per embeddings request
+DEFAULT_MAX_BATCH_SIZE = 2048
+DEFAULT_MAX_BATCH_TOKENS = 250_000
+DEFAULT_MAX_CONCURRENCY = 8
+
 
 class Embedding(BaseModel):
-    embedding: list[float]
+    """An embedding vector with its metadata.
+
+    With numpy installed, the vector is an array-backed `Vector` that still reads
+    like a list of floats and is dumped as one.
+    """
+
+    embedding: EmbeddingVector
     metadata: dict[str, Any]
 
+    @classmethod
+    def from_matrix(cls, matrix: "np.ndarray | VectorBatch") -> list["Embedding"]:
+        """Wrap each row of `matrix` as an embedding viewing that row, skipping validation."""
+        batch = matrix if isinstance(matrix, VectorBatch) else VectorBatch(matrix)
+        return [cls.model_construct(embedding=vector, metadata={"index": i, "object": "embedding"}) for i, vector in enumerate(batch)]
+
 
 class EmbeddingModel(ABC):
+    """Base class for embedding models.
+
+    `arun_batch` embeds large corpora: identical texts are embedded once, vectors found
+    in `cache` are reused, and the rest are split into requests of at most
+    `max_batch_size` texts and `max_batch_tokens` estimated tokens, sent concurrently
+    within `max_concurrency` and the budget of `rate_limiter`.
+
+    Args:
+        embedding_model_type (EmbeddingModelType): The model to use.
+        dimensions (int | None): Size of the vectors, for models that support shortening them.
+        max_batch_size (int): Maximum number of texts per request.
+        max_batch_tokens (int): Maximum estimated tokens per request.
+        max_concurrency (int): Maximum number of requests in flight.
+        rate_limiter (AsyncRateLimiter | None): Shared request and token budget.
+        cache (Cache | None): Cache of vectors by content hash.
+
+    """
+
     def __init__(
         self,
         embedding_model_type: EmbeddingModelType,
         dimensions: int | None = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: AsyncRateLimiter | None = None,
+        cache: Cache | None = None,
     ) -> None:
         self.embedding_model_type = embedding_model_type
         self.dimensions = dimensions
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.cache = cache
 
     @property
     def embedding_model_name(self) -> str:
@@ -43,6 +107,72 @@ class EmbeddingModel(ABC):
     def run_batch(self, texts: list[str]) -> list[Embedding]:
         pass
 
+    async def _aembed(self, texts: list[str]) -> "np.ndarray":
+        """Embed one request worth of texts, returning a float32 matrix with a row per text."""
+        embeddings = await asyncio.to_thread(self.run_batch, texts)
+        return np.stack([np.asarray(embedding.embedding, dtype=np.float32) for embedding in embeddings])
+
+    def cache_key(self, text: str) -> str:
+        """Content hash identifying the vector of `text` for this model and size."""
+        return hashlib.sha256(f"{self.embedding_model_type}:{self.dimensions}:{text}".encode()).hexdigest()
+
+    def _batches(self, texts: list[str], indices: list[int]) -> Iterator[tuple[list[int], int]]:
+        """Split `indices` into requests within the size and token limits, with their estimated tokens."""
+        batch, batch_tokens = [], 0
+        for index in indices:
+            tokens = estimate_tokens(texts[index])
+            if batch and (len(batch) >= self.max_batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                yield batch, batch_tokens
+                batch, batch_tokens = [], 0
+            batch.append(index)
+            batch_tokens += tokens
+        if batch:
+            yield batch, batch_tokens
+
+    async def arun_batch(self, texts: list[str]) -> "np.ndarray":
+        """Embed `texts`, returning a contiguous float32 matrix with one row per text, in order."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for arun_batch, install it with `pip install numpy`")
+
+        # Reference: https://platform.openai.com/docs/guides/embeddings/use-cases
+        cleaned = [text.replace("\n", " ") for text in texts]
+        positions: dict[str, int] = {}
+        inverse = np.fromiter((positions.setdefault(text, len(positions)) for text in cleaned), dtype=np.intp, count=len(cleaned))
+        unique = list(positions)
+        if not unique:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+
+        vectors: list[np.ndarray | None] = [None] * len(unique)
+        keys = [self.cache_key(text) for text in unique] if self.cache is not None else []
+        # one lookup for all texts, a single worker thread call for the disk cache
+        cached = await self.cache.alookup_many(keys) if self.cache is not None else [MISSING] * len(unique)
+        missing = []
+        for index, value in enumerate(cached):
+            if value is MISSING:
+                missing.append(index)
+            else:
+                vectors[index] = np.frombuffer(value, dtype=np.float32)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed(batch: list[int], tokens: int) -> None:
+            async with semaphore:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(tokens)
+                matrix = await self._aembed([unique[index] for index in batch])
+            for index, vector in zip(batch, matrix, strict=True):
+                vectors[index] = vector
+            if self.cache is not None:
+                # completed batches stay cached even if another one fails
+                await self.cache.aset_many({keys[index]: vector.tobytes() for index, vector in zip(batch, matrix, strict=True)})
+
+        # a failing request cancels the others
+        async with asyncio.TaskGroup() as group:
+            for batch, tokens in self._batches(unique, missing):
+                group.create_task(embed(batch, tokens))
+
+        return np.ascontiguousarray(np.stack(vectors)[inverse])
+
 
 class OpenAIEmbeddingModel(EmbeddingModel):
     def __init__(
@@ -54,9 +184,22 @@ class OpenAIEmbeddingModel(EmbeddingModel):
         organization: str | None = None,
         timeout: float | None = None,
         max_retries: int = 5,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: AsyncRateLimiter | None = None,
+        cache: Cache | None = None,
         **kwargs,
     ) -> None:
-        super().__init__(embedding_model_type=embedding_model_type, dimensions=dimensions)
+        super().__init__(
+            embedding_model_type=embedding_model_type,
+            dimensions=dimensions,
+            max_batch_size=max_batch_size,
+            max_batch_tokens=max_batch_tokens,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            cache=cache,
+        )
 
         _api_key = os.getenv("OPENAI_API_KEY") if api_key is None else api_key
         if not _api_key:
@@ -71,13 +214,28 @@ class OpenAIEmbeddingModel(EmbeddingModel):
             self.max_retries = int(os.environ.get("OPENAI_MAX_RETRIES", 5))
 
         self.api_key = _api_key
-        self.client = OpenAI(
-            api_key=_api_key,
-            base_url=api_base_url,
-            organization=organization,
-            timeout=timeout,
-            max_retries=max_retries,
+        self.client = get_client(OpenAI, _api_key, api_base_url, timeout, max_retries, organization=organization)
+        self.async_client = get_client(AsyncOpenAI, _api_key, api_base_url, timeout, max_retries, organization=organization)
+
+    def _dimensions(self) -> int | openai.NotGiven:
+        if self.dimensions is not None and self.dimensions > 0:
+            return self.dimensions
+        return openai.NOT_GIVEN
+
+    async def _aembed(self, texts: list[str]) -> "np.ndarray":
+        # base64 responses skip parsing thousands of JSON floats per vector
+        embedding_response = await self.async_client.embeddings.create(
+            input=texts,
+            model=self.embedding_model_name,
+            dimensions=self._dimensions(),
+            encoding_format="base64",
         )
+        data = sorted(embedding_response.data, key=lambda embedding: embedding.index)
+        if all(isinstance(embedding.embedding, str) for embedding in data):
+            buffer = b"".join(base64.b64decode(embedding.embedding) for embedding in data)
+            return np.frombuffer(buffer, dtype=np.float32).reshape(len(data), -1)
+        # servers that ignore the requested encoding send lists of floats
+        return np.asarray([embedding.embedding for embedding in data], dtype=np.float32)
 
     # @cache(CacheType.DISK)
     def run_batch(self, texts: list[str]) -> list[Embedding]:
@@ -87,11 +245,12 @@ class OpenAIEmbeddingModel(EmbeddingModel):
             text = text.replace("\n", " ")
             _texts.append(text)
 
-        dimensions: int | openai.NOT_GIVEN = openai.NOT_GIVEN
-        if self.dimensions is not None and self.dimensions > 0:
-            dimensions = self.dimensions
+        embedding_response = self.client.embeddings.create(input=_texts, model=self.embedding_model_name, dimensions=self._dimensions())
 
-        embedding_response = self.client.embeddings.create(input=_texts, model=self.embedding_model_name, dimensions=dimensions)
+        if NUMPY_AVAILABLE:
+            # one matrix for the whole batch, each embedding views its row
+            matrix = np.asarray([embedding.embedding for embedding in embedding_response.data], dtype=np.float32)
+            return Embedding.from_matrix(matrix)
 
         embeddings = []
         for i, embedding in enumerate(embedding_response.data):
@@ -0,0 +1,308 @@
+import os
+import struct
+from collections.abc import Iterator, Sequence
+from enum import Enum
+from typing import Any
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+
+class Quantization(str, Enum):
+    """How vector components are stored."""
+
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"  # symmetric, with one float32 scale per vector
+
+
+_DTYPES = {
+    Quantization.FLOAT32: np.dtype("<f4"),
+    Quantization.FLOAT16: np.dtype("<f2"),
+    Quantization.INT8: np.dtype("i1"),
+}
+_CODES = {Quantization.FLOAT32: 0, Quantization.FLOAT16: 1, Quantization.INT8: 2}
+_QUANTIZATIONS = {code: quantization for quantization, code in _CODES.items()}
+
+_FORMAT_VERSION = 1
+# magic, version, quantization code, dimensions, scale
+_VECTOR_HEADER = struct.Struct("<2sBBIf")
+# magic, version, quantization code, rows, dimensions
+_BATCH_HEADER = struct.Struct("<2sBBII")
+
+
+def _quantize(matrix: np.ndarray, quantization: Quantization) -> tuple[np.ndarray, np.ndarray | None]:
+    """Quantize the rows of a float matrix, returning the data and the int8 scales, if any."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if quantization != Quantization.INT8:
+        return np.ascontiguousarray(matrix, dtype=_DTYPES[quantization]), None
+
+    scales = np.abs(matrix).max(axis=-1, keepdims=True) / 127
+    scales[scales == 0] = 1
+    data = np.clip(np.rint(matrix / scales), -127, 127).astype(np.int8)
+    return data, scales[..., 0].astype(np.float32)
+
+
+def _aligned(size: int) -> int:
+    return (size + 3) & ~3
+
+
+class Vector:
+    """A dense embedding vector backed by a NumPy array.
+
+    Components are float32, or quantized to float16 or int8 to save memory. A vector
+    can be a view into a row of a `VectorBatch`, so building many of them from one
+    matrix copies nothing. It also behaves like the `list[float]` it replaces:
+    it has a length, can be indexed and iterated, compares equal to lists and
+    `tolist` returns a plain list.
+
+    In pydantic models, fields of this type accept lists, arrays, bytes from
+    `to_bytes` and other vectors, and are dumped as lists.
+
+    Args:
+        data: The components, as float32 or as already quantized values.
+        scale (float | None): Scale of int8 components.
+
+    """
+
+    __slots__ = ("_data", "_scale")
+
+    def __init__(self, data: Any, scale: float | None = None):
+        if isinstance(data, np.ndarray) and data.dtype in _DTYPES.values():
+            array = data
+        else:
+            array = np.asarray(data, dtype=np.float32)
+        if array.ndim != 1:
+            raise ValueError(f"Vector must be one dimensional, got shape {array.shape}")
+        if array.dtype == np.int8 and scale is None:
+            raise ValueError("int8 vectors need a scale")
+        self._data = array
+        self._scale = scale
+
+    @classmethod
+    def coerce(cls, value: Any) -> "Vector":
+        """Build a vector from any of the accepted representations."""
+        if isinstance(value, Vector):
+            return value
+        if isinstance(value, bytes | bytearray | memoryview):
+            return cls.from_bytes(value)
+        return cls(value)
+
+    @property
+    def quantization(self) -> Quantization:
+        for quantization, dtype in _DTYPES.items():
+            if self._data.dtype == dtype:
+                return quantization
+        return Quantization.FLOAT32
+
+    @property
+    def data(self) -> np.ndarray:
+        """The stored components, quantized if the vector is."""
+        return self._data
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the components as float32, without copying unless the vector is quantized."""
+        if self._data.dtype == np.float32:
+            return self._data
+        if self._scale is not None:
+            return self._data.astype(np.float32) * np.float32(self._scale)
+        return self._data.astype(np.float32)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.to_numpy()
+        return array if dtype is None else array.astype(dtype)
+
+    def tolist(self) -> list[float]:
+        return self.to_numpy().tolist()
+
+    def quantize(self, quantization: Quantization | str) -> "Vector":
+        """Return a copy stored with `quantization`."""
+        data, scales = _quantize(self.to_numpy(), Quantization(quantization))
+        return Vector(data, None if scales is None else float(scales))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index):
+        values = self.to_numpy()[index]
+        return values.tolist() if isinstance(values, np.ndarray) else float(values)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Vector):
+            other = other.to_numpy()
+        elif isinstance(other, str | bytes) or not isinstance(other, Sequence | np.ndarray):
+            return NotImplemented
+        other = np.asarray(other, dtype=np.float32)
+        return other.shape == self._data.shape and bool(np.array_equal(self.to_numpy(), other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Vector(dimensions={len(self)}, quantization={self.quantization.value})"
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a small header followed by the raw little-endian components."""
+        header = _VECTOR_HEADER.pack(b"AV", _FORMAT_VERSION, _CODES[self.quantization], len(self), 1.0 if self._scale is None else self._scale)
+        return header + self._data.tobytes()
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes | bytearray | memoryview) -> "Vector":
+        """Read a vector written by `to_bytes`, viewing the buffer without copying."""
+        magic, version, code, dimensions, scale = _VECTOR_HEADER.unpack_from(buffer)
+        if magic != b"AV" or version != _FORMAT_VERSION:
+            raise ValueError("Not a serialized vector")
+        quantization = _QUANTIZATIONS[code]
+        data = np.frombuffer(buffer, dtype=_DTYPES[quantization], count=dimensions, offset=_VECTOR_HEADER.size)
+        return cls(data, scale if quantization == Quantization.INT8 else None)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda vector: vector.tolist()),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema, handler) -> dict[str, Any]:
+        return {"type": "array", "items": {"type": "number"}}
+
+
+class VectorBatch:
+    """A matrix of vectors with the same dimensions, stored contiguously.
+
+    Rows are returned as `Vector` views, so a batch of embeddings costs one array
+    instead of one Python object per component. Batches serialize to a header
+    followed by the raw matrix, and `load` memory-maps files written by `save`.
+
+    Args:
+        matrix: Float32 rows, or already quantized rows.
+        scales: Per-row scales of an int8 matrix.
+
+    """
+
+    def __init__(self, matrix: Any, scales: Any = None):
+        # kept as is, so views and memory maps stay views
+        if isinstance(matrix, np.ndarray) and matrix.dtype in _DTYPES.values():
+            array = matrix
+        else:
+            array = np.asarray(matrix, dtype=np.float32)
+        if array.ndim != 2:
+            raise ValueError(f"VectorBatch must be two dimensional, got shape {array.shape}")
+        if array.dtype == np.int8 and scales is None:
+            raise ValueError("int8 batches need per-row scales")
+        self.matrix = array
+        self.scales = None if scales is None else np.asarray(scales, dtype=np.float32)
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Any], quantization: Quantization | str = Quantization.FLOAT32) -> "VectorBatch":
+        matrix = np.stack([Vector.coerce(vector).to_numpy() for vector in vectors]) if vectors else np.empty((0, 0), dtype=np.float32)
+        return cls(matrix).quantize(quantization)
+
+    @property
+    def quantization(self) -> Quantization:
+        for quantization, dtype in _DTYPES.items():
+            if self.matrix.dtype == dtype:
+                return quantization
+        return Quantization.FLOAT32
+
+    @property
+    def dimensions(self) -> int:
+        return self.matrix.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + (0 if self.scales is None else self.scales.nbytes)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __getitem__(self, index: int) -> Vector:
+        return Vector(self.matrix[index], None if self.scales is None else float(self.scales[index]))
+
+    def __iter__(self) -> Iterator[Vector]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the rows as a float32 matrix, without copying unless the batch is quantized."""
+        if self.matrix.dtype == np.float32:
+            return self.matrix
+        if self.scales is not None:
+            return self.matrix.astype(np.float32) * self.scales[:, None]
+        return self.matrix.astype(np.float32)
+
+    def quantize(self, quantization: Quantization | str) -> "VectorBatch":
+        """Return the batch stored with `quantization`, or itself if it already is."""
+        quantization = Quantization(quantization)
+        if quantization == self.quantization:
+            return self
+        data, scales = _quantize(self.to_numpy(), quantization)
+        return VectorBatch(data, scales)
+
+    def _header(self) -> bytes:
+        return _BATCH_HEADER.pack(b"AB", _FORMAT_VERSION, _CODES[self.quantization], len(self), self.matrix.shape[1])
+
+    def _chunks(self) -> Iterator[bytes]:
+        yield self._header()
+        data = np.ascontiguousarray(self.matrix).tobytes()
+        yield data
+        if self.scales is not None:
+            # keep the float32 scales 4-byte aligned
+            yield b"\0" * (_aligned(len(data)) - len(data))
+            yield self.scales.tobytes()
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a header followed by the raw matrix and, for int8, the scales."""
+        return b"".join(self._chunks())
+
+    @classmethod
+    def _read(cls, header: bytes, view) -> "VectorBatch":
+        magic, version, code, rows, dimensions = _BATCH_HEADER.unpack_from(header)
+        if magic != b"AB" or version != _FORMAT_VERSION:
+            raise ValueError("Not a serialized vector batch")
+        quantization = _QUANTIZATIONS[code]
+        dtype = _DTYPES[quantization]
+        size = rows * dimensions * dtype.itemsize
+        matrix = view(dtype, rows * dimensions, _BATCH_HEADER.size).reshape(rows, dimensions)
+        scales = None
+        if quantization == Quantization.INT8:
+            scales = view(np.dtype("<f4"), rows, _BATCH_HEADER.size + _aligned(size))
+        return cls(matrix, scales)
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes | bytearray | memoryview) -> "VectorBatch":
+        """Read a batch written by `to_bytes`, viewing the buffer without copying."""
+        return cls._read(bytes(buffer[: _BATCH_HEADER.size]), lambda dtype, count, offset: np.frombuffer(buffer, dtype=dtype, count=count, offset=offset))
+
+    def save(self, path: str) -> None:
+        """Write the batch to `path`, atomically replacing any existing file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for chunk in self._chunks():
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorBatch":
+        """Read a batch written by `save`, memory-mapped read-only unless `mmap` is False."""
+        if not mmap:
+            with open(path, "rb") as f:
+                return cls.from_bytes(f.read())
+
+        with open(path, "rb") as f:
+            header = f.read(_BATCH_HEADER.size)
+
+        def view(dtype, count, offset):
+            if count == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+        return cls._read(header, view)
@@ -6,20 +6,40 @@ from .base import (
     Message,
     Role,
     ToolCall,
+    ToolCallDelta,
 )
 from .builder import LanguageModelBuilder, LanguageModelConfig, get_language_model
+from .cache import DiskResponseCache, MemoryResponseCache, ResponseCache
+from .hedged import HedgedLanguageModel
 from .openai import OpenAILanguageModel
+from .scheduler import (
+    Priority,
+    RequestScheduler,
+    configure_scheduler,
+    get_scheduler,
+    scheduling_priority,
+)
 
 __all__ = [
+    "DiskResponseCache",
+    "HedgedLanguageModel",
     "LanguageModel",
     "LanguageModelBuilder",
     "LanguageModelConfig",
     "LanguageModelProvider",
     "LanguageModelResponse",
     "LanguageModelType",
+    "MemoryResponseCache",
     "Message",
     "OpenAILanguageModel",
+    "Priority",
+    "RequestScheduler",
+    "ResponseCache",
     "Role",
     "ToolCall",
+    "ToolCallDelta",
+    "configure_scheduler",
     "get_language_model",
+    "get_scheduler",
+    "scheduling_priority",
 ]
@@ -1,16 +1,21 @@
+import json
 import os
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
+from agentifyme.ml.clients import get_client
+
 from .base import (
     CacheType,
     LanguageModel,
+    LanguageModelProvider,
     LanguageModelResponse,
     LanguageModelType,
     Message,
     Role,
     TokenUsage,
     ToolCall,
+    ToolCallDelta,
 )
 
 try:
@@ -33,6 +38,50 @@ class AnthropicError(Exception):
     """Custom exception for Anthropic-specific errors."""
 
 
+class _StreamAccumulator:
+    """Turns the events of a streamed message into response chunks.
+
+    Text deltas are passed on as they arrive. Tool calls and usage are only known once
+    the message ends, so they come in a last chunk.
+    """
+
+    def __init__(self, model: "AnthropicLanguageModel"):
+        self.model = model
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.tools: dict[int, dict[str, Any]] = {}
+
+    def add(self, event) -> LanguageModelResponse | None:
+        if event.type == "message_start":
+            self.prompt_tokens = event.message.usage.input_tokens
+        elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+            self.tools[event.index] = {"name": event.content_block.name, "id": event.content_block.id, "input": ""}
+            delta = ToolCallDelta(index=event.index, tool_call_id=event.content_block.id, name=event.content_block.name)
+            return LanguageModelResponse(role=Role.ASSISTANT, tool_call_deltas=[delta])
+        elif event.type == "content_block_delta":
+            if event.delta.type == "text_delta":
+                return LanguageModelResponse(message=event.delta.text, role=Role.ASSISTANT)
+            if event.delta.type == "input_json_delta":
+                self.tools[event.index]["input"] += event.delta.partial_json
+                delta = ToolCallDelta(index=event.index, arguments=event.delta.partial_json)
+                return LanguageModelResponse(role=Role.ASSISTANT, tool_call_deltas=[delta])
+        elif event.type == "message_delta":
+            self.completion_tokens = event.usage.output_tokens
+        return None
+
+    def final(self) -> LanguageModelResponse:
+        tool_calls = [
+            ToolCall(name=tool["name"], arguments=json.loads(tool["input"]) if tool["input"] else {}, tool_call_id=tool["id"])
+            for _, tool in sorted(self.tools.items())
+        ]
+        return LanguageModelResponse(
+            message=None,
+            role=Role.ASSISTANT,
+            tool_calls=tool_calls or None,
+            usage=self.model._usage(self.prompt_tokens, self.completion_tokens),
+        )
+
+
 class AnthropicLanguageModel(LanguageModel):
     def __init__(
         self,
@@ -52,9 +101,48 @@ class AnthropicLanguageModel(LanguageModel):
             raise ValueError("Anthropic API key is required")
 
         self.api_key = _api_key
-        self.client = anthropic.Anthropic(api_key=_api_key)
+        self.client = get_client(anthropic.Anthropic, _api_key)
+        self.async_client = get_client(anthropic.AsyncAnthropic, _api_key)
         self.model = llm_model
 
+    def _request(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None,
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        provider, model_name = self.get_model_name(self.model)
+        assert provider == LanguageModelProvider.ANTHROPIC, f"Invalid provider: {provider}"
+
+        request: dict[str, Any] = {
+            "model": model_name,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "messages": self.convert_messages_to_params(messages),
+            **kwargs,
+        }
+        # Anthropic takes the system prompt as a parameter, not as a message
+        system = "\n\n".join(message.content for message in messages if message.role == Role.SYSTEM and isinstance(message.content, str))
+        if system:
+            request["system"] = system
+        if tools:
+            request["tools"] = self._to_anthropic_tools(tools)
+        return request
+
+    def _to_anthropic_tools(self, tools: list[ToolCall]) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": tool.name,
+                "description": tool.description or "",
+                "input_schema": tool.parameters or {"type": "object", "properties": {}},
+            }
+            for tool in tools
+        ]
+
     def generate(
         self,
         messages: list[Message],
@@ -64,30 +152,28 @@ class AnthropicLanguageModel(LanguageModel):
         top_p: float = 1.0,
         **kwargs,
     ) -> LanguageModelResponse:
-        provider, model_name = self.get_model_name(self.model)
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
 
-        anthropic_messages = self.convert_messages_to_params(messages)
+        def _generate() -> LanguageModelResponse:
+            return self._process_response(self.client.messages.create(**request))
 
-        response = self.client.messages.create(
-            model=model_name,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            top_p=top_p,
-            messages=anthropic_messages,
-        )
+        return self._generate_cached(messages, tools, _generate, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
 
-        response_text = ""
+    async def agenerate(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> LanguageModelResponse:
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
 
-        for block in response.content:
-            if block.type == "tool_use":
-                # pass and do nothing for now:
-                continue
-            if block.type == "text":
-                response_text = block.text
-            else:
-                raise ValueError(f"Unsupported content block type: {block.type}")
+        async def _agenerate() -> LanguageModelResponse:
+            return self._process_response(await self.async_client.messages.create(**request))
 
-        return LanguageModelResponse(message=response_text, usage=TokenUsage())
+        return await self._agenerate_cached(messages, tools, _agenerate, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
 
     def generate_stream(
         self,
@@ -98,13 +184,90 @@ class AnthropicLanguageModel(LanguageModel):
         top_p: float = 1.0,
         **kwargs: Any,
     ) -> Iterator[LanguageModelResponse]:
-        raise NotImplementedError("AgentifyMe does not support Anthropic streaming yet.")
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
+        accumulator = _StreamAccumulator(self)
+
+        stream = self.client.messages.create(**request, stream=True)
+        try:
+            for event in stream:
+                chunk = accumulator.add(event)
+                if chunk is not None:
+                    yield chunk
+        finally:
+            stream.close()
+        yield accumulator.final()
+
+    async def agenerate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> AsyncIterator[LanguageModelResponse]:
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
+        accumulator = _StreamAccumulator(self)
+
+        stream = await self.async_client.messages.create(**request, stream=True)
+        # closing the stream when the consumer stops or is cancelled frees the connection
+        try:
+            async for event in stream:
+                chunk = accumulator.add(event)
+                if chunk is not None:
+                    yield chunk
+        finally:
+            await stream.close()
+        yield accumulator.final()
+
+    def calculate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        # Prices in dollars per million tokens, simplified like the OpenAI pricing
+        if "haiku" in model:
+            return (prompt_tokens * 0.25 + completion_tokens * 1.25) / 1_000_000
+        if "sonnet" in model:
+            return (prompt_tokens * 3 + completion_tokens * 15) / 1_000_000
+        if "opus" in model:
+            return (prompt_tokens * 15 + completion_tokens * 75) / 1_000_000
+        return 0.0
+
+    def _usage(self, prompt_tokens: int, completion_tokens: int) -> TokenUsage:
+        return TokenUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=self.calculate_cost(self.model.value, prompt_tokens, completion_tokens),
+            calls=1,
+        )
+
+    def _process_response(self, response) -> LanguageModelResponse:
+        """Process the API response into a LanguageModelResponse"""
+        texts: list[str] = []
+        tool_calls: list[ToolCall] = []
+        for block in response.content:
+            if block.type == "text":
+                texts.append(block.text)
+            elif block.type == "tool_use":
+                tool_calls.append(ToolCall(name=block.name, arguments=block.input, tool_call_id=block.id))
+            else:
+                raise ValueError(f"Unsupported content block type: {block.type}")
+
+        usage = None
+        if response.usage:
+            usage = self._usage(response.usage.input_tokens, response.usage.output_tokens)
+
+        return LanguageModelResponse(
+            message="".join(texts),
+            role=Role.ASSISTANT,
+            tool_calls=tool_calls if tool_calls else None,
+            usage=usage,
+            cached=False,
+            error=None,
+        )
 
     def convert_messages_to_params(self, messages: list[Message]):
         anthropic_messages: list[MessageParam] = []
 
         for message in messages:
-            if message.content is None:
+            if message.content is None or message.role == Role.SYSTEM:
                 continue
 
             # Prepare the content based on its type
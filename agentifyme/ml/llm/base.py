@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from openai import BaseModel
 
 from agentifyme.cache import CacheType
 
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .scheduler import Priority, RequestScheduler
+
 
 class Role(str, Enum):
     USER = "user"
@@ -23,12 +27,29 @@ class ToolCall(BaseModel):
     tool_call_id: str | None = None
 
 
+class ToolCallDelta(BaseModel):
+    """A piece of a tool call streamed by the model. Fragments of `arguments` concatenate to JSON."""
+
+    index: int
+    tool_call_id: str | None = None
+    name: str | None = None
+    arguments: str = ""
+
+
 class TokenUsage(BaseModel):
     prompt_tokens: int = 0
     completion_tokens: int = 0
     cost: float = 0.0
     calls: int = 0
 
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cost=self.cost + other.cost,
+            calls=self.calls + other.calls,
+        )
+
 
 class Message(BaseModel):
     role: Role
@@ -44,6 +65,7 @@ class LanguageModelResponse(BaseModel):
     role: Role = Role.ASSISTANT
     tool_id: str = ""  # used by OpenAIAssistant
     tool_calls: list[ToolCall] | None = None
+    tool_call_deltas: list[ToolCallDelta] | None = None  # set on streamed chunks
     usage: TokenUsage | None = None
     cached: bool = False
     error: str | None = None
@@ -101,11 +123,59 @@ class LanguageModel(ABC):
         llm_model: LanguageModelType,
         llm_cache_type: CacheType = CacheType.NONE,
         system_prompt: str | None = None,
+        response_cache: "ResponseCache | None" = None,
+        scheduler: "RequestScheduler | None" = None,
+        priority: "Priority | str | None" = None,
         **kwargs: Any,
     ):
         self.llm_model = llm_model
         self.llm_cache_type = llm_cache_type
         self.system_prompt = system_prompt
+        self.response_cache = response_cache if response_cache is not None else get_response_cache(llm_cache_type)
+        self._scheduler = scheduler
+        self.priority = priority
+
+    @property
+    def scheduler(self) -> "RequestScheduler":
+        """The scheduler async requests go through, by default the one shared by all instances of the model."""
+        return self._scheduler if self._scheduler is not None else get_scheduler(self.llm_model.value)
+
+    def _response_cache_key(self, messages: list[Message], tools: list[ToolCall] | None, **params: Any) -> str:
+        return response_cache_key(self.llm_model.value, messages, tools, system_prompt=self.system_prompt, **params)
+
+    def _generate_cached(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None,
+        generate: Callable[[], LanguageModelResponse],
+        **params: Any,
+    ) -> LanguageModelResponse:
+        """Serve `generate` through the response cache, keyed on the request."""
+        if self.response_cache is None:
+            return generate()
+        key = self._response_cache_key(messages, tools, **params)
+        return self.response_cache.get_or_generate(key, generate)
+
+    async def _agenerate_cached(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None,
+        generate: Callable[[], Awaitable[LanguageModelResponse]],
+        **params: Any,
+    ) -> LanguageModelResponse:
+        """Serve `generate` through the response cache, coalescing concurrent identical requests.
+
+        Requests that miss the cache are admitted by the model's scheduler.
+        """
+        tokens = estimate_request_tokens(messages, params.get("max_tokens"), self.system_prompt)
+
+        async def scheduled() -> LanguageModelResponse:
+            return await self.scheduler.run(generate, tokens=tokens, priority=self.priority)
+
+        if self.response_cache is None:
+            return await scheduled()
+        key = self._response_cache_key(messages, tools, **params)
+        return await self.response_cache.aget_or_generate(key, scheduled)
 
     @abstractmethod
     def generate(
@@ -143,6 +213,25 @@ class LanguageModel(ABC):
     ) -> Iterator[LanguageModelResponse]:
         pass
 
+    async def agenerate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs,
+    ) -> AsyncIterator[LanguageModelResponse]:
+        """Stream the response as it is generated.
+
+        Chunks carry message text and `tool_call_deltas` as they arrive. The last chunk
+        has the complete `tool_calls` and the usage. Closing the iterator early, or
+        cancelling the task consuming it, closes the connection to the provider.
+
+        Providers without async streaming yield the whole `agenerate` response as one chunk.
+        """
+        yield await self.agenerate(messages, tools=tools, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
+
     def generate_stream_from_prompt(
         self,
         prompt: str,
@@ -260,3 +349,8 @@ class LanguageModel(ABC):
             raise ValueError(f"Invalid model type format: {model}. Expected format: 'provider/model'")
         except KeyError:
             raise ValueError(f"Unsupported provider: {provider_name}")
+
+
+# imported last: both modules import the types defined above
+from .cache import get_response_cache, response_cache_key  # noqa: E402
+from .scheduler import estimate_request_tokens, get_scheduler  # noqa: E402
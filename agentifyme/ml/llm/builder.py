@@ -8,6 +8,7 @@ from agentifyme.utilities.env import load_env_file
 from .anthropic import AnthropicLanguageModel
 from .base import LanguageModel, LanguageModelProvider, LanguageModelType
 from .groq import GroqLanguageModel
+from .hedged import HedgedLanguageModel
 from .openai import OpenAILanguageModel
 
 
@@ -27,6 +28,11 @@ class LanguageModelConfig(BaseModel):
     organization: str | None = None
     project: str | None = None
 
+    # models tried after `model`, see HedgedLanguageModel
+    fallback_models: list[LanguageModelType] = []
+    hedge_after: float | None = None
+    attempt_timeout: float | None = None
+
     env_file: str | None = None
 
     @property
@@ -56,6 +62,9 @@ class LanguageModelBuilder:
         return MemoryCache()  # Default to memory cache
 
     def create_llm(self) -> LanguageModel:
+        if self.config.fallback_models:
+            return self._create_hedged_llm()
+
         cache_strategy = self.create_cache()
         if self.config.provider == LanguageModelProvider.OPENAI:
             if importlib.util.find_spec("openai") is not None:
@@ -95,6 +104,16 @@ class LanguageModelBuilder:
             raise ImportError("The 'anthropic' package is not installed. Please install it to use Anthropic models.")
         raise ValueError(f"Unsupported provider: {self.config.provider}")
 
+    def _create_hedged_llm(self) -> HedgedLanguageModel:
+        models = []
+        for model in [self.config.model, *self.config.fallback_models]:
+            config = self.config.model_copy(update={"model": model, "fallback_models": [], "hedge_after": None, "attempt_timeout": None})
+            # the API key is the primary model's, fallbacks on other providers read theirs from the environment
+            if config.provider != self.config.provider:
+                config = config.model_copy(update={"api_key": None, "organization": None, "project": None})
+            models.append(LanguageModelBuilder(config).create_llm())
+        return HedgedLanguageModel(models, hedge_after=self.config.hedge_after, timeout=self.config.attempt_timeout)
+
 
 def get_language_model(config: LanguageModelConfig) -> LanguageModel:
     builder = LanguageModelBuilder(config)
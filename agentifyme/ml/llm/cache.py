@@ -0,0 +1,132 @@
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+from agentifyme.cache import (
+    Cache,
+    CacheType,
+    Coalescer,
+    DiskCache,
+    EvictionPolicy,
+    MemoryCache,
+)
+
+from .base import LanguageModelResponse, Message, ToolCall
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", exclude_none=True)
+    return str(obj)
+
+
+def response_cache_key(
+    model: str,
+    messages: list[Message],
+    tools: list[ToolCall] | None = None,
+    **params: Any,
+) -> str:
+    """Canonical hash of everything that determines an LLM response.
+
+    Messages, tools and sampling parameters are serialized with sorted keys, so the
+    key doesn't depend on dict ordering or on how the messages were constructed.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "tools": tools or [],
+        "params": {k: v for k, v in params.items() if v is not None},
+    }
+    return hashlib.sha256(orjson.dumps(payload, default=_default, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class ResponseCache:
+    """LLM response cache on top of an `agentifyme.cache` backend.
+
+    Adds request coalescing, so concurrent identical requests share a single upstream
+    call, and marks responses served from the cache with `cached=True`.
+
+    Args:
+        backend (Cache[LanguageModelResponse]): Where responses are stored.
+
+    """
+
+    def __init__(self, backend: Cache[LanguageModelResponse]):
+        self.backend = backend
+        self._coalescer: Coalescer[LanguageModelResponse] = Coalescer()
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def get(self, key: str) -> LanguageModelResponse | None:
+        return self.backend.get(key)
+
+    def set(self, key: str, response: LanguageModelResponse) -> None:
+        self.backend.set(key, response)
+
+    def get_or_generate(self, key: str, generate: Callable[[], LanguageModelResponse]) -> LanguageModelResponse:
+        """Return the cached response for `key`, calling `generate` on a miss."""
+        cached = self.backend.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True})
+
+        response = generate()
+        if response.error is None:
+            self.backend.set(key, response)
+        return response
+
+    async def aget_or_generate(self, key: str, generate: Callable[[], Awaitable[LanguageModelResponse]]) -> LanguageModelResponse:
+        """Async variant of `get_or_generate` that coalesces concurrent misses for the same key."""
+        cached = await self.backend.aget(key)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True})
+
+        async def store(response: LanguageModelResponse) -> None:
+            if response.error is None:
+                await self.backend.aset(key, response)
+
+        response, shared = await self._coalescer.run(key, generate, store)
+        return response.model_copy(update={"cached": True}) if shared else response
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-memory LRU response cache bounded by entry count and TTL.
+
+    Args:
+        max_entries (int): Least recently used responses are evicted beyond this size.
+        ttl (float | None): Seconds a response stays valid.
+
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = 3600):
+        super().__init__(MemoryCache(max_entries=max_entries, ttl=ttl, policy=EvictionPolicy.LRU, name="llm"))
+
+
+class DiskResponseCache(ResponseCache):
+    """On-disk response cache, sharded and written atomically by `DiskCache`.
+
+    Args:
+        cache_dir (str): Directory holding the cache shards.
+        ttl (float | None): Seconds a response stays valid.
+        max_bytes (int | None): Least recently used responses are evicted beyond this size.
+
+    """
+
+    def __init__(self, cache_dir: str = "/tmp/agentifyme-llm-cache", ttl: float | None = None, max_bytes: int | None = None):
+        super().__init__(DiskCache(cache_dir, max_bytes=max_bytes, ttl=ttl, name="llm"))
+
+
+_shared_caches: dict[CacheType, ResponseCache] = {}
+
+
+def get_response_cache(cache_type: CacheType) -> ResponseCache | None:
+    """Return the process-wide response cache for `cache_type`, shared by all providers."""
+    if cache_type not in (CacheType.MEMORY, CacheType.DISK):
+        return None
+
+    if cache_type not in _shared_caches:
+        _shared_caches[cache_type] = MemoryResponseCache() if cache_type == CacheType.MEMORY else DiskResponseCache()
+    return _shared_caches[cache_type]
@@ -1,7 +1,9 @@
+import json
 import os
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
+from agentifyme.ml.clients import get_client
 from agentifyme.ml.llm import LanguageModel
 
 from .base import (
@@ -15,9 +17,10 @@ from .base import (
     TokenUsage,
     ToolCall,
 )
+from .streaming import ChatStreamAccumulator
 
 try:
-    from groq import Groq
+    from groq import AsyncGroq, Groq
     from groq.types.chat import (
         ChatCompletion,
         ChatCompletionAssistantMessageParam,
@@ -36,7 +39,6 @@ class GroqError(Exception):
     """Custom exception for Groq-specific errors."""
 
 
-
 class GroqLanguageModel(LanguageModel):
     def __init__(
         self,
@@ -56,9 +58,44 @@ class GroqLanguageModel(LanguageModel):
             raise ValueError("Groq API key is required")
 
         self.api_key = _api_key
-        self.client = Groq(api_key=_api_key)
+        self.client = get_client(Groq, _api_key)
+        self.async_client = get_client(AsyncGroq, _api_key)
         self.model = llm_model
 
+    def _request(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None,
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        provider, model_name = self.get_model_name(self.model)
+        assert provider == LanguageModelProvider.GROQ, f"Invalid provider: {provider}"
+
+        request: dict[str, Any] = {
+            "model": model_name,
+            "messages": self._prepare_messages(messages),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            **kwargs,
+        }
+        if tools:
+            request["tools"] = self._to_groq_tools(tools)
+        return request
+
+    def _to_groq_tools(self, tools: list[ToolCall]) -> list[dict[str, Any]]:
+        # Groq takes tools in the OpenAI format
+        return [
+            {
+                "type": "function",
+                "function": {"name": tool.name, "description": tool.description or "", "parameters": tool.parameters or {}},
+            }
+            for tool in tools
+        ]
+
     def generate(
         self,
         messages: list[Message],
@@ -68,49 +105,37 @@ class GroqLanguageModel(LanguageModel):
         top_p: float = 1.0,
         **kwargs,
     ) -> LanguageModelResponse:
-        if tools:
-            raise NotImplementedError("Groq does not support function calling yet.")
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
 
-        llm_messages = self._prepare_messages(messages)
-        provider, model_name = self.get_model_name(self.model)
-
-        assert provider == LanguageModelProvider.GROQ, f"Invalid provider: {provider}"
+        def _generate() -> LanguageModelResponse:
+            return self._process_response(self.client.chat.completions.create(**request))
 
         try:
-            response = self.client.chat.completions.create(
-                model=model_name,
-                messages=llm_messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                **kwargs,
-            )
-
-            usage = None
-            if response.usage:
-                cost = self.calculate_cost(
-                    model_name,
-                    response.usage.prompt_tokens,
-                    response.usage.completion_tokens,
-                )
-                usage = TokenUsage(
-                    prompt_tokens=response.usage.prompt_tokens,
-                    completion_tokens=response.usage.completion_tokens,
-                    cost=cost,
-                    calls=1,
-                )
-
-            llm_response = LanguageModelResponse(
-                message=response.choices[0].message.content,
-                role=Role.ASSISTANT,
-                tool_calls=None,
-                usage=usage,
+            return self._generate_cached(messages, tools, _generate, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
+        except Exception as e:
+            return LanguageModelResponse(
+                message=None,
                 cached=False,
-                error=None,
+                error=f"Groq API call failed: {e!s}",
             )
 
-            return llm_response
+    async def agenerate(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> LanguageModelResponse:
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
+
+        async def _agenerate() -> LanguageModelResponse:
+            return self._process_response(await self.async_client.chat.completions.create(**request))
 
+        # errors become responses here, after the scheduler has seen them
+        try:
+            return await self._agenerate_cached(messages, tools, _agenerate, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
         except Exception as e:
             return LanguageModelResponse(
                 message=None,
@@ -127,34 +152,49 @@ class GroqLanguageModel(LanguageModel):
         top_p: float = 1.0,
         **kwargs: Any,
     ) -> Iterator[LanguageModelResponse]:
-        if tools:
-            raise NotImplementedError("Groq does not support function calling yet.")
-
-        llm_messages = self._prepare_messages(messages)
-        provider, model_name = self.get_model_name(self.model)
-        assert provider == LanguageModelProvider.GROQ, f"Invalid provider: {provider}"
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
+        accumulator = ChatStreamAccumulator(lambda usage: self._usage(request["model"], usage))
 
         try:
-            stream = self.client.chat.completions.create(
-                model=model_name,
-                messages=llm_messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                stream=True,
-                **kwargs,
+            stream = self.client.chat.completions.create(**request, stream=True)
+            try:
+                for chunk in stream:
+                    response = accumulator.add(chunk)
+                    if response is not None:
+                        yield response
+            finally:
+                stream.close()
+            yield accumulator.final()
+        except Exception as e:
+            yield LanguageModelResponse(
+                message=None,
+                cached=False,
+                error=f"Groq API Error: {e!s}",
             )
 
-            for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
-                    yield LanguageModelResponse(
-                        message=chunk.choices[0].delta.content,
-                        role=Role.ASSISTANT,
-                        tool_calls=None,
-                        usage=None,
-                        cached=False,
-                        error=None,
-                    )
+    async def agenerate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> AsyncIterator[LanguageModelResponse]:
+        request = self._request(messages, tools, max_tokens, temperature, top_p, **kwargs)
+        accumulator = ChatStreamAccumulator(lambda usage: self._usage(request["model"], usage))
+
+        try:
+            stream = await self.async_client.chat.completions.create(**request, stream=True)
+            # closing the stream when the consumer stops or is cancelled frees the connection
+            try:
+                async for chunk in stream:
+                    response = accumulator.add(chunk)
+                    if response is not None:
+                        yield response
+            finally:
+                await stream.close()
+            yield accumulator.final()
         except Exception as e:
             yield LanguageModelResponse(
                 message=None,
@@ -162,6 +202,40 @@ class GroqLanguageModel(LanguageModel):
                 error=f"Groq API Error: {e!s}",
             )
 
+    def _usage(self, model_name: str, usage) -> TokenUsage | None:
+        if usage is None:
+            return None
+        return TokenUsage(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cost=self.calculate_cost(model_name, usage.prompt_tokens, usage.completion_tokens),
+            calls=1,
+        )
+
+    def _process_response(self, response: "ChatCompletion") -> LanguageModelResponse:
+        """Process the API response into a LanguageModelResponse"""
+        _, model_name = self.get_model_name(self.model)
+
+        tool_calls: list[ToolCall] = []
+        for choice in response.choices:
+            for t in choice.message.tool_calls or []:
+                tool_calls.append(
+                    ToolCall(
+                        name=t.function.name,
+                        arguments=json.loads(t.function.arguments),
+                        tool_call_id=t.id,
+                    ),
+                )
+
+        return LanguageModelResponse(
+            message=response.choices[0].message.content,
+            role=Role.ASSISTANT,
+            tool_calls=tool_calls if tool_calls else None,
+            usage=self._usage(model_name, response.usage),
+            cached=False,
+            error=None,
+        )
+
     def _prepare_messages(self, messages: list[Message]):
         llm_messages: list[ChatCompletionMessageParam] = []
 
@@ -0,0 +1,250 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from .base import LanguageModel, LanguageModelResponse, Message, TokenUsage, ToolCall
+
+try:
+    from opentelemetry import metrics, trace
+
+    tracer = trace.get_tracer("agentifyme.llm")
+    meter = metrics.get_meter("agentifyme.llm")
+    attempts_counter = meter.create_counter("llm.attempts", description="Number of requests made by hedged models, by reason and outcome")
+    attempt_cost = meter.create_counter("llm.attempts.cost", unit="USD", description="Cost of the requests made by hedged models, including the losers")
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+
+@dataclass
+class Attempt:
+    """One request made by a `HedgedLanguageModel`."""
+
+    index: int
+    model: LanguageModel
+    reason: str  # primary, hedge or fallback
+    outcome: str = "pending"  # won, failed, timeout or cancelled
+    response: LanguageModelResponse | None = None
+    error: str | None = None
+    duration: float = 0.0
+
+    @property
+    def usage(self) -> TokenUsage | None:
+        return self.response.usage if self.response is not None else None
+
+
+class HedgedLanguageModel(LanguageModel):
+    """Sends each request to an ordered list of models, hedging slow requests and failing over.
+
+    `agenerate` starts with the first model. If no answer arrived after `hedge_after`
+    seconds, the same request goes to the next model while the first keeps running,
+    and the first good response wins. The requests still running are then cancelled.
+    A request that fails, returns an error or takes longer than `timeout` is replaced
+    by a request to the next model. The response gets the usage and cost of every
+    request that completed, losers included.
+
+    The sync and streaming methods can't race requests, so they only fail over: a
+    stream moves to the next model if it fails before yielding any text.
+
+    Args:
+        models (Sequence[LanguageModel]): Models in order of preference.
+        hedge_after (float | None): Seconds before a hedged request is sent. None disables hedging.
+        timeout (float | None): Seconds an async request may take before failing over.
+
+    """
+
+    def __init__(self, models: Sequence[LanguageModel], hedge_after: float | None = None, timeout: float | None = None):
+        if not models:
+            raise ValueError("HedgedLanguageModel needs at least one model")
+        super().__init__(models[0].llm_model)
+        self.models = list(models)
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+
+    def _record(self, attempt: Attempt, span=None) -> None:
+        usage = attempt.usage
+        attributes = {"llm.model_name": attempt.model.llm_model.value, "reason": attempt.reason, "outcome": attempt.outcome}
+        if OTEL_AVAILABLE:
+            attempts_counter.add(1, attributes)
+            if usage is not None and usage.cost:
+                attempt_cost.add(usage.cost, {"llm.model_name": attempt.model.llm_model.value, "outcome": attempt.outcome})
+        if span is not None:
+            span.set_attributes(
+                {
+                    "llm.attempt.outcome": attempt.outcome,
+                    "llm.attempt.duration": attempt.duration,
+                    "llm.attempt.prompt_tokens": usage.prompt_tokens if usage else 0,
+                    "llm.attempt.completion_tokens": usage.completion_tokens if usage else 0,
+                    "llm.attempt.cost": usage.cost if usage else 0.0,
+                },
+            )
+            if attempt.error:
+                span.set_attribute("llm.attempt.error", attempt.error)
+
+    async def _run_attempt(self, attempt: Attempt, messages: list[Message], tools: list[ToolCall] | None, **params: Any) -> Attempt:
+        start = time.monotonic()
+        try:
+            attempt.response = await asyncio.wait_for(attempt.model.agenerate(messages, tools=tools, **params), self.timeout)
+            attempt.outcome = "failed" if attempt.response.error else "won"
+            attempt.error = attempt.response.error
+        except TimeoutError:
+            attempt.outcome, attempt.error = "timeout", f"No response after {self.timeout}s"
+        except asyncio.CancelledError:
+            attempt.outcome = "cancelled"
+            raise
+        except Exception as e:
+            attempt.outcome, attempt.error = "failed", str(e)
+        finally:
+            attempt.duration = time.monotonic() - start
+        return attempt
+
+    async def _attempt(self, attempt: Attempt, messages: list[Message], tools: list[ToolCall] | None, **params: Any) -> Attempt:
+        if not OTEL_AVAILABLE:
+            try:
+                return await self._run_attempt(attempt, messages, tools, **params)
+            finally:
+                self._record(attempt)
+
+        attributes = {"llm.model_name": attempt.model.llm_model.value, "llm.attempt.index": attempt.index, "llm.attempt.reason": attempt.reason}
+        with tracer.start_as_current_span("llm.attempt", attributes=attributes) as span:
+            try:
+                return await self._run_attempt(attempt, messages, tools, **params)
+            finally:
+                self._record(attempt, span)
+
+    @staticmethod
+    def _total_usage(attempts: list[Attempt]) -> TokenUsage | None:
+        usages = [attempt.usage for attempt in attempts if attempt.usage is not None]
+        return sum(usages, TokenUsage()) if usages else None
+
+    async def agenerate(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> LanguageModelResponse:
+        params = {"max_tokens": max_tokens, "temperature": temperature, "top_p": top_p, **kwargs}
+        attempts: list[Attempt] = []
+        pending: set[asyncio.Task] = set()
+
+        def launch(reason: str) -> None:
+            attempt = Attempt(index=len(attempts), model=self.models[len(attempts)], reason=reason)
+            attempts.append(attempt)
+            pending.add(asyncio.create_task(self._attempt(attempt, messages, tools, **params)))
+
+        launch("primary")
+        try:
+            while pending:
+                can_hedge = self.hedge_after is not None and len(attempts) < len(self.models)
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_after if can_hedge else None, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"No response from {attempts[-1].model.llm_model.value} after {self.hedge_after}s, hedging")
+                    launch("hedge")
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    attempt = task.result()
+                    if attempt.outcome == "won":
+                        winner = attempt.response
+                        return winner.model_copy(update={"usage": self._total_usage(attempts)})
+                    logger.warning(f"Request to {attempt.model.llm_model.value} failed: {attempt.error}")
+                    if len(attempts) < len(self.models):
+                        launch("fallback")
+        finally:
+            # cancel the losers, and wait for them so their attempts are recorded
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        errors = "; ".join(f"{attempt.model.llm_model.value}: {attempt.error}" for attempt in attempts)
+        return LanguageModelResponse(message=None, cached=False, error=f"All models failed. {errors}", usage=self._total_usage(attempts))
+
+    def generate(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs,
+    ) -> LanguageModelResponse:
+        errors = []
+        usages = []
+        for model in self.models:
+            try:
+                response = model.generate(messages, tools=tools, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
+            except Exception as e:
+                errors.append(f"{model.llm_model.value}: {e!s}")
+                continue
+            if response.usage is not None:
+                usages.append(response.usage)
+            if response.error is None:
+                return response.model_copy(update={"usage": sum(usages, TokenUsage()) if usages else None})
+            errors.append(f"{model.llm_model.value}: {response.error}")
+
+        return LanguageModelResponse(message=None, cached=False, error=f"All models failed. {'; '.join(errors)}", usage=sum(usages, TokenUsage()) if usages else None)
+
+    def generate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs,
+    ) -> Iterator[LanguageModelResponse]:
+        errors = []
+        for model in self.models:
+            started = False
+            try:
+                for chunk in model.generate_stream(messages, tools=tools, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs):
+                    if chunk.error and not started:
+                        raise ValueError(chunk.error)
+                    started = started or bool(chunk.message or chunk.tool_call_deltas)
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                errors.append(f"{model.llm_model.value}: {e!s}")
+
+        yield LanguageModelResponse(message=None, cached=False, error=f"All models failed. {'; '.join(errors)}")
+
+    async def agenerate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs,
+    ) -> AsyncIterator[LanguageModelResponse]:
+        errors = []
+        for model in self.models:
+            started = False
+            stream = model.agenerate_stream(messages, tools=tools, max_tokens=max_tokens, temperature=temperature, top_p=top_p, **kwargs)
+            try:
+                async for chunk in stream:
+                    if chunk.error and not started:
+                        raise ValueError(chunk.error)
+                    started = started or bool(chunk.message or chunk.tool_call_deltas)
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                errors.append(f"{model.llm_model.value}: {e!s}")
+            finally:
+                await stream.aclose()
+
+        yield LanguageModelResponse(message=None, cached=False, error=f"All models failed. {'; '.join(errors)}")
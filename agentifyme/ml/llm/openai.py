@@ -1,10 +1,8 @@
-import hashlib
 import json
 import os
-from collections.abc import Iterable, Iterator
+from collections.abc import AsyncIterator, Iterable, Iterator
 from typing import Any
 
-from joblib import Memory
 from openai import (
     APIConnectionError,
     APIError,
@@ -23,8 +21,11 @@ from openai.types.chat import (
     ChatCompletionUserMessageParam,
 )
 from openai.types.chat.completion_create_params import ResponseFormat
+from openai.types.completion_usage import CompletionUsage
 from openai.types.shared_params.function_definition import FunctionDefinition
 
+from agentifyme.ml.clients import get_client
+
 from .base import (
     CacheType,
     LanguageModel,
@@ -36,24 +37,7 @@ from .base import (
     TokenUsage,
     ToolCall,
 )
-
-
-def llm_cache_key(model_name, llm_messages, tools):
-    raw_key = model_name
-    if len(llm_messages) > 0:
-        raw_key = raw_key + str(llm_messages)
-
-    if len(tools) > 0:
-        raw_key = raw_key + str(tools)
-
-    hashed_key = hashlib.sha256(raw_key.encode()).hexdigest()
-    return hashed_key
-
-
-class LLMCacheJoblib(Memory):
-    def _cache_key(self, func, *args, **kwargs):
-        model_name, llm_messages, tools = args
-        return llm_cache_key(model_name, llm_messages, tools)
+from .streaming import ChatStreamAccumulator
 
 
 class OpenAILanguageModelException:
@@ -82,33 +66,13 @@ class OpenAILanguageModel(LanguageModel):
             raise ValueError("OpenAI API key is required")
 
         self.api_key = _api_key
-        self.client = OpenAI(
-            api_key=_api_key,
-            base_url=api_base_url,
-            organization=organization,
-            project=project,
-            timeout=timeout,
-            max_retries=max_retries,
-        )
-        self.async_client = AsyncOpenAI(
-            api_key=_api_key,
-            base_url=api_base_url,
-            organization=organization,
-            project=project,
-            timeout=timeout,
-            max_retries=max_retries,
-        )
+        options = {"organization": organization, "project": project}
+        self.client = get_client(OpenAI, _api_key, api_base_url, timeout, max_retries, **options)
+        self.async_client = get_client(AsyncOpenAI, _api_key, api_base_url, timeout, max_retries, **options)
 
         self.model = llm_model
         self.json_mode = json_mode
 
-        self.llm_cache: LLMCacheJoblib | None = None
-
-        if self.llm_cache_type == CacheType.DISK:
-            self.llm_cache = LLMCacheJoblib(location="joblib_cache", verbose=0)
-        elif self.llm_cache_type == CacheType.MEMORY:
-            self.llm_cache = LLMCacheJoblib(location=None, verbose=0)
-
     def _to_openai_tools(self, tools: list[ToolCall] | None = None) -> Iterable[ChatCompletionToolParam] | NotGiven:
         if tools is None:
             return NotGiven()
@@ -161,16 +125,7 @@ class OpenAILanguageModel(LanguageModel):
 
         openai_tools = self._to_openai_tools(tools)
 
-        if self.llm_cache is not None:
-            response = self.llm_cache.cache(self._call_openai)(
-                model_name,
-                llm_messages,
-                openai_tools,
-                max_tokens,
-                temperature,
-                **kwargs,
-            )
-        else:
+        def _generate() -> LanguageModelResponse:
             response = self._call_openai(
                 model_name,
                 llm_messages,
@@ -179,10 +134,17 @@ class OpenAILanguageModel(LanguageModel):
                 temperature,
                 **kwargs,
             )
-
-        llm_response = self._process_response(response)
-
-        return llm_response
+            return self._process_response(response)
+
+        return self._generate_cached(
+            messages,
+            tools,
+            _generate,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            json_mode=self.json_mode,
+            **kwargs,
+        )
 
     async def agenerate(
         self,
@@ -198,19 +160,27 @@ class OpenAILanguageModel(LanguageModel):
         assert provider == LanguageModelProvider.OPENAI, f"Invalid provider: {provider}"
         openai_tools = self._to_openai_tools(tools)
 
-        # TODO: Add support for async cache
-        response = await self._call_openai_async(
-            model_name,
-            llm_messages,
-            openai_tools,
-            max_tokens,
-            temperature,
+        async def _agenerate() -> LanguageModelResponse:
+            response = await self._call_openai_async(
+                model_name,
+                llm_messages,
+                openai_tools,
+                max_tokens,
+                temperature,
+                **kwargs,
+            )
+            return self._process_response(response)
+
+        return await self._agenerate_cached(
+            messages,
+            tools,
+            _agenerate,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            json_mode=self.json_mode,
             **kwargs,
         )
 
-        llm_response = self._process_response(response)
-        return llm_response
-
     def generate_stream(
         self,
         messages: list[Message],
@@ -268,6 +238,55 @@ class OpenAILanguageModel(LanguageModel):
                 error=f"Unexpected error: {e!s}",
             )
 
+    async def agenerate_stream(
+        self,
+        messages: list[Message],
+        tools: list[ToolCall] | None = None,
+        max_tokens: int = 256,
+        temperature: float = 0.5,
+        top_p: float = 1.0,
+        **kwargs: Any,
+    ) -> AsyncIterator[LanguageModelResponse]:
+        llm_messages = self._prepare_messages(messages)
+        provider, model_name = self.get_model_name(self.model)
+        assert provider == LanguageModelProvider.OPENAI, f"Invalid provider: {provider}"
+
+        accumulator = ChatStreamAccumulator(self._usage)
+        try:
+            response_format: ResponseFormat = {"type": "json_object" if self.json_mode else "text"}
+            stream = await self.async_client.chat.completions.create(
+                model=model_name,
+                messages=llm_messages,
+                tools=self._to_openai_tools(tools),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format=response_format,
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
+            # closing the stream when the consumer stops or is cancelled frees the connection
+            try:
+                async for chunk in stream:
+                    response = accumulator.add(chunk)
+                    if response is not None:
+                        yield response
+            finally:
+                await stream.close()
+            yield accumulator.final()
+        except (APIError, RateLimitError, APIConnectionError) as e:
+            yield LanguageModelResponse(
+                message=None,
+                cached=False,
+                error=str(e),
+            )
+        except OpenAIError as e:
+            yield LanguageModelResponse(
+                message=None,
+                cached=False,
+                error=f"OpenAI Error: {e!s}",
+            )
+
     def _call_openai(
         self,
         model_name: str,
@@ -346,21 +365,24 @@ class OpenAILanguageModel(LanguageModel):
             return (prompt_tokens * 0.03 + completion_tokens * 0.06) / 1000
         return 0.0
 
+    def _usage(self, usage: CompletionUsage) -> TokenUsage:
+        cost = self.calculate_cost(
+            self.model.value,
+            usage.prompt_tokens,
+            usage.completion_tokens,
+        )
+        return TokenUsage(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cost=cost,
+            calls=1,
+        )
+
     def _process_response(self, response: ChatCompletion) -> LanguageModelResponse:
         """Process the API response into a LanguageModelResponse"""
         usage = None
         if response.usage:
-            cost = self.calculate_cost(
-                self.model.value,
-                response.usage.prompt_tokens,
-                response.usage.completion_tokens,
-            )
-            usage = TokenUsage(
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                cost=cost,
-                calls=1,
-            )
+            usage = self._usage(response.usage)
 
         tool_calls: list[ToolCall] = []
         for choice in response.choices:
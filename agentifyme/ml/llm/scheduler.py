@@ -0,0 +1,305 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import TypeVar
+
+from loguru import logger
+
+from agentifyme.utilities.ratelimit import AsyncRateLimiter, estimate_tokens
+
+from .base import LanguageModelResponse, Message
+
+try:
+    from opentelemetry import metrics, trace
+
+    tracer = trace.get_tracer("agentifyme.llm")
+    meter = metrics.get_meter("agentifyme.llm")
+    queue_wait = meter.create_histogram("llm.scheduler.queue_wait", unit="s", description="Time LLM requests wait for a slot and for rate limits")
+    rate_limited = meter.create_counter("llm.scheduler.rate_limited", description="Number of LLM requests rejected by the provider with a 429")
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 64
+# tokens of formatting the providers add around every chat message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Priority(str, Enum):
+    """Scheduling lane of a request. Interactive requests are started before batch ones."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+_RANKS = {Priority.INTERACTIVE: 0, Priority.BATCH: 1}
+
+_priority: ContextVar[Priority | None] = ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def scheduling_priority(priority: Priority | str) -> Iterator[None]:
+    """Schedule the requests made inside the block in the `priority` lane.
+
+    Models created with an explicit `priority` keep it.
+    """
+    token = _priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_request_tokens(messages: list[Message], max_tokens: int | None = None, system_prompt: str | None = None) -> int:
+    """Estimate the tokens a chat request counts against a tokens-per-minute limit.
+
+    Providers count the prompt plus the requested `max_tokens` when admitting a request.
+    """
+    texts = [message.content for message in messages if isinstance(message.content, str)]
+    if system_prompt:
+        texts.append(system_prompt)
+    return sum(estimate_tokens(text) + MESSAGE_OVERHEAD_TOKENS for text in texts) + (max_tokens or 0)
+
+
+def _rate_limit_error(error: BaseException) -> BaseException | None:
+    """Return the 429 error `error` was raised from, if any. Provider errors are often wrapped."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if getattr(error, "status_code", None) == 429:
+            return error
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def _retry_after(error: BaseException) -> float | None:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _PriorityLock:
+    """Lock handed over to its waiters by priority rank, then in arrival order."""
+
+    def __init__(self) -> None:
+        self._locked = False
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, rank: int) -> None:
+        # while unlocked there are no waiters left, release hands the lock to the next one
+        if not self._locked:
+            self._locked = True
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._locked = False
+
+
+class RequestScheduler:
+    """Admits LLM requests under rate limits and an adaptive concurrency limit.
+
+    A request first waits for the request and token budgets of the rate limiter, then
+    for a concurrency slot, both in its priority lane, so queued batch requests neither
+    take the budget nor hold slots ahead of interactive ones. The concurrency limit adapts like TCP
+    congestion control: it grows by about one per limit's worth of successful requests,
+    shrinks by `backoff` whenever the provider answers 429, and shrinks slowly while
+    latency is above `target_latency`. A 429 with a `retry-after` header also pauses
+    new requests until then, so queued requests don't retry in a herd.
+
+    Args:
+        requests_per_minute (float | None): Request budget. None means unlimited.
+        tokens_per_minute (float | None): Token budget, counting prompt and `max_tokens`. None means unlimited.
+        max_concurrency (int): Upper bound, and starting value, of the concurrency limit.
+        min_concurrency (int): The limit never shrinks below this.
+        target_latency (float | None): Seconds per request above which the limit shrinks.
+        backoff (float): Factor the limit is multiplied by on a 429.
+
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        target_latency: float | None = None,
+        backoff: float = 0.5,
+    ):
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("Expected 1 <= min_concurrency <= max_concurrency")
+        self.limiter = AsyncRateLimiter(requests_per_minute, tokens_per_minute) if requests_per_minute or tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.target_latency = target_latency
+        self.backoff = backoff
+
+        self.limit = float(max_concurrency)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._resume_at = 0.0
+        self._rate_gate = _PriorityLock()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def _has_slot(self) -> bool:
+        return self.active < max(self.min_concurrency, int(self.limit))
+
+    async def _acquire_slot(self, priority: Priority) -> None:
+        if self._has_slot() and not self.queued:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (_RANKS[priority], next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # cancelled waiters are skipped, unless the slot was already handed over
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_slot():
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    def _on_success(self, latency: float) -> None:
+        if self.target_latency is not None and latency > self.target_latency:
+            self.limit = max(self.min_concurrency, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._wake()
+
+    def _on_rate_limited(self, error: BaseException) -> None:
+        self.limit = max(self.min_concurrency, self.limit * self.backoff)
+        retry_after = _retry_after(error)
+        if retry_after:
+            self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+        logger.warning(f"LLM request rate limited, concurrency limit lowered to {int(self.limit)}")
+        if OTEL_AVAILABLE:
+            rate_limited.add(1)
+
+    async def _wait_for_budget(self, rank: int, tokens: int | None) -> float:
+        """Wait out a retry-after pause and take `tokens` from the rate limiter, one request at a time.
+
+        Returns the end of the pause waited for. `tokens=None` only waits for the pause.
+        """
+        await self._rate_gate.acquire(rank)
+        try:
+            resume_at = self._resume_at
+            if (pause := resume_at - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            if self.limiter is not None and tokens is not None:
+                await self.limiter.acquire(tokens)
+            return resume_at
+        finally:
+            self._rate_gate.release()
+
+    async def _admit(self, priority: Priority, tokens: int) -> float:
+        start = time.monotonic()
+        rank = _RANKS[priority]
+        resume_at = await self._wait_for_budget(rank, tokens)
+        while True:
+            await self._acquire_slot(priority)
+            if self._resume_at <= resume_at:
+                return time.monotonic() - start
+            # rate limited while waiting for the slot: wait for the new pause without holding it
+            self._release_slot()
+            resume_at = await self._wait_for_budget(rank, None)
+
+    async def _call(self, call: Callable[[], Awaitable[T]], tokens: int) -> T:
+        """Make an admitted request and release its slot."""
+        try:
+            start = time.monotonic()
+            try:
+                result = await call()
+            except Exception as e:
+                if (error := _rate_limit_error(e)) is not None:
+                    self._on_rate_limited(error)
+                raise
+            self._on_success(time.monotonic() - start)
+
+            usage = result.usage if isinstance(result, LanguageModelResponse) else None
+            used = usage.prompt_tokens + usage.completion_tokens if usage is not None else 0
+            if self.limiter is not None and 0 < used < tokens:
+                self.limiter.refund(tokens - used)
+            return result
+        finally:
+            self._release_slot()
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0, priority: Priority | str | None = None) -> T:
+        """Run `call` once it is admitted, reserving `tokens` from the token budget.
+
+        Tokens a `LanguageModelResponse` reports as unused are given back.
+
+        Args:
+            call: Makes the request.
+            tokens (int): Estimated tokens of the request.
+            priority (Priority | str | None): Lane of the request. Defaults to the one set
+                by `scheduling_priority`, or interactive.
+
+        """
+        priority = Priority(priority or _priority.get() or Priority.INTERACTIVE)
+        if not OTEL_AVAILABLE:
+            await self._admit(priority, tokens)
+            return await self._call(call, tokens)
+
+        with tracer.start_as_current_span("llm.scheduled_request", attributes={"llm.priority": priority.value, "llm.estimated_tokens": tokens}) as span:
+            wait = await self._admit(priority, tokens)
+            queue_wait.record(wait, {"priority": priority.value})
+            span.set_attributes({"llm.queue_wait": wait, "llm.concurrency_limit": int(self.limit)})
+            return await self._call(call, tokens)
+
+
+_schedulers: dict[str, RequestScheduler] = {}
+
+
+def get_scheduler(model: str) -> RequestScheduler:
+    """Return the process-wide scheduler of `model`, shared by every instance of the model."""
+    if model not in _schedulers:
+        _schedulers[model] = RequestScheduler()
+    return _schedulers[model]
+
+
+def configure_scheduler(model: str, **kwargs) -> RequestScheduler:
+    """Replace the scheduler of `model` with one built from `kwargs`, like the provider's limits."""
+    _schedulers[model] = RequestScheduler(**kwargs)
+    return _schedulers[model]
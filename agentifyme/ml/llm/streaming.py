@@ -0,0 +1,64 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+from .base import LanguageModelResponse, Role, TokenUsage, ToolCall, ToolCallDelta
+
+
+class ChatStreamAccumulator:
+    """Turns the chunks of a streamed OpenAI-style chat completion into response chunks.
+
+    OpenAI and Groq stream the same chunk format. Text and tool call deltas are passed
+    on as they arrive, and assembled into the complete tool calls of the last chunk,
+    which also has the usage reported at the end of the stream.
+
+    Args:
+        usage: Builds the token usage, with its cost, from the usage the provider reports.
+
+    """
+
+    def __init__(self, usage: Callable[[Any], TokenUsage | None]):
+        self._usage = usage
+        self.usage = None
+        self.tools: dict[int, dict[str, str]] = {}
+
+    def add(self, chunk) -> LanguageModelResponse | None:
+        # Groq reports usage in x_groq, OpenAI in the last chunk when asked to
+        usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+        if usage is not None:
+            self.usage = usage
+        if not chunk.choices:
+            return None
+
+        delta = chunk.choices[0].delta
+        deltas = []
+        for tool_call in delta.tool_calls or []:
+            name = tool_call.function.name if tool_call.function is not None else None
+            arguments = (tool_call.function.arguments if tool_call.function is not None else None) or ""
+            tool = self.tools.setdefault(tool_call.index, {"id": "", "name": "", "arguments": ""})
+            tool["id"] = tool_call.id or tool["id"]
+            tool["name"] += name or ""
+            tool["arguments"] += arguments
+            deltas.append(ToolCallDelta(index=tool_call.index, tool_call_id=tool_call.id, name=name, arguments=arguments))
+
+        if delta.content is None and not deltas:
+            return None
+        return LanguageModelResponse(
+            message=delta.content,
+            role=Role.ASSISTANT,
+            tool_call_deltas=deltas or None,
+            cached=False,
+            error=None,
+        )
+
+    def final(self) -> LanguageModelResponse:
+        tool_calls = [
+            ToolCall(name=tool["name"], arguments=json.loads(tool["arguments"]) if tool["arguments"] else {}, tool_call_id=tool["id"])
+            for _, tool in sorted(self.tools.items())
+        ]
+        return LanguageModelResponse(
+            message=None,
+            role=Role.ASSISTANT,
+            tool_calls=tool_calls or None,
+            usage=self._usage(self.usage) if self.usage is not None else None,
+        )
@@ -5,6 +5,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any, Callable, Dict, Type
 
+from google.protobuf import struct_pb2
+
 # Try importing optional dependencies
 try:
     import numpy as np
@@ -101,18 +103,163 @@ if PYDANTIC_AVAILABLE:
     TYPE_CONVERTERS[BaseModel] = convert_pydantic
 
 
+_PRIMITIVES = (str, int, float, bool)
+
+# Converter resolved for each concrete type, so the registry is only scanned once per type.
+_converter_cache: Dict[type, Callable | None] = {}
+
+
+def _resolve_converter(cls: type) -> Callable | None:
+    try:
+        return _converter_cache[cls]
+    except KeyError:
+        pass
+
+    converter = None
+    if not issubclass(cls, _PRIMITIVES):
+        for types, candidate in TYPE_CONVERTERS.items():
+            if issubclass(cls, types):
+                converter = candidate
+                break
+        else:
+            converter = str
+    _converter_cache[cls] = converter
+    return converter
+
+
+def register_type_converter(types: Type | tuple[Type, ...], converter: Callable) -> None:
+    """Register a converter for values of `types`, taking priority over the built-in ones.
+
+    Use this instead of modifying `TYPE_CONVERTERS` directly, so cached lookups are reset.
+    """
+    TYPE_CONVERTERS[types] = converter
+    # move to the front so it wins over broader base classes already registered
+    for key in [k for k in TYPE_CONVERTERS if k != types]:
+        TYPE_CONVERTERS[key] = TYPE_CONVERTERS.pop(key)
+    _converter_cache.clear()
+    _value_writers.clear()
+    _value_writers.update(_BASE_WRITERS)
+
+
 def convert_for_protobuf(data: Any) -> Any:
     """Convert Python types to protobuf-compatible types."""
     if data is None:
         return None
 
-    if isinstance(data, (str, int, float, bool)):
+    converter = _resolve_converter(type(data))
+    if converter is None:
         return data
+    return converter(data)
 
-    # Find matching converter
-    for types, converter in TYPE_CONVERTERS.items():
-        if isinstance(data, types):
-            return converter(data)
 
-    # Default fallback
-    return str(data)
+# Single pass encoding straight into protobuf Struct / Value messages
+def _write_null(value: struct_pb2.Value, data: Any) -> None:
+    value.null_value = struct_pb2.NULL_VALUE
+
+
+def _write_str(value: struct_pb2.Value, data: str) -> None:
+    value.string_value = data
+
+
+def _write_bool(value: struct_pb2.Value, data: bool) -> None:
+    value.bool_value = data
+
+
+def _write_number(value: struct_pb2.Value, data: int | float) -> None:
+    value.number_value = data
+
+
+def _write_dict(value: struct_pb2.Value, data: dict) -> None:
+    struct = value.struct_value
+    if not data:
+        struct.SetInParent()
+        return
+    _fill_struct(struct, data)
+
+
+def _write_sequence(value: struct_pb2.Value, data: Any) -> None:
+    values = value.list_value.values
+    if not data:
+        value.list_value.SetInParent()
+        return
+    for item in data:
+        _write_value(values.add(), item)
+
+
+def _write_pydantic(value: struct_pb2.Value, data: Any) -> None:
+    _write_dict(value, data.model_dump())
+
+
+def _write_numpy_array(value: struct_pb2.Value, data: Any) -> None:
+    _write_sequence(value, data.tolist())
+
+
+def _converting_writer(converter: Callable) -> Callable[[struct_pb2.Value, Any], None]:
+    def write(value: struct_pb2.Value, data: Any) -> None:
+        _write_value(value, converter(data))
+
+    return write
+
+
+# Writers that don't go through a converter, so containers are walked only once.
+_DIRECT_WRITERS: Dict[Callable, Callable] = {
+    convert_dict: _write_dict,
+    convert_sequence: _write_sequence,
+    convert_pydantic: _write_pydantic,
+    convert_numpy_array: _write_numpy_array,
+}
+
+_BASE_WRITERS: Dict[type, Callable] = {
+    type(None): _write_null,
+    str: _write_str,
+    bool: _write_bool,
+    int: _write_number,
+    float: _write_number,
+    dict: _write_dict,
+    list: _write_sequence,
+    tuple: _write_sequence,
+}
+
+_value_writers: Dict[type, Callable] = dict(_BASE_WRITERS)
+
+
+def _resolve_writer(cls: type) -> Callable:
+    if issubclass(cls, bool):
+        writer = _write_bool
+    elif issubclass(cls, str):
+        writer = _write_str
+    elif issubclass(cls, (int, float)):
+        writer = _write_number
+    else:
+        converter = _resolve_converter(cls)
+        writer = _DIRECT_WRITERS.get(converter) or _converting_writer(converter)
+    _value_writers[cls] = writer
+    return writer
+
+
+def _write_value(value: struct_pb2.Value, data: Any) -> None:
+    cls = type(data)
+    writer = _value_writers.get(cls) or _resolve_writer(cls)
+    writer(value, data)
+
+
+def _fill_struct(struct: struct_pb2.Struct, data: dict) -> None:
+    fields = struct.fields
+    for key, item in data.items():
+        _write_value(fields[key if type(key) is str else str(key)], item)
+
+
+def to_struct(data: Any) -> struct_pb2.Struct:
+    """Encode a dict or pydantic model into a protobuf Struct in a single pass.
+
+    Produces the same message as `Struct.update(convert_for_protobuf(data))`, without
+    building the intermediate converted dict first.
+    """
+    if PYDANTIC_AVAILABLE and isinstance(data, BaseModel):
+        data = data.model_dump()
+    if not isinstance(data, dict):
+        raise TypeError(f"Cannot encode {type(data).__name__} as a protobuf Struct")
+
+    struct = struct_pb2.Struct()
+    _fill_struct(struct, data)
+    return struct
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap upper-bound style estimate of the tokens in `text`, about 4 bytes per token."""
+    return len(text.encode()) // 4 + 1
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at `rate` tokens per second, holding at most `capacity`.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, which is also the largest burst.
+
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available, 0 if they are now."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` tokens, which may leave the bucket in debt until it refills."""
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return tokens taken for work that used fewer than reserved."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AsyncRateLimiter:
+    """Limits requests and tokens per minute across the coroutines sharing it.
+
+    `acquire` waits until both the request and the token budget allow the call, then
+    takes from both. Waiters are served in arrival order, so large requests aren't
+    starved by a stream of small ones.
+
+    Args:
+        requests_per_minute (float | None): Request budget. None means unlimited.
+        tokens_per_minute (float | None): Token budget. None means unlimited.
+
+    """
+
+    def __init__(self, requests_per_minute: float | None = None, tokens_per_minute: float | None = None):
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    def wait_time(self, tokens: float = 0) -> float:
+        """Seconds until a request for `tokens` would be allowed."""
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens is not None and tokens:
+            waits.append(self.tokens.wait_time(tokens))
+        return max(waits)
+
+    async def acquire(self, tokens: float = 0) -> float:
+        """Wait until a request for `tokens` is allowed and take it, returning the seconds waited."""
+        start = time.monotonic()
+        async with self._lock:
+            while (delay := self.wait_time(tokens)) > 0:
+                await asyncio.sleep(delay)
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None and tokens:
+                self.tokens.consume(tokens)
+        return time.monotonic() - start
+
+    def refund(self, tokens: float) -> None:
+        """Give back tokens reserved by `acquire` but not used."""
+        if self.tokens is not None and tokens > 0:
+            self.tokens.refund(tokens)
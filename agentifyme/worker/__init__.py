@@ -2,7 +2,7 @@ import json
 import os
 import time
 import traceback
-from typing import Any, get_type_hints
+from typing import Any
 
 import orjson
 from loguru import logger
@@ -14,11 +14,12 @@ from agentifyme import __version__
 from agentifyme.components.workflow import WorkflowConfig
 from agentifyme.errors import AgentifyMeError
 from agentifyme.worker.callback import CallbackHandler
-from agentifyme.worker.helpers import build_args_from_signature
+from agentifyme.worker.payloads import payload_preview
 from agentifyme.worker.telemetry import (
     auto_instrument,
     setup_telemetry,
 )
+from agentifyme.worker.telemetry.capture import get_capture_policy
 
 tracer = trace.get_tracer(__name__)
 
@@ -105,9 +106,10 @@ def execute_fn(name: str, input: str, trace_context: str) -> bytes:
             _workflow = WorkflowConfig.get(name)
             _workflow_config = _workflow.config
 
-            func_args = build_args_from_signature(_workflow_config.func, parsed_input)
+            argument_plan = _workflow_config.argument_plan
+            func_args = argument_plan.build(parsed_input)
             output = _workflow_config.func(**func_args)
-            return_type = get_type_hints(_workflow_config.func).get("return")
+            return_type = argument_plan.return_type
             return_type_str = str(return_type.__name__) if return_type and hasattr(return_type, "__name__") else None
 
             output_data = _process_output(output, return_type)
@@ -116,7 +118,9 @@ def execute_fn(name: str, input: str, trace_context: str) -> bytes:
                 return_type_str = type(output_data).__name__
 
             output_data_json = orjson.dumps({"status": "success", "data": output_data, "return_type": return_type_str})
-            span.set_attribute("output", str(output_data_json))
+            capture_policy = get_capture_policy()
+            if span.is_recording() and capture_policy.should_capture(span):
+                span.set_attribute("output", payload_preview(output_data_json, capture_policy.max_field_bytes))
             span.set_status(Status(StatusCode.OK))
             end_time = time.perf_counter()
             span.set_attribute("execution_time", end_time - start_time)
@@ -178,9 +182,10 @@ async def execute_fn_async(name: str, input: str, trace_context: str) -> bytes:
             _workflow = WorkflowConfig.get(name)
             _workflow_config = _workflow.config
 
-            func_args = build_args_from_signature(_workflow_config.func, parsed_input)
+            argument_plan = _workflow_config.argument_plan
+            func_args = argument_plan.build(parsed_input)
             output = await _workflow_config.func(**func_args)
-            return_type = get_type_hints(_workflow_config.func).get("return")
+            return_type = argument_plan.return_type
             return_type_str = str(return_type.__name__) if return_type and hasattr(return_type, "__name__") else None
 
             output_data = _process_output(output, return_type)
@@ -189,7 +194,9 @@ async def execute_fn_async(name: str, input: str, trace_context: str) -> bytes:
                 return_type_str = type(output_data).__name__
 
             output_data_json = orjson.dumps({"status": "success", "data": output_data, "return_type": return_type_str})
-            span.set_attribute("output", str(output_data_json))
+            capture_policy = get_capture_policy()
+            if span.is_recording() and capture_policy.should_capture(span):
+                span.set_attribute("output", payload_preview(output_data_json, capture_policy.max_field_bytes))
             span.set_status(Status(StatusCode.OK))
             end_time = time.perf_counter()
             span.set_attribute("execution_time", end_time - start_time)
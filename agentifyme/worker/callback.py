@@ -17,6 +17,7 @@ class EventType(Enum):
 class EventStage(Enum):
     INITIATED = "initiated"
     STARTED = "started"
+    CHUNK = "chunk"  # A chunk of output from a streaming workflow
     COMPLETED = "completed"
     FINISHED = "finished"
     PAUSED = "paused"
@@ -35,14 +36,51 @@ class Event:
         return {"event_type": self.type.value, "event_stage": self.stage.value, "event_name": self.event_name, **self.data}
 
 
+def _is_async_callable(callback: Callable) -> bool:
+    # instances of classes with an async __call__ are async callables too
+    return asyncio.iscoroutinefunction(callback) or asyncio.iscoroutinefunction(type(callback).__call__)
+
+
+@dataclass(frozen=True)
+class _Route:
+    """Callbacks for one (event type, stage) pair, split by how they are called."""
+
+    sync_callbacks: tuple[Callable, ...] = ()
+    async_callbacks: tuple[Callable, ...] = ()
+
+
+_NO_ROUTE = _Route()
+
+
 class CallbackHandler:
+    """Dispatches events to registered callbacks.
+
+    Callbacks are resolved into a routing table keyed by (event type, stage) whenever
+    one is registered, so firing an event is a single lookup. Sync callbacks are called
+    inline; a task is only created when an event has async callbacks.
+
+    Each group keeps the registration order (stage specific, type wide, default), but all
+    sync callbacks of an event are called before its async callbacks start, even those
+    registered before them. Calling every callback in one task, as before routes were
+    compiled, started them in registration order instead. Calling sync callbacks inline
+    means each sees events in the order they were fired: a sync callback queued behind
+    an async one would receive the event after the inline callbacks of later events.
+    """
+
     def __init__(self):
         self.callbacks: dict[str, list[Callable]] = {}
         self.default_callbacks: list[Callable] = []  # New: List for default callbacks
 
+        self._routes: dict[tuple[EventType, EventStage], _Route] = {}
+        # (event_type, event_stage) as passed to fire_event -> (EventType, EventStage, event name)
+        self._event_keys: dict[tuple[Any, Any], tuple[EventType, EventStage, str]] = {}
+        # keep references so pending callback tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
     def register_default(self, callback: Callable) -> None:
         """Register a callback that will be called for all events"""
         self.default_callbacks.append(callback)
+        self._compile_routes()
 
     def register(self, event_type: EventType | str, callback: Callable, event_stage: EventStage | str = None) -> None:
         """Register a callback function for specific event type and stage.
@@ -61,80 +99,124 @@ class CallbackHandler:
         if event_key not in self.callbacks:
             self.callbacks[event_key] = []
         self.callbacks[event_key].append(callback)
+        self._compile_routes()
+
+    def _compile_routes(self) -> None:
+        """Resolve the callbacks for every (type, stage) pair: stage specific, then type wide, then defaults."""
+        routes = {}
+        for event_type in EventType:
+            for event_stage in EventStage:
+                callbacks = [
+                    *self.callbacks.get(f"{event_type.value}.{event_stage.value}", ()),
+                    *self.callbacks.get(event_type.value, ()),
+                    *self.default_callbacks,
+                ]
+                if callbacks:
+                    routes[(event_type, event_stage)] = _Route(
+                        sync_callbacks=tuple(cb for cb in callbacks if not _is_async_callable(cb)),
+                        async_callbacks=tuple(cb for cb in callbacks if _is_async_callable(cb)),
+                    )
+        self._routes = routes
+
+    def _resolve_event(self, event_type: EventType | str, event_stage: EventStage | str) -> tuple[EventType, EventStage, str]:
+        key = (event_type, event_stage)
+        try:
+            return self._event_keys[key]
+        except KeyError:
+            pass
+
+        event_name = f"{event_type}.{event_stage}"
+        if isinstance(event_type, str):
+            # Handle the "type.run" format
+            if ".run" in event_type or ".execution" in event_type:
+                event_type = event_type.split(".")[0]
+            event_type = EventType(event_type)
+
+        if isinstance(event_stage, str):
+            event_stage = EventStage(event_stage)
+
+        resolved = (event_type, event_stage, event_name)
+        self._event_keys[key] = resolved
+        return resolved
 
     async def _execute_callback(self, callback: Callable, data: Any):
         """Execute callback handling both async and sync callbacks"""
         try:
-            if asyncio.iscoroutinefunction(callback):
+            if _is_async_callable(callback):
                 await callback(data)
             else:
                 callback(data)
         except Exception as e:
             logger.error(f"Error executing callback: {e}", exc_info=True)
 
+    def _call_sync(self, callbacks: tuple[Callable, ...], data: dict[str, Any]) -> None:
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Error executing callback: {e}", exc_info=True)
+
+    async def _call_async(self, callbacks: tuple[Callable, ...], data: dict[str, Any]) -> None:
+        if len(callbacks) == 1:
+            await self._execute_callback(callbacks[0], data)
+        else:
+            await asyncio.gather(*(self._execute_callback(callback, data) for callback in callbacks), return_exceptions=True)
+
     async def notify(self, event: Event) -> None:
         """Notify all callbacks registered for an event.
         Handles both specific stage callbacks, general event type callbacks,
         and default callbacks.
         """
+        route = self._routes.get((event.type, event.stage), _NO_ROUTE)
         event_dict = event.to_dict()
-        tasks = []
-
-        # Notify specific stage callbacks
-        specific_key = f"{event.type.value}.{event.stage.value}"
-        if specific_key in self.callbacks:
-            for callback in self.callbacks[specific_key]:
-                tasks.append(self._execute_callback(callback, event_dict))
-
-        # Notify general event type callbacks
-        general_key = f"{event.type.value}"
-        if general_key in self.callbacks:
-            for callback in self.callbacks[general_key]:
-                tasks.append(self._execute_callback(callback, event_dict))
-
-        # Notify default callbacks
-        for callback in self.default_callbacks:
-            tasks.append(self._execute_callback(callback, event_dict))
-
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        self._call_sync(route.sync_callbacks, event_dict)
+        if route.async_callbacks:
+            await self._call_async(route.async_callbacks, event_dict)
 
     def fire_event(self, event_type: EventType | str, event_stage: EventStage | str, data: dict) -> None:
         """Fire an event synchronously.
-        Creates and processes Event object with the given parameters.
+        Sync callbacks are called before this returns, async callbacks are scheduled as a task.
         """
-        event_name = f"{event_type}.{event_stage}"
-        if isinstance(event_type, str):
-            # Handle the "type.run" format
-            if ".run" in event_type or ".execution" in event_type:
-                event_type = event_type.split(".")[0]
-            event_type = EventType(event_type)
+        event_type, event_stage, event_name = self._resolve_event(event_type, event_stage)
+        route = self._routes.get((event_type, event_stage))
+        if route is None:
+            return
 
-        if isinstance(event_stage, str):
-            event_stage = EventStage(event_stage)
+        event_dict = {"event_type": event_type.value, "event_stage": event_stage.value, "event_name": event_name, **data}
+        self._dispatch(route, event_dict)
+
+    def relay(self, event_dict: dict[str, Any]) -> None:
+        """Dispatch an event fired in another process, as passed to its callbacks by `fire_event`."""
+        route = self._routes.get((EventType(event_dict["event_type"]), EventStage(event_dict["event_stage"])))
+        if route is not None:
+            self._dispatch(route, event_dict)
+
+    def _dispatch(self, route: _Route, event_dict: dict[str, Any]) -> None:
+        self._call_sync(route.sync_callbacks, event_dict)
+        if not route.async_callbacks:
+            return
 
-        event = Event(type=event_type, stage=event_stage, event_name=event_name, data=data)
-        # Create task for async notification
         try:
-            loop = asyncio.get_running_loop()
-            asyncio.create_task(self.notify(event))
+            asyncio.get_running_loop()
         except RuntimeError:
             # No event loop running, run sync version
-            asyncio.run(self.notify(event))
+            asyncio.run(self._call_async(route.async_callbacks, event_dict))
+            return
+
+        task = asyncio.create_task(self._call_async(route.async_callbacks, event_dict))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     async def fire_event_async(self, event_type: EventType | str, event_stage: EventStage | str, data: dict) -> None:
         """Fire an event asynchronously.
         Allows awaiting the completion of all callbacks.
         """
-        event_name = f"{event_type}.{event_stage}"
-        if isinstance(event_type, str):
-            if ".run" in event_type or ".execution" in event_type:
-                event_type = event_type.split(".")[0]
-            event_type = EventType(event_type)
-
-        if isinstance(event_stage, str):
-            event_stage = EventStage(event_stage)
-
-        event = Event(type=event_type, stage=event_stage, event_name=event_name, data=data)
-
-        await self.notify(event)
+        event_type, event_stage, event_name = self._resolve_event(event_type, event_stage)
+        route = self._routes.get((event_type, event_stage))
+        if route is None:
+            return
+
+        event_dict = {"event_type": event_type.value, "event_stage": event_stage.value, "event_name": event_name, **data}
+        self._call_sync(route.sync_callbacks, event_dict)
+        if route.async_callbacks:
+            await self._call_async(route.async_callbacks, event_dict)
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import os
 import sys
@@ -9,25 +10,59 @@ from loguru import logger
 
 import agentifyme.worker.pb.api.v1.gateway_pb2_grpc as pb_grpc
 from agentifyme import __version__
+from agentifyme.components.checkpoint import (
+    DEFAULT_CHECKPOINT_TTL,
+    SQLiteCheckpointStore,
+)
 from agentifyme.utilities.modules import (
     load_modules_from_directory,
 )
 from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.executors import WorkflowExecutor
 from agentifyme.worker.interceptor import CustomInterceptor
+from agentifyme.worker.payloads import (
+    DEFAULT_INLINE_THRESHOLD,
+    FileBlobStore,
+    PayloadOffloader,
+)
+from agentifyme.worker.spool import EventSpool
+from agentifyme.worker.supervisor import WorkerSupervisor
 from agentifyme.worker.telemetry import (
     auto_instrument,
     setup_telemetry,
 )
-from agentifyme.worker.worker_service import WorkerService
+from agentifyme.worker.telemetry.capture import PayloadCapturePolicy, set_capture_policy
+from agentifyme.worker.worker_service import QueueFullPolicy, WorkerService
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="agnt5", description="Run the AgentifyMe worker")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("AGENTIFYME_WORKER_PROCESSES", "1")),
+        help="Number of worker processes to run under a supervisor (default: 1)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    if args.processes > 1:
+        sys.exit(run_supervisor(args.processes))
+
+    sys.exit(run_worker())
 
 
-def main():
+def run_worker(worker_id: str | None = None, callback_handler: CallbackHandler | None = None) -> int:
+    """Run a single worker service on a fresh event loop"""
     exit_code = 1
+    loop = None
     try:
         initialize_sentry()
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        exit_code = loop.run_until_complete(run())
+        exit_code = loop.run_until_complete(run(worker_id, callback_handler))
     except KeyboardInterrupt:
         logger.info("Worker service stopped by user")
         exit_code = 0
@@ -40,11 +75,30 @@ def main():
             logger.remove()
             sys.stdout.flush()
             sys.stderr.flush()
-            loop.close()
+            if loop is not None:
+                loop.close()
         except Exception as e:
             logger.error("Failed to close logger", exc_info=True, error=str(e))
 
-    sys.exit(exit_code)
+    return exit_code
+
+
+def run_supervisor(num_processes: int) -> int:
+    """Import and instrument the project once, then fork `num_processes` workers"""
+    try:
+        worker_id = get_env("AGENTIFYME_WORKER_ID")
+        agentifyme_project_dir = get_env("AGENTIFYME_PROJECT_DIR", Path.cwd().as_posix())
+    except ValueError as e:
+        logger.error(f"Worker service error: {e}")
+        return 1
+
+    # Children inherit the loaded modules and wrapped functions copy-on-write.
+    # Telemetry exporters and gRPC channels start threads, so they are created in each child.
+    callback_handler = CallbackHandler()
+    auto_instrument(agentifyme_project_dir, callback_handler)
+
+    supervisor = WorkerSupervisor(worker_id, num_processes, lambda child_worker_id: run_worker(child_worker_id, callback_handler))
+    return supervisor.run()
 
 
 def initialize_sentry():
@@ -68,22 +122,29 @@ def initialize_sentry():
         )
 
 
-async def run():
-    """Entry point for the worker service"""
+async def run(worker_id: str | None = None, callback_handler: CallbackHandler | None = None):
+    """Entry point for the worker service.
+
+    When started by the supervisor, `worker_id` carries the process suffix and
+    `callback_handler` is the one the project was already instrumented with.
+    """
     try:
         api_gateway_url = get_env("AGENTIFYME_API_GATEWAY_URL", "gw.agentifyme.ai:3418")
         api_key = get_env("AGENTIFYME_API_KEY")
         agentifyme_env = get_env("AGENTIFYME_ENV")
         project_id = get_env("AGENTIFYME_PROJECT_ID")
         deployment_id = get_env("AGENTIFYME_DEPLOYMENT_ID")
-        worker_id = get_env("AGENTIFYME_WORKER_ID")
+        worker_id = worker_id or get_env("AGENTIFYME_WORKER_ID")
         otel_endpoint = get_env("AGENTIFYME_OTEL_ENDPOINT", "5.78.99.34:4317")
         agentifyme_project_dir = get_env("AGENTIFYME_PROJECT_DIR", Path.cwd().as_posix())
         agentifyme_version = get_package_version("agentifyme")
-
-        callback_handler = CallbackHandler()
+        worker_options = get_worker_options()
+        if os.getenv("AGENTIFYME_EVENT_SPOOL_DIR"):
+            # one spool per worker process, events are replayed by the worker with the same id
+            worker_options["event_spool"] = EventSpool(os.path.join(os.getenv("AGENTIFYME_EVENT_SPOOL_DIR"), worker_id))
 
         # Setup telemetry
+        set_capture_policy(PayloadCapturePolicy.from_env())
         setup_telemetry(
             otel_endpoint,
             agentifyme_env,
@@ -91,7 +152,18 @@ async def run():
         )
 
         # Add instrumentation to workflows and tasks
-        auto_instrument(agentifyme_project_dir, callback_handler)
+        if callback_handler is None:
+            callback_handler = CallbackHandler()
+            auto_instrument(agentifyme_project_dir, callback_handler)
+
+        # pool processes instrument the project as well and relay their events to callback_handler
+        worker_options["workflow_executor"] = WorkflowExecutor(
+            agentifyme_project_dir,
+            max_threads=get_optional_int("AGENTIFYME_MAX_WORKFLOW_THREADS"),
+            max_processes=get_optional_int("AGENTIFYME_MAX_WORKFLOW_PROCESSES"),
+            callback_handler=callback_handler,
+            telemetry=(otel_endpoint, agentifyme_env, agentifyme_version),
+        )
 
         logger.info(f"Starting Agentifyme service with worker {worker_id} and deployment {deployment_id}")
 
@@ -102,6 +174,7 @@ async def run():
             deployment_id,
             worker_id,
             callback_handler,
+            **worker_options,
         )
 
     except ValueError as e:
@@ -121,6 +194,7 @@ async def init_worker_service(
     deployment_id: str,
     worker_id: str,
     callback_handler: CallbackHandler,
+    **worker_options,
 ):
     grpc_options = [
         ("grpc.keepalive_time_ms", 60000),
@@ -144,6 +218,7 @@ async def init_worker_service(
                 project_id,
                 deployment_id,
                 worker_id,
+                **worker_options,
             )
             await worker_service.start_service()
     except KeyboardInterrupt:
@@ -165,6 +240,41 @@ def get_env(key: str, default: str | None = None) -> str:
     return value
 
 
+def get_worker_options() -> dict:
+    """Read optional worker tuning parameters from the environment"""
+    options = {}
+    if os.getenv("AGENTIFYME_MAX_CONCURRENT_JOBS"):
+        options["max_workers"] = int(os.getenv("AGENTIFYME_MAX_CONCURRENT_JOBS"))
+    if os.getenv("AGENTIFYME_MAX_QUEUED_JOBS"):
+        options["max_queued_jobs"] = int(os.getenv("AGENTIFYME_MAX_QUEUED_JOBS"))
+    if os.getenv("AGENTIFYME_MAX_QUEUED_EVENTS"):
+        options["max_queued_events"] = int(os.getenv("AGENTIFYME_MAX_QUEUED_EVENTS"))
+    if os.getenv("AGENTIFYME_QUEUE_FULL_POLICY"):
+        options["queue_full_policy"] = QueueFullPolicy(os.getenv("AGENTIFYME_QUEUE_FULL_POLICY"))
+    if os.getenv("AGENTIFYME_BLOB_STORE_DIR"):
+        # payloads larger than the inline threshold are sent as references to this store
+        inline_threshold = get_optional_int("AGENTIFYME_PAYLOAD_INLINE_BYTES")
+        options["payload_offloader"] = PayloadOffloader(
+            FileBlobStore(os.getenv("AGENTIFYME_BLOB_STORE_DIR")),
+            inline_threshold=DEFAULT_INLINE_THRESHOLD if inline_threshold is None else inline_threshold,
+        )
+    if os.getenv("AGENTIFYME_CHECKPOINT_DB"):
+        # task outputs of unfinished runs, replayed when the gateway retries a run
+        checkpoint_store = SQLiteCheckpointStore(os.getenv("AGENTIFYME_CHECKPOINT_DB"))
+        # drop the checkpoints of runs that were never retried
+        checkpoint_ttl = get_optional_int("AGENTIFYME_CHECKPOINT_TTL")
+        pruned = checkpoint_store.prune(DEFAULT_CHECKPOINT_TTL if checkpoint_ttl is None else checkpoint_ttl)
+        if pruned:
+            logger.info(f"Pruned {pruned} expired checkpoints")
+        options["checkpoint_store"] = checkpoint_store
+    return options
+
+
+def get_optional_int(key: str) -> int | None:
+    value = os.getenv(key)
+    return int(value) if value else None
+
+
 def get_package_version(package_name: str):
     try:
         package_version = version(package_name)
@@ -0,0 +1,300 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from grpc.aio import StreamStreamCall
+from loguru import logger
+from opentelemetry import metrics
+
+import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
+from agentifyme.worker.spool import EventSpool
+
+meter = metrics.get_meter("agentifyme.worker")
+
+queue_depth = meter.create_histogram(
+    "worker.events.queue_depth",
+    description="Number of events waiting in the events queue when a batch is flushed",
+    unit="events",
+)
+batch_size = meter.create_histogram(
+    "worker.events.batch_size",
+    description="Number of events written to the worker stream per flush",
+    unit="events",
+)
+flush_latency = meter.create_histogram(
+    "worker.events.flush_latency",
+    description="Time taken to write a batch of events to the worker stream",
+    unit="ms",
+)
+
+
+class EventSender:
+    """Drains the events queue and writes runtime events to the worker stream in batches.
+
+    The sender blocks on the queue instead of polling it. Once an event arrives, it
+    keeps draining the queue until ``max_batch_size`` events are collected or
+    ``max_batch_delay`` seconds have passed, then writes the whole batch back-to-back.
+    Each batch is encoded once, in a worker thread, as encoding may serialize and store
+    large payloads. The messages that could not be written are kept and sent first once
+    the stream is back, with the sequence numbers they were given.
+
+    With a ``spool``, ``append`` collects events instead of queueing them, and the sender
+    encodes them and appends them to the spool from a worker thread, so they survive
+    disconnects and restarts. The sender reads them back in order, acknowledges each
+    batch once written to the stream and rewinds to the first unacknowledged event after
+    a failed write. Every ``spool_sync_interval`` seconds, a worker thread fsyncs the
+    appends and persists the acknowledgements.
+
+    An acknowledgement only means the event was written to the local gRPC stream, not
+    that the gateway received it: events still buffered by the stream when the worker
+    crashes are lost. Acknowledgements not persisted yet when it crashes are undone, so
+    those events are sent again after the restart.
+    """
+
+    def __init__(
+        self,
+        events_queue: asyncio.Queue,
+        encode: Callable[[Any], pb.InboundWorkerMessage | None],
+        max_batch_size: int = 100,
+        max_batch_delay: float = 0.005,
+        spool: EventSpool | None = None,
+        spool_sync_interval: float = 0.1,
+    ):
+        self.events_queue = events_queue
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.spool = spool
+        self.spool_sync_interval = spool_sync_interval
+
+        # encoded messages left over from a failed write, sent before anything else
+        self._pending: list[pb.InboundWorkerMessage] = []
+        # events collected by append, waiting to be written to the spool
+        self._appended: deque[Any] = deque()
+        self._has_appended = asyncio.Event()
+        self._spool_lock = threading.Lock()
+        self._spooled = asyncio.Event()
+
+        # stats
+        self.events_sent = 0
+        self.batches_sent = 0
+        self.last_batch_size = 0
+        self.last_flush_latency_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        if self.spool is not None:
+            return self.spool.unread + len(self._appended)
+        return self.events_queue.qsize() + len(self._pending)
+
+    def _encode(self, event: Any) -> pb.InboundWorkerMessage | None:
+        try:
+            return self.encode(event)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Error encoding event: {e}")
+            return None
+
+    def _encode_batch(self, batch: list[Any]) -> list[pb.InboundWorkerMessage]:
+        return [msg for msg in map(self._encode, batch) if msg is not None]
+
+    def append(self, event: Any) -> None:
+        """Collect an event to be encoded and written to the spool by `write_appended`."""
+        self._appended.append(event)
+        self._has_appended.set()
+
+    def _spool_appended(self) -> None:
+        with self._spool_lock:
+            while self._appended:
+                msg = self._encode(self._appended.popleft())
+                if msg is not None:
+                    self.spool.append(msg.SerializeToString())
+
+    async def write_appended(self) -> None:
+        """Encode the appended events and write them to the spool, in order, from a worker thread."""
+        await asyncio.to_thread(self._spool_appended)
+        self._spooled.set()
+
+    def close(self) -> None:
+        """Write the events still waiting for the spool, then sync and close it."""
+        if self.spool is None:
+            return
+        self._spool_appended()
+        self.spool.close()
+
+    async def keep(self, batch: list[Any]) -> None:
+        """Encode a batch that can't be sent yet, to be sent first by the next flush."""
+        self._pending.extend(await asyncio.to_thread(self._encode_batch, batch))
+
+    async def next_batch(self, shutdown_event: asyncio.Event) -> list[Any]:
+        """Wait for at least one event and collect up to `max_batch_size` events.
+
+        Doesn't wait when messages of a failed write are still pending.
+        """
+        batch = []
+        while not batch and not self._pending:
+            if shutdown_event.is_set():
+                return batch
+            try:
+                batch.append(await asyncio.wait_for(self.events_queue.get(), timeout=1.0))
+            except TimeoutError:
+                continue
+
+        deadline = time.monotonic() + self.max_batch_delay
+        while len(batch) + len(self._pending) < self.max_batch_size:
+            try:
+                batch.append(self.events_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.events_queue.get(), timeout=remaining))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def flush(self, stream: StreamStreamCall, batch: list[Any]) -> None:
+        """Encode a batch of events and write it to the stream, after the pending messages.
+
+        If a write fails, the unsent messages are kept for the next flush and the error is re-raised.
+        """
+        start_time = time.perf_counter()
+        depth = self.queue_depth
+
+        messages = self._pending + await asyncio.to_thread(self._encode_batch, batch)
+        self._pending = []
+        for idx, msg in enumerate(messages):
+            try:
+                await stream.write(msg)
+            except BaseException:
+                self._pending = messages[idx:]
+                self.events_sent += idx
+                raise
+
+        self.last_batch_size = len(messages)
+        self.last_flush_latency_ms = (time.perf_counter() - start_time) * 1000
+        self.events_sent += len(messages)
+        self.batches_sent += 1
+
+        queue_depth.record(depth)
+        batch_size.record(self.last_batch_size)
+        flush_latency.record(self.last_flush_latency_ms)
+
+    async def next_spooled_batch(self, shutdown_event: asyncio.Event) -> list[tuple[int, bytes]]:
+        """Wait for at least one unread event in the spool and read up to `max_batch_size` events."""
+        while True:
+            self._spooled.clear()
+            records = self.spool.read(self.max_batch_size)
+            if records or shutdown_event.is_set():
+                return records
+
+            try:
+                await asyncio.wait_for(self._spooled.wait(), timeout=1.0)
+            except TimeoutError:
+                continue
+
+    async def flush_spooled(self, stream: StreamStreamCall, records: list[tuple[int, bytes]]) -> None:
+        """Write spooled events to the stream and acknowledge them.
+
+        The acknowledgement is persisted by the next spool sync, off the event loop. If a
+        write fails, the events written so far are acknowledged, the spool is rewound to
+        the first unsent one and the error is re-raised.
+        """
+        start_time = time.perf_counter()
+        depth = self.queue_depth
+
+        written = 0
+        try:
+            for offset, data in records:
+                await stream.write(pb.InboundWorkerMessage.FromString(data))
+                written = offset
+        finally:
+            if written:
+                self.spool.ack(written)
+            if written != records[-1][0]:
+                self.spool.rewind()
+
+        self.last_batch_size = len(records)
+        self.last_flush_latency_ms = (time.perf_counter() - start_time) * 1000
+        self.events_sent += len(records)
+        self.batches_sent += 1
+
+        queue_depth.record(depth)
+        batch_size.record(self.last_batch_size)
+        flush_latency.record(self.last_flush_latency_ms)
+
+    async def _write_spool(self, shutdown_event: asyncio.Event) -> None:
+        while not shutdown_event.is_set():
+            self._has_appended.clear()
+            if self._appended:
+                await self.write_appended()
+                continue
+            try:
+                await asyncio.wait_for(self._has_appended.wait(), timeout=1.0)
+            except TimeoutError:
+                continue
+
+    async def _sync_spool(self, shutdown_event: asyncio.Event) -> None:
+        while not shutdown_event.is_set():
+            await asyncio.sleep(self.spool_sync_interval)
+            await asyncio.to_thread(self.spool.sync)
+
+    async def _run_spooled(
+        self,
+        wait_for_stream: Callable[[], Awaitable[StreamStreamCall | None]],
+        shutdown_event: asyncio.Event,
+    ) -> None:
+        write_task = asyncio.create_task(self._write_spool(shutdown_event))
+        sync_task = asyncio.create_task(self._sync_spool(shutdown_event))
+        try:
+            while not shutdown_event.is_set():
+                records = await self.next_spooled_batch(shutdown_event)
+                if not records:
+                    continue
+
+                stream = await wait_for_stream()
+                if stream is None:
+                    self.spool.rewind()
+                    continue
+
+                await self.flush_spooled(stream, records)
+        finally:
+            write_task.cancel()
+            sync_task.cancel()
+
+    async def run(
+        self,
+        wait_for_stream: Callable[[], Awaitable[StreamStreamCall | None]],
+        shutdown_event: asyncio.Event,
+    ) -> None:
+        """Send events until `shutdown_event` is set."""
+        if self.spool is not None:
+            await self._run_spooled(wait_for_stream, shutdown_event)
+            return
+
+        while not shutdown_event.is_set():
+            batch = await self.next_batch(shutdown_event)
+            if not batch and not self._pending:
+                continue
+
+            stream = await wait_for_stream()
+            if stream is None:
+                await self.keep(batch)
+                continue
+
+            await self.flush(stream, batch)
+
+    def get_metrics(self) -> dict[str, int]:
+        return {
+            "num_events_sent": self.events_sent,
+            "num_event_batches_sent": self.batches_sent,
+            "last_event_batch_size": self.last_batch_size,
+            "last_event_flush_latency_ms": int(self.last_flush_latency_ms),
+        }
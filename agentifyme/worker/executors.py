@@ -0,0 +1,152 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.queues import SimpleQueue
+from typing import Any
+
+from loguru import logger
+
+from agentifyme.utilities.modules import load_modules_from_directory
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.telemetry import auto_instrument, setup_telemetry
+from agentifyme.worker.telemetry.capture import PayloadCapturePolicy, set_capture_policy
+
+
+def _initialize_process(project_dir: str | None, events: SimpleQueue | None, telemetry: tuple[str, str, str] | None) -> None:
+    """Load and instrument the project's workflows and tasks in a pool process.
+
+    Callback events fired in the process are put on `events`, for the parent to relay
+    to its callback handler. `telemetry` is the OTel endpoint, environment and version.
+    """
+    if telemetry is not None:
+        set_capture_policy(PayloadCapturePolicy.from_env())
+        setup_telemetry(*telemetry)
+
+    if events is None or not project_dir:
+        if project_dir:
+            load_modules_from_directory(project_dir)
+        return
+
+    callback_handler = CallbackHandler()
+    callback_handler.register_default(events.put)
+    auto_instrument(project_dir or os.getcwd(), callback_handler)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class WorkflowExecutor:
+    """Runs synchronous workflows off the event loop thread.
+
+    Thread mode keeps the workflow in-process but frees the event loop while it runs.
+    Process mode runs the workflow in a pool of worker processes, which load the
+    project's modules once at start up. Only the workflow name and orjson encoded
+    inputs and outputs cross the process boundary.
+
+    With a `callback_handler`, the pool processes instrument the project too, and the
+    callback events their workflows, tasks and language models fire are relayed to the
+    handler on the event loop of the caller of `run_in_process`.
+    """
+
+    def __init__(
+        self,
+        project_dir: str | None = None,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        mp_context: str = "spawn",
+        callback_handler: CallbackHandler | None = None,
+        telemetry: tuple[str, str, str] | None = None,
+    ):
+        self.project_dir = project_dir
+        self.max_threads = max_threads
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.callback_handler = callback_handler
+        self.telemetry = telemetry
+
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._events: SimpleQueue | None = None
+        self._relay_thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="agentifyme-workflow")
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            context = multiprocessing.get_context(self.mp_context)
+            if self.callback_handler is not None:
+                self._events = context.SimpleQueue()
+                self._relay_thread = threading.Thread(target=self._relay_events, args=(self._events,), name="agentifyme-event-relay", daemon=True)
+                self._relay_thread.start()
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_processes,
+                mp_context=context,
+                initializer=_initialize_process,
+                initargs=(self.project_dir, self._events, self.telemetry),
+            )
+        return self._process_pool
+
+    def _relay_events(self, events: SimpleQueue) -> None:
+        while (event := events.get()) is not None:
+            loop = self._loop
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self.callback_handler.relay, event)
+            else:
+                self.callback_handler.relay(event)
+
+    def start_process_pool(self) -> None:
+        """Start all pool processes up front so the first jobs don't pay for process start up"""
+        pool = self.process_pool
+        futures = [pool.submit(_noop) for _ in range(self.max_processes)]
+        pids = {future.result() for future in futures}
+        logger.info(f"Started workflow process pool with {len(pids)} processes")
+
+    async def run_in_thread(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `func` in the thread pool, keeping the caller's context variables"""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self.thread_pool, functools.partial(ctx.run, func, *args, **kwargs))
+
+    async def run_in_process(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable module-level `func` in the process pool"""
+        loop = self._loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.process_pool, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the pools down, cancelling queued jobs.
+
+        Without `wait`, the process pool is joined in a background thread, so the events
+        of the jobs still running are relayed until they finish.
+        """
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            args = (self._process_pool, self._events, self._relay_thread)
+            self._process_pool = None
+            self._events = None
+            self._relay_thread = None
+            if wait:
+                self._close_process_pool(*args)
+            else:
+                threading.Thread(target=self._close_process_pool, args=args, name="agentifyme-pool-shutdown", daemon=True).start()
+
+    @staticmethod
+    def _close_process_pool(pool: ProcessPoolExecutor, events: SimpleQueue | None, relay_thread: threading.Thread | None) -> None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if events is not None:
+            # the pool processes are gone, so the sentinel is the last event
+            events.put(None)
+            relay_thread.join()
@@ -1,12 +1,11 @@
-from datetime import datetime
-from decimal import Decimal, InvalidOperation
-from inspect import signature
-from numbers import Number
-from typing import Any, Callable, Union, get_args, get_origin, get_type_hints
+from typing import Any, Callable
 
+import orjson
 from google.protobuf import any_pb2, struct_pb2
-from google.protobuf.json_format import MessageToDict, ParseDict
+from google.protobuf.json_format import ParseDict
 
+import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
+from agentifyme.components.arguments import ArgumentPlan, get_argument_plan
 from agentifyme.components.utils import Param
 from agentifyme.components.workflow import WorkflowConfig
 from agentifyme.worker.pb.api.v1 import common_pb2 as common_pb
@@ -121,11 +120,77 @@ def convert_workflow_to_pb(workflow: WorkflowConfig) -> common_pb.WorkflowConfig
     return pb_workflow
 
 
+_VALUE_FIELDS = struct_pb2.Value.DESCRIPTOR.fields_by_name
+_SCALAR_VALUES = frozenset(_VALUE_FIELDS[name].number for name in ("number_value", "string_value", "bool_value"))
+_STRUCT_VALUE = _VALUE_FIELDS["struct_value"].number
+_LIST_VALUE = _VALUE_FIELDS["list_value"].number
+
+
+def _value_to_python(value: struct_pb2.Value) -> Any:
+    """Convert a protobuf Value to the equivalent Python value."""
+    # ListFields returns the set member of the oneof along with its value in a single call
+    fields = value.ListFields()
+    if not fields:
+        return None
+    field, item = fields[0]
+    number = field.number
+    if number in _SCALAR_VALUES:
+        return item
+    if number == _STRUCT_VALUE:
+        return {key: _value_to_python(v) for key, v in item.fields.items()}
+    if number == _LIST_VALUE:
+        return [_value_to_python(v) for v in item.values]
+    return None
+
+
 def struct_to_dict(struct_data: struct_pb2.Struct) -> dict:
-    """Convert protobuf Struct to Python dictionary."""
+    """Convert protobuf Struct to Python dictionary.
+
+    Walks the Struct directly instead of going through `MessageToDict`. Struct stores
+    every number as a double, which is kept as a float; the argument plan turns it
+    into an int for parameters annotated as one.
+    """
     if not struct_data:
         return {}
-    return MessageToDict(struct_data)
+    return {key: _value_to_python(value) for key, value in struct_data.fields.items()}
+
+
+# name a plain string input is passed as, unless the workflow has a single parameter
+STRING_INPUT_PARAMETER = "input"
+
+
+def _decode_string_input(text: str, argument_plan: ArgumentPlan | None) -> dict:
+    try:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        return data
+    if argument_plan is not None and len(argument_plan.params) == 1:
+        return {argument_plan.params[0].name: text}
+    return {STRING_INPUT_PARAMETER: text}
+
+
+def decode_workflow_input(request: pb.WorkflowRequest, argument_plan: ArgumentPlan | None = None) -> dict:
+    """Decode the input parameters of a workflow request according to its data format.
+
+    A plain string input, one that isn't a JSON object, is passed to the workflow's only
+    parameter, or as `input` if it has several. When the field of the data format is
+    empty the input is read from `struct_input`, as it was before data formats existed.
+
+    Args:
+        request (pb.WorkflowRequest): The request.
+        argument_plan (ArgumentPlan | None): Argument plan of the requested workflow.
+
+    """
+    data_format = request.input_data_format
+    if data_format == pb.DATA_FORMAT_BINARY and request.binary_input:
+        return orjson.loads(request.binary_input)
+    if data_format == pb.DATA_FORMAT_JSON and request.json_input:
+        return orjson.loads(request.json_input)
+    if data_format == pb.DATA_FORMAT_STRING and request.json_input:
+        return _decode_string_input(request.json_input, argument_plan)
+    return struct_to_dict(request.struct_input)
 
 
 def dict_to_struct(data: dict) -> struct_pb2.Struct:
@@ -136,129 +201,6 @@ def dict_to_struct(data: dict) -> struct_pb2.Struct:
     return struct_data
 
 
-def _convert_numeric(value: Any, target_type: type) -> Number:
-    """Convert a value to a numeric type with validation."""
-    if isinstance(value, str):
-        value = value.strip()
-        try:
-            if issubclass(target_type, int):
-                float_val = float(value)
-                if float_val.is_integer():
-                    return int(float_val)
-                raise ValueError(f"Float value {value} cannot be converted to integer without loss")
-            if issubclass(target_type, float):
-                return float(value)
-            if issubclass(target_type, Decimal):
-                return Decimal(value)
-        except (ValueError, InvalidOperation) as e:
-            raise ValueError(f"Cannot convert {value} to {target_type.__name__}: {str(e)}")
-
-    if isinstance(value, Number):
-        if issubclass(target_type, int) and isinstance(value, float):
-            if value.is_integer():
-                return int(value)
-            raise ValueError(f"Float value {value} cannot be converted to integer without loss")
-        return target_type(value)
-
-    raise ValueError(f"Cannot convert {type(value).__name__} to {target_type.__name__}")
-
-
-def _convert_dict_values(value: dict, type_hints: Any) -> dict:
-    """Convert dictionary values based on type hints."""
-    if not isinstance(value, dict):
-        raise ValueError(f"Expected dict but got {type(value).__name__}")
-
-    dict_types = get_args(type_hints)
-    if not dict_types:
-        return value
-
-    key_type, value_type = dict_types
-    result = {}
-
-    for k, v in value.items():
-        if key_type is not Any and not isinstance(k, key_type):
-            k = key_type(k)
-
-        if value_type is Any:
-            v = v
-        elif get_origin(value_type) is dict:
-            v = _convert_dict_values(v, value_type)
-        elif get_origin(value_type) is Union:
-            v = _convert_union_type(v, get_args(value_type))
-        elif value_type in (int, float, Decimal):
-            v = _convert_numeric(v, value_type)
-        elif value_type is not Any and not isinstance(v, value_type):
-            v = value_type(v)
-
-        result[k] = v
-
-    return result
-
-
-def _convert_union_type(value: Any, union_types: tuple) -> Any:
-    """Convert a value to one of the possible union types."""
-    errors = []
-    for possible_type in union_types:
-        if possible_type is type(None):
-            continue
-        try:
-            if possible_type in (int, float, Decimal):
-                return _convert_numeric(value, possible_type)
-            return possible_type(value)
-        except (ValueError, TypeError) as e:
-            errors.append(str(e))
-    raise ValueError(f"Could not convert value to any of {union_types}: {'; '.join(errors)}")
-
-
-def _convert_value(value: Any, param_type: type, param_name: str) -> Any:
-    """Convert a single value to the target type."""
-    try:
-        # Handle dict type - check before any conversion
-        if param_type is dict or get_origin(param_type) is dict:
-            if not isinstance(value, dict):
-                raise ValueError(f"Expected dict but got {type(value).__name__}")
-            if get_origin(param_type) is dict:
-                return _convert_dict_values(value, param_type)
-            return value
-
-        if hasattr(param_type, "model_validate"):
-            return param_type.model_validate(value)
-        if param_type == datetime:
-            if isinstance(value, str):
-                return datetime.fromisoformat(value.replace("Z", "+00:00"))
-            return value
-        if param_type in (int, float, Decimal):
-            return _convert_numeric(value, param_type)
-        if get_origin(param_type) is Union:
-            return _convert_union_type(value, get_args(param_type))
-        return param_type(value)
-    except ValueError as e:
-        raise ValueError(str(e))
-
-
 def build_args_from_signature(func: Callable, input_dict: dict[str, Any]) -> dict[str, Any]:
     """Builds function arguments using signature and type hints."""
-    sig = signature(func)
-    type_hints = get_type_hints(func)
-    type_hints.pop("return", None)
-    args = {}
-
-    for param_name, param in sig.parameters.items():
-        param_type = type_hints.get(param_name)
-        if not param_type or (param_name not in input_dict and param.default is not param.empty):
-            continue
-
-        value = input_dict.get(param_name)
-        if value is None:
-            if get_origin(param_type) is Union and type(None) in get_args(param_type) or param.default is not param.empty:
-                args[param_name] = None
-                continue
-            raise ValueError(f"Required parameter {param_name} cannot be None")
-
-        try:
-            args[param_name] = _convert_value(value, param_type, param_name)
-        except ValueError as e:
-            # Use the original error message directly
-            raise ValueError(str(e))
-
-    return args
+    return get_argument_plan(func).build(input_dict)
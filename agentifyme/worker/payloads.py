@@ -0,0 +1,167 @@
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+from agentifyme.utilities.grpc import convert_for_protobuf
+
+DEFAULT_INLINE_THRESHOLD = 256 * 1024
+DEFAULT_PREVIEW_BYTES = 1024
+
+# Key marking a payload that was replaced by a reference to a blob
+BLOB_REF_KEY = "$blob"
+
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    converted = convert_for_protobuf(obj)
+    if converted is obj:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return converted
+
+
+def serialize_payload(data: Any) -> tuple[bytes, str]:
+    """Serialize an event payload, returning the bytes and their content type."""
+    if isinstance(data, bytes):
+        return data, "application/octet-stream"
+    if isinstance(data, str):
+        return data.encode(), "text/plain; charset=utf-8"
+    return orjson.dumps(data, default=_json_default, option=_JSON_OPTIONS), "application/json"
+
+
+def payload_preview(data: Any, limit: int = DEFAULT_PREVIEW_BYTES) -> str:
+    """Return at most `limit` bytes of the serialized payload, for span attributes and events."""
+    try:
+        serialized, _ = serialize_payload(data)
+    except TypeError:
+        serialized = str(data).encode()
+
+    if len(serialized) <= limit:
+        return serialized.decode(errors="replace")
+    # errors="ignore" drops a multi-byte character split by the cut
+    return f"{serialized[:limit].decode(errors='ignore')}... [truncated, {len(serialized)} bytes]"
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Reference to a payload stored out of band."""
+
+    sha256: str
+    size: int
+    content_type: str
+    uri: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            BLOB_REF_KEY: {
+                "sha256": self.sha256,
+                "size": self.size,
+                "content_type": self.content_type,
+                "uri": self.uri,
+            }
+        }
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for payloads too large to send inline."""
+
+    @abstractmethod
+    def put(self, data: bytes, content_type: str = "application/octet-stream") -> BlobRef:
+        """Store `data` under its SHA-256 digest. Storing the same content again is a no-op."""
+
+    @abstractmethod
+    def get(self, sha256: str) -> bytes:
+        """Return the content stored under `sha256`. Raises `KeyError` if there is none."""
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        """Return whether content is stored under `sha256`."""
+
+
+class FileBlobStore(BlobStore):
+    """A blob store keeping one file per digest in a local directory.
+
+    Files are sharded into two levels of sub-directories like the disk cache. Writes go
+    to a temporary file and are renamed into place, so readers never see partial blobs.
+
+    Args:
+        root_dir (str): Directory the blobs are written to.
+
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.root_dir, sha256[:2], sha256[2:4], sha256)
+
+    def put(self, data: bytes, content_type: str = "application/octet-stream") -> BlobRef:
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self._path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        return BlobRef(sha256=sha256, size=len(data), content_type=content_type, uri=f"file://{path}")
+
+    def get(self, sha256: str) -> bytes:
+        try:
+            with open(self._path(sha256), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(sha256) from None
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self._path(sha256))
+
+
+class PayloadOffloader:
+    """Replaces event payloads above a size threshold with references into a blob store.
+
+    Args:
+        store (BlobStore): Where large payloads are written.
+        inline_threshold (int): Largest serialized payload, in bytes, that is still sent inline.
+
+    """
+
+    def __init__(self, store: BlobStore, inline_threshold: int = DEFAULT_INLINE_THRESHOLD):
+        self.store = store
+        self.inline_threshold = inline_threshold
+
+    def offload(self, data: Any) -> Any | BlobRef:
+        """Return `data` unchanged if it is small enough, else store it and return its `BlobRef`."""
+        if isinstance(data, bytes) and len(data) <= self.inline_threshold:
+            return data
+        if isinstance(data, str) and len(data) * 4 <= self.inline_threshold:
+            # UTF-8 takes at most 4 bytes per character, so it fits without encoding it
+            return data
+
+        try:
+            serialized, content_type = serialize_payload(data)
+        except TypeError:
+            # left for the event encoder to convert or reject
+            return data
+        if len(serialized) <= self.inline_threshold:
+            return data
+        return self.store.put(serialized, content_type)
+
+    def put(self, data: Any) -> BlobRef | None:
+        """Store `data` whatever its size, returning None if it can't be serialized."""
+        try:
+            serialized, content_type = serialize_payload(data)
+        except TypeError:
+            return None
+        return self.store.put(serialized, content_type)
@@ -0,0 +1,251 @@
+import bisect
+import contextlib
+import os
+import struct
+import threading
+import zlib
+
+from loguru import logger
+
+# offset, payload length, crc32 of the payload
+_HEADER = struct.Struct(">QII")
+_ACKED_FILE = "acked"
+_SEGMENT_SUFFIX = ".log"
+
+
+class EventSpool:
+    """A local append-only log of encoded events waiting to be delivered.
+
+    Records are numbered with increasing offsets and written to segment files named
+    after the first offset they hold. A reader cursor returns records in order and can
+    be rewound to the first unacknowledged record, e.g. after the stream reconnects.
+    Acknowledging an offset only records it in memory; `sync` persists it and deletes
+    the segments that are fully acknowledged, so only undelivered events stay on disk.
+
+    Appends are buffered; call `sync` to flush and fsync them, typically from a worker
+    thread on an interval. Records may be appended from one thread while another reads
+    and acknowledges them and a third calls `sync`.
+    On start up, a record torn by a crash at the end of the last segment is truncated.
+    Acknowledgements not yet persisted by `sync` are lost on a crash, so those records
+    are read again after a restart.
+
+    Args:
+        directory (str): Directory for the segment files.
+        segment_bytes (int): Size after which a new segment is started.
+
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._segments: list[int] = []
+        self._acked = 0
+        self._persisted_acked = 0
+        self._next_offset = 1
+        self._writer = None
+        self._writer_size = 0
+        self._dirty = False
+        self._resume_segment: int | None = None
+        self._lock = threading.Lock()
+        self._ack_lock = threading.Lock()
+
+        self._read_offset = 1
+        self._reader = None
+        self._reader_segment: int | None = None
+
+        self._recover()
+
+    @property
+    def acked_offset(self) -> int:
+        return self._acked
+
+    @property
+    def pending(self) -> int:
+        """Number of records not yet acknowledged."""
+        return self._next_offset - 1 - self._acked
+
+    @property
+    def unread(self) -> int:
+        """Number of records not yet returned by `read`."""
+        return self._next_offset - self._read_offset
+
+    def _segment_path(self, first_offset: int) -> str:
+        return os.path.join(self.directory, f"{first_offset:020d}{_SEGMENT_SUFFIX}")
+
+    def _recover(self) -> None:
+        try:
+            with open(os.path.join(self.directory, _ACKED_FILE)) as f:
+                self._acked = int(f.read().strip() or 0)
+        except FileNotFoundError:
+            pass
+
+        self._segments = sorted(int(name[: -len(_SEGMENT_SUFFIX)]) for name in os.listdir(self.directory) if name.endswith(_SEGMENT_SUFFIX))
+        self._next_offset = self._acked + 1
+        if self._segments:
+            last = self._segments[-1]
+            path = self._segment_path(last)
+            offset, end = self._scan(path, last)
+            if end < os.path.getsize(path):
+                logger.warning(f"Truncating torn record at the end of event spool segment {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            if offset >= self._next_offset:
+                self._next_offset = offset
+                self._resume_segment = last
+
+        self._read_offset = self._acked + 1
+        self._persisted_acked = self._acked
+        self._drop_acked_segments(self._acked)
+
+    def _scan(self, path: str, first_offset: int) -> tuple[int, int]:
+        """Return the offset after the last complete record in a segment, and where it ends."""
+        offset, end = first_offset, 0
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                record_offset, length, crc = _HEADER.unpack(header)
+                data = f.read(length)
+                if record_offset != offset or len(data) < length or zlib.crc32(data) != crc:
+                    break
+                offset += 1
+                end = f.tell()
+        return offset, end
+
+    def append(self, data: bytes) -> int:
+        """Append a record and return its offset."""
+        if self._writer is None or self._writer_size >= self.segment_bytes:
+            self._rotate()
+
+        offset = self._next_offset
+        with self._lock:
+            self._writer.write(_HEADER.pack(offset, len(data), zlib.crc32(data)))
+            self._writer.write(data)
+            self._dirty = True
+            self._next_offset += 1
+        self._writer_size += _HEADER.size + len(data)
+        return offset
+
+    def _rotate(self) -> None:
+        if self._writer is not None:
+            self._sync_appends()
+            with self._lock:
+                self._writer.close()
+
+        if self._resume_segment is not None:
+            # continue the last segment left from a previous run
+            first, self._resume_segment = self._resume_segment, None
+        else:
+            first = self._next_offset
+            with self._lock:
+                self._segments.append(first)
+        self._writer = open(self._segment_path(first), "ab")  # noqa: SIM115
+        self._writer_size = self._writer.tell()
+
+    def sync(self) -> None:
+        """Fsync buffered appends, then persist the acknowledged offset and delete acknowledged segments."""
+        self._sync_appends()
+        self._persist_acked()
+
+    def _sync_appends(self) -> None:
+        with self._lock:
+            if self._writer is None or not self._dirty:
+                return
+            self._dirty = False
+            self._writer.flush()
+            # fsync a duplicate so appends don't wait for the disk
+            fd = os.dup(self._writer.fileno())
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def read(self, limit: int) -> list[tuple[int, bytes]]:
+        """Return up to `limit` records after the reader cursor and advance it."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+            # records appended from now on may still be buffered
+            end = self._next_offset
+
+        records = []
+        while len(records) < limit and self._read_offset < end:
+            if self._reader is None:
+                self._open_reader()
+
+            header = self._reader.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                # end of this segment, the next one starts at the cursor
+                self._close_reader()
+                continue
+
+            offset, length, _ = _HEADER.unpack(header)
+            data = self._reader.read(length)
+            if offset < self._read_offset:
+                continue
+            records.append((offset, data))
+            self._read_offset = offset + 1
+        return records
+
+    def _open_reader(self) -> None:
+        with self._lock:
+            idx = bisect.bisect_right(self._segments, self._read_offset) - 1
+            first = self._segments[max(idx, 0)]
+        self._reader = open(self._segment_path(first), "rb")  # noqa: SIM115
+        self._reader_segment = first
+
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._reader_segment = None
+
+    def rewind(self) -> None:
+        """Move the reader cursor back to the first unacknowledged record."""
+        self._close_reader()
+        self._read_offset = self._acked + 1
+
+    def ack(self, offset: int) -> None:
+        """Mark all records up to and including `offset` as delivered.
+
+        Doesn't touch the disk: the offset is persisted by the next `sync`.
+        """
+        self._acked = max(self._acked, offset)
+
+    def _persist_acked(self) -> None:
+        with self._ack_lock:
+            acked = self._acked
+            if acked == self._persisted_acked:
+                return
+
+            path = os.path.join(self.directory, _ACKED_FILE)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(str(acked))
+            os.replace(tmp_path, path)
+            self._persisted_acked = acked
+
+            # only once persisted, so a restart doesn't look for records in deleted segments
+            self._drop_acked_segments(acked)
+
+    def _drop_acked_segments(self, acked: int) -> None:
+        # a segment is done once the next one starts after the acknowledged offset
+        while True:
+            with self._lock:
+                if len(self._segments) < 2 or self._segments[1] - 1 > acked or self._segments[0] == self._reader_segment:
+                    # the reader closes a segment when it reaches its end; delete it on a later sync
+                    return
+                first = self._segments.pop(0)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._segment_path(first))
+
+    def close(self) -> None:
+        self.sync()
+        self._close_reader()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Callable
+from datetime import datetime
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+
+from loguru import logger
+
+HEALTH_DIR = Path("/tmp/health")
+
+
+def health_file_for(worker_id: str) -> Path:
+    return HEALTH_DIR / f"worker_{worker_id}.txt"
+
+
+class WorkerSupervisor:
+    """Runs a worker service per child process and keeps them alive.
+
+    Children are forked from the supervisor, so anything imported in the parent before
+    `run` is called (project modules, instrumentation) is shared copy-on-write. Each child
+    gets its own worker id suffix and must create its own event loop and gRPC channel.
+    The supervisor restarts children that exit and reports the pod as healthy only while
+    every child is alive and healthy.
+    """
+
+    def __init__(
+        self,
+        worker_id: str,
+        num_processes: int,
+        target: Callable[[str], int],
+        poll_interval: float = 1.0,
+        max_restart_delay: float = 30.0,
+    ):
+        if num_processes < 1:
+            raise ValueError("num_processes must be at least 1")
+
+        self.worker_id = worker_id
+        self.num_processes = num_processes
+        self.target = target
+        self.poll_interval = poll_interval
+        self.max_restart_delay = max_restart_delay
+
+        self.health_file = health_file_for(worker_id)
+        self.children: dict[int, BaseProcess] = {}
+        self.restarts: dict[int, int] = {}
+        self._next_start: dict[int, float] = {}
+        self._last_health_state: bool | None = None
+        self._stopping = False
+        self._context = multiprocessing.get_context("fork")
+
+    def child_worker_id(self, index: int) -> str:
+        return f"{self.worker_id}-{index}"
+
+    def start_child(self, index: int) -> BaseProcess:
+        child_worker_id = self.child_worker_id(index)
+        process = self._context.Process(target=self._run_child, args=(child_worker_id,), name=f"agentifyme-worker-{index}")
+        process.start()
+        self.children[index] = process
+        logger.info(f"Started worker {child_worker_id} with pid {process.pid}")
+        return process
+
+    def _run_child(self, child_worker_id: str) -> None:
+        # The parent's handlers only make sense in the supervisor
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        raise SystemExit(self.target(child_worker_id))
+
+    def check_children(self) -> None:
+        """Restart children that have exited, backing off if they keep crashing"""
+        now = time.monotonic()
+        for index in range(self.num_processes):
+            process = self.children.get(index)
+            if process is not None and process.is_alive():
+                if health_file_for(self.child_worker_id(index)).exists():
+                    self.restarts[index] = 0
+                continue
+
+            if process is not None:
+                process.join(timeout=0)
+                restarts = self.restarts.get(index, 0)
+                delay = min(2**restarts, self.max_restart_delay)
+                logger.warning(f"Worker {self.child_worker_id(index)} exited with code {process.exitcode}, restarting in {delay}s")
+                self.restarts[index] = restarts + 1
+                self._next_start[index] = now + delay
+                health_file_for(self.child_worker_id(index)).unlink(missing_ok=True)
+                del self.children[index]
+
+            if now >= self._next_start.get(index, 0):
+                self.start_child(index)
+
+    def is_healthy(self) -> bool:
+        if len(self.children) < self.num_processes:
+            return False
+        return all(process.is_alive() and health_file_for(self.child_worker_id(index)).exists() for index, process in self.children.items())
+
+    def update_health_status(self) -> None:
+        """Write the aggregated health file only when the state changes"""
+        current_state = self.is_healthy()
+        if current_state == self._last_health_state:
+            return
+
+        if current_state:
+            self.health_file.parent.mkdir(exist_ok=True)
+            self.health_file.write_text(str(int(datetime.now().timestamp() * 1_000_000)))
+            logger.info("Worker processes are healthy")
+        else:
+            self.health_file.unlink(missing_ok=True)
+            logger.info("Worker processes are unhealthy")
+        self._last_health_state = current_state
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        logger.info("Stopping worker processes")
+        # SIGINT lets the children stop their worker services the same way a single worker does
+        for process in self.children.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+
+        deadline = time.monotonic() + timeout
+        for process in self.children.values():
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        for index in self.children:
+            health_file_for(self.child_worker_id(index)).unlink(missing_ok=True)
+        self.children.clear()
+        self.health_file.unlink(missing_ok=True)
+
+    def run(self) -> int:
+        """Start the children and supervise them until SIGTERM or SIGINT"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.health_file.unlink(missing_ok=True)
+        logger.info(f"Starting {self.num_processes} worker processes for worker {self.worker_id}")
+        try:
+            while not self._stopping:
+                self.check_children()
+                self.update_health_status()
+                time.sleep(self.poll_interval)
+        finally:
+            self.shutdown()
+        return 0
@@ -0,0 +1,104 @@
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from opentelemetry.trace import Span
+
+from agentifyme.worker.payloads import DEFAULT_PREVIEW_BYTES, payload_preview
+
+
+class CaptureMode(str, Enum):
+    """Which calls get their inputs and outputs captured in events and spans."""
+
+    FULL = "full"
+    HEAD_SAMPLED = "head_sampled"
+    TAIL_ON_ERROR = "tail_on_error"
+    METADATA_ONLY = "metadata_only"
+
+
+_TRACE_ID_LIMIT = 1 << 64
+
+
+@dataclass(frozen=True)
+class PayloadCapturePolicy:
+    """Decides whether workflow and task payloads are captured, and how much of them.
+
+    Modes:
+        full: capture every call.
+        head_sampled: capture `sample_rate` of traces, decided from the trace id so all
+            spans of a trace agree.
+        tail_on_error: capture only calls that fail, once they have failed.
+        metadata_only: never capture payloads.
+
+    In `head_sampled` and `tail_on_error` modes, captured payloads of instrumented calls
+    are also serialized into span attributes when the span is recording, one attribute
+    per top level field, each truncated to `max_field_bytes`. `full` mode leaves them out
+    of the spans, so every call doesn't pay for serializing them twice.
+
+    Args:
+        mode (CaptureMode): The capture mode.
+        sample_rate (float): Fraction of traces captured in `head_sampled` mode.
+        max_field_bytes (int): Maximum serialized size of each captured span attribute.
+
+    """
+
+    mode: CaptureMode = CaptureMode.FULL
+    sample_rate: float = 1.0
+    max_field_bytes: int = DEFAULT_PREVIEW_BYTES
+
+    @classmethod
+    def from_env(cls) -> "PayloadCapturePolicy":
+        """Read the policy from AGENTIFYME_PAYLOAD_CAPTURE, _SAMPLE_RATE and _MAX_FIELD_BYTES."""
+        return cls(
+            mode=CaptureMode(os.getenv("AGENTIFYME_PAYLOAD_CAPTURE", CaptureMode.FULL.value)),
+            sample_rate=float(os.getenv("AGENTIFYME_PAYLOAD_SAMPLE_RATE", "1.0")),
+            max_field_bytes=int(os.getenv("AGENTIFYME_PAYLOAD_MAX_FIELD_BYTES", str(DEFAULT_PREVIEW_BYTES))),
+        )
+
+    def should_capture(self, span: Span) -> bool:
+        """Whether a call in `span` captures its payloads up front."""
+        if self.mode == CaptureMode.FULL:
+            return True
+        if self.mode == CaptureMode.HEAD_SAMPLED:
+            trace_id = span.get_span_context().trace_id
+            return (trace_id & (_TRACE_ID_LIMIT - 1)) < self.sample_rate * _TRACE_ID_LIMIT
+        return False
+
+    @property
+    def records_span_attributes(self) -> bool:
+        """Whether captured payloads of instrumented calls are also set as span attributes."""
+        return self.mode in (CaptureMode.HEAD_SAMPLED, CaptureMode.TAIL_ON_ERROR)
+
+    def capture_on_error(self, captured: bool) -> bool:
+        """Whether a failed call captures its payloads, given what was decided up front."""
+        return captured or self.mode == CaptureMode.TAIL_ON_ERROR
+
+    def captures(self, span: Span, failed: bool = False) -> bool:
+        """Whether a call in `span` that succeeded, or `failed`, has its payloads captured."""
+        captured = self.should_capture(span)
+        return self.capture_on_error(captured) if failed else captured
+
+    def record(self, span: Span, prefix: str, payload: Any) -> None:
+        """Set truncated span attributes for `payload`, if the span is recording."""
+        if not span.is_recording():
+            return
+        span.set_attributes(self.attributes(prefix, payload))
+
+    def attributes(self, prefix: str, payload: Any) -> dict[str, str]:
+        """Serialize `payload` into attributes named after `prefix`, one per top level field."""
+        if isinstance(payload, dict):
+            return {f"{prefix}.{key}": payload_preview(value, self.max_field_bytes) for key, value in payload.items()}
+        return {prefix: payload_preview(payload, self.max_field_bytes)}
+
+
+_policy = PayloadCapturePolicy()
+
+
+def get_capture_policy() -> PayloadCapturePolicy:
+    return _policy
+
+
+def set_capture_policy(policy: PayloadCapturePolicy) -> None:
+    global _policy
+    _policy = policy
@@ -15,6 +15,7 @@ from agentifyme.components.task import TaskConfig
 from agentifyme.components.workflow import WorkflowConfig
 from agentifyme.utilities.modules import load_modules_from_directory
 from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.telemetry.capture import get_capture_policy
 from agentifyme.worker.telemetry.semconv import SemanticAttributes
 
 from .base import get_resource_attributes
@@ -85,6 +86,57 @@ def prepare_output(output):
     return str(output)
 
 
+def call_arguments(wrapped, args, kwargs) -> dict:
+    """Map positional arguments to their parameter names"""
+    _kwargs = kwargs.copy()
+    _kwargs.update(zip(wrapped.__code__.co_varnames, args, strict=False))
+    return _kwargs
+
+
+class _CallPayloads:
+    """Builds the event data of one instrumented call, capturing payloads as the policy allows"""
+
+    def __init__(self, span, attributes: dict, name: str, wrapped, args, kwargs):
+        self.policy = get_capture_policy()
+        self.span = span
+        self.base = {**attributes, "name": name}
+        self.wrapped = wrapped
+        self.args = args
+        self.kwargs = kwargs
+        self.captured = self.policy.should_capture(span)
+        self._input = None
+
+    @property
+    def input(self) -> dict:
+        if self._input is None:
+            self._input = call_arguments(self.wrapped, self.args, self.kwargs)
+        return self._input
+
+    def _record(self, prefix: str, payload) -> None:
+        if self.policy.records_span_attributes:
+            self.policy.record(self.span, prefix, payload)
+
+    def started(self) -> dict:
+        if not self.captured:
+            return self.base
+        self._record("input", self.input)
+        return {**self.base, "input": self.input}
+
+    def completed(self, output) -> dict:
+        if not self.captured:
+            return self.base
+        self._record("output", output)
+        return {**self.base, "output": prepare_output(output), "input": self.input}
+
+    def failed(self, error: Exception) -> dict:
+        data = {**self.base, "error": str(error)}
+        if self.policy.capture_on_error(self.captured):
+            if not self.captured:
+                self._record("input", self.input)
+            data["input"] = self.input
+        return data
+
+
 def create_instrumentation_wrapper(callback_handler: CallbackHandler, event_source: str, name: str):
     """Create an instrumentation wrapper with the given callback handler and event source"""
 
@@ -103,22 +155,20 @@ def create_instrumentation_wrapper(callback_handler: CallbackHandler, event_sour
             ) as span:
                 attributes = prepare_span_attributes(span, span_name)
                 token = attach(baggage.set_baggage("parent_id", attributes["step_id"]))
+                payloads = _CallPayloads(span, attributes, name, wrapped, args, kwargs)
 
                 try:
-                    _kwargs = kwargs.copy()
-                    _kwargs.update(zip(wrapped.__code__.co_varnames, args, strict=False))
-                    await callback_handler.fire_event_async(f"{event_source}.run", "started", {**attributes, "name": name, "input": _kwargs})
+                    await callback_handler.fire_event_async(f"{event_source}.run", "started", payloads.started())
                     output = await wrapped(*args, **kwargs)
                     span.set_status(Status(StatusCode.OK))
-                    prepared_output = prepare_output(output)
-                    await callback_handler.fire_event_async(f"{event_source}.run", "completed", {**attributes, "name": name, "output": prepared_output, "input": _kwargs})
+                    await callback_handler.fire_event_async(f"{event_source}.run", "completed", payloads.completed(output))
                     return output
 
                 except Exception as error:
                     logger.error(f"Operation failed - {span_name}", exc_info=True)
                     span.record_exception(error)
                     span.set_status(Status(StatusCode.ERROR, str(error)))
-                    await callback_handler.fire_event_async(f"{event_source}.run", "completed", {**attributes, "name": name, "error": str(error), "input": _kwargs})
+                    await callback_handler.fire_event_async(f"{event_source}.run", "completed", payloads.failed(error))
                     raise
 
                 finally:
@@ -136,23 +186,21 @@ def create_instrumentation_wrapper(callback_handler: CallbackHandler, event_sour
             ) as span:
                 attributes = prepare_span_attributes(span, span_name)
                 token = attach(baggage.set_baggage("parent_id", attributes["step_id"]))
+                payloads = _CallPayloads(span, attributes, name, wrapped, args, kwargs)
 
                 try:
-                    _kwargs = kwargs.copy()
-                    _kwargs.update(zip(wrapped.__code__.co_varnames, args, strict=False))
-                    callback_handler.fire_event(f"{event_source}.run", "started", {**attributes, "name": name, "input": _kwargs})
+                    callback_handler.fire_event(f"{event_source}.run", "started", payloads.started())
 
                     output = wrapped(*args, **kwargs)
                     span.set_status(Status(StatusCode.OK))
-                    prepared_output = prepare_output(output)
-                    callback_handler.fire_event(f"{event_source}.run", "completed", {**attributes, "name": name, "output": prepared_output, "input": _kwargs})
+                    callback_handler.fire_event(f"{event_source}.run", "completed", payloads.completed(output))
                     return output
 
                 except Exception as error:
                     logger.error(f"Operation failed - {span_name}", exc_info=True)
                     span.record_exception(error)
                     span.set_status(Status(StatusCode.ERROR, str(error)))
-                    callback_handler.fire_event(f"{event_source}.run", "completed", {**attributes, "name": name, "error": str(error), "input": _kwargs})
+                    callback_handler.fire_event(f"{event_source}.run", "completed", payloads.failed(error))
                     raise
 
                 finally:
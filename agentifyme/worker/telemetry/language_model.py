@@ -1,3 +1,4 @@
+import inspect
 import time
 from collections.abc import Callable
 from contextlib import contextmanager
@@ -89,6 +90,18 @@ result_errors = meter.create_counter(
     description="Errors by LLM provider",
 )
 
+# Streaming latency
+time_to_first_token = meter.create_histogram(
+    "llm.stream.time_to_first_token",
+    description="Time from the start of a streamed request to its first token",
+    unit="ms",
+)
+inter_token_latency = meter.create_histogram(
+    "llm.stream.inter_token_latency",
+    description="Time between consecutive chunks of a streamed response",
+    unit="ms",
+)
+
 
 class LLMTelemetryContext:
     """Context manager for handling LLM telemetry across providers"""
@@ -227,33 +240,104 @@ def llm_telemetry(method_name: str, callback_handler: CallbackHandler) -> Callab
     return method_decorator
 
 
+class StreamTimer:
+    """Records time to first token and inter-token latency of a streamed response."""
+
+    def __init__(self, span: trace.Span, attributes: dict[str, Any]):
+        self.span = span
+        self.attributes = attributes
+        self.start = time.monotonic()
+        self.first: float | None = None
+        self.last: float | None = None
+        self.chunks = 0
+
+    def observe(self, chunk: LanguageModelResponse) -> None:
+        if not chunk.message and not chunk.tool_call_deltas:
+            return
+
+        now = time.monotonic()
+        if self.first is None:
+            self.first = now
+            ttft_ms = (now - self.start) * 1000
+            time_to_first_token.record(ttft_ms, self.attributes)
+            self.span.set_attribute("llm.time_to_first_token", ttft_ms)
+        else:
+            inter_token_latency.record((now - self.last) * 1000, self.attributes)
+        self.last = now
+        self.chunks += 1
+
+    def finish(self) -> None:
+        self.span.set_attribute("llm.stream.chunks", self.chunks)
+        if self.chunks > 1:
+            self.span.set_attribute("llm.inter_token_latency.mean", (self.last - self.first) * 1000 / (self.chunks - 1))
+
+
+def _record_chunk(span: trace.Span, timer: StreamTimer, chunk: Any) -> None:
+    if isinstance(chunk, LanguageModelResponse):
+        if chunk.error:
+            result_errors.add(1)
+            span.record_exception(Exception(chunk.error))
+            span.set_status(Status(StatusCode.ERROR))
+        else:
+            timer.observe(chunk)
+            if chunk.message:
+                span.set_attribute("response_chunk_length", len(chunk.message))
+
+
 def llm_stream_telemetry(method_name: str, callback_handler: CallbackHandler) -> Callable:
-    """Decorator for adding telemetry to streaming LLM methods"""
+    """Decorator for adding telemetry to streaming LLM methods, sync or async"""
 
     def method_decorator(func: Callable) -> Callable:
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            async def async_wrapper(instance: LanguageModel, *args, **kwargs):
+                provider, _ = instance.get_model_name(instance.llm_model)
+
+                with LLMTelemetryContext(method_name, provider)() as span:
+                    stream = func(instance, *args, **kwargs)
+                    try:
+                        span.set_attributes(extract_telemetry_attributes(instance, method_name, args, kwargs))
+                        timer = StreamTimer(span, {"llm.provider": provider.value, "method": method_name})
+
+                        async for chunk in stream:
+                            _record_chunk(span, timer, chunk)
+                            yield chunk
+                        timer.finish()
+
+                    except Exception as e:
+                        result_errors.add(1)
+                        span.record_exception(e)
+                        span.set_status(Status(StatusCode.ERROR))
+                        raise
+                    finally:
+                        # close the provider stream now if the consumer stopped early
+                        await stream.aclose()
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(instance: LanguageModel, *args, **kwargs):
             provider, _ = instance.get_model_name(instance.llm_model)
 
             with LLMTelemetryContext(method_name, provider)() as span:
+                stream = func(instance, *args, **kwargs)
                 try:
                     span.set_attributes(extract_telemetry_attributes(instance, method_name, args, kwargs))
+                    timer = StreamTimer(span, {"llm.provider": provider.value, "method": method_name})
 
-                    for chunk in func(instance, *args, **kwargs):
-                        if isinstance(chunk, LanguageModelResponse):
-                            if chunk.error:
-                                result_errors.add(1)
-                                span.record_exception(Exception(chunk.error))
-                                span.set_status(Status(StatusCode.ERROR))
-                            elif chunk.message:
-                                span.set_attribute("response_chunk_length", len(chunk.message))
+                    for chunk in stream:
+                        _record_chunk(span, timer, chunk)
                         yield chunk
+                    timer.finish()
 
                 except Exception as e:
                     result_errors.add(1)
                     span.record_exception(e)
                     span.set_status(Status(StatusCode.ERROR))
                     raise
+                finally:
+                    stream.close()
 
         return wrapper
 
@@ -266,6 +350,7 @@ def instrument_llm_class(cls: Any, callback_handler: CallbackHandler) -> None:
         "generate": llm_telemetry,
         "agenerate": llm_telemetry,
         "generate_stream": llm_stream_telemetry,
+        "agenerate_stream": llm_stream_telemetry,
     }
 
     for method_name, decorator_factory in methods.items():
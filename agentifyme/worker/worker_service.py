@@ -1,10 +1,12 @@
 import asyncio
-import queue
 import random
 import traceback
 import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
 from typing import Any
 
@@ -23,18 +25,24 @@ from pydantic import BaseModel
 import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
 import agentifyme.worker.pb.api.v1.gateway_pb2_grpc as pb_grpc
 from agentifyme import __version__
-from agentifyme.components.workflow import WorkflowConfig
+from agentifyme.components.checkpoint import CheckpointStore, checkpointed_run
+from agentifyme.components.workflow import ExecutionMode, WorkflowConfig
 from agentifyme.errors import AgentifyMeError, ErrorCategory, ErrorSeverity
 from agentifyme.utilities.grpc import (
-    convert_for_protobuf,
     get_message_id,
     get_timestamp,
+    to_struct,
 )
 from agentifyme.worker.callback import CallbackHandler
-from agentifyme.worker.helpers import convert_workflow_to_pb, struct_to_dict
+from agentifyme.worker.event_sender import EventSender
+from agentifyme.worker.executors import WorkflowExecutor
+from agentifyme.worker.helpers import convert_workflow_to_pb, decode_workflow_input
+from agentifyme.worker.payloads import BlobRef, PayloadOffloader
 
 # Import generated protobuf code (assuming pb directory structure matches Go)
 from agentifyme.worker.pb.api.v1 import common_pb2
+from agentifyme.worker.spool import EventSpool
+from agentifyme.worker.telemetry.capture import get_capture_policy
 from agentifyme.worker.workflows import (
     WorkflowCommandHandler,
     WorkflowHandler,
@@ -54,11 +62,21 @@ async def exponential_backoff(attempt: int, max_delay: int = 32) -> None:
 tracer = trace.get_tracer(__name__)
 
 
+class QueueFullPolicy(str, Enum):
+    """What to do with a workflow request when the jobs queue is full."""
+
+    BLOCK = "block"  # Stop reading from the stream until a slot frees up
+    REJECT = "reject"  # Reject the new job and report the worker as busy
+    SHED_OLDEST = "shed_oldest"  # Drop the oldest queued job to make room for the new one
+
+
 class WorkerService:
     """Worker service for processing jobs."""
 
     MAX_RECONNECT_ATTEMPTS = 5  # Maximum number of reconnection attempts
     MAX_BACKOFF_DELAY = 32  # Maximum delay between attempts in seconds
+    MAX_ENCODED_INPUTS = 1024  # Maximum input structs kept for reuse by finished events
+    MAX_TRACKED_RUNS = 10_000  # Maximum runs with an event sequence counter
 
     def __init__(
         self,
@@ -70,16 +88,38 @@ class WorkerService:
         worker_id: str,
         max_workers: int = 50,
         heartbeat_interval: int = 30,
+        event_batch_size: int = 100,
+        event_batch_delay: float = 0.005,
+        max_queued_jobs: int = 100,
+        max_queued_events: int = 10_000,
+        queue_full_policy: QueueFullPolicy | str = QueueFullPolicy.BLOCK,
+        workflow_executor: WorkflowExecutor | None = None,
+        payload_offloader: PayloadOffloader | None = None,
+        event_spool: EventSpool | None = None,
+        checkpoint_store: CheckpointStore | None = None,
     ):
         # configuration
         self.api_gateway_url = api_gateway_url
         self.project_id = project_id
         self.deployment_id = deployment_id
         self.worker_id = worker_id
-
-        self.jobs_queue = asyncio.Queue()
-        self.events_queue = asyncio.Queue()
-        self.callback_event_queue = asyncio.Queue()
+        self.max_workers = max_workers
+        self.queue_full_policy = QueueFullPolicy(queue_full_policy)
+        self.workflow_executor = workflow_executor
+        self.payload_offloader = payload_offloader
+        self.checkpoint_store = checkpoint_store
+
+        # A maxsize of 0 means the queue is unbounded.
+        self.jobs_queue = asyncio.Queue(maxsize=max_queued_jobs)
+        self.events_queue = asyncio.Queue(maxsize=max_queued_events)
+        self.callback_event_queue = asyncio.Queue(maxsize=max_queued_events)
+        self.event_sender = EventSender(
+            self.events_queue,
+            self._build_event_message,
+            event_batch_size,
+            event_batch_delay,
+            spool=event_spool,
+        )
         self._event_loop = asyncio.get_event_loop()
         self.shutdown_event = asyncio.Event()
         self.active_jobs: dict[str, asyncio.Task] = {}
@@ -109,6 +149,12 @@ class WorkerService:
         self._stub = stub
         self.retry_attempt = 0
 
+        # last event sequence number sent per run
+        self._run_sequences: dict[str, int] = {}
+
+        # input structs encoded for initiated events, keyed by (request id, step id)
+        self._encoded_inputs: dict[tuple[Any, Any], tuple[Any, struct_pb2.Struct]] = {}
+
         # trace
         self._propagator = TraceContextTextMapPropagator()
 
@@ -118,7 +164,9 @@ class WorkerService:
 
         # callback handler
         self.callback_handler = callback_handler
-        self.callback_handler.register_default(self.stream_events)
+        self._overflow_events: deque[dict] = deque()
+        self._overflow_task: asyncio.Task | None = None
+        self.callback_handler.register_default(self.enqueue_event)
 
     async def start_service(self) -> bool:
         """Start the worker service."""
@@ -129,6 +177,10 @@ class WorkerService:
         self._workflow_handlers = workflow_handlers
         tasks = []
 
+        # pay for process start up before accepting jobs
+        if self.workflow_executor and any(h.execution_mode == ExecutionMode.PROCESS for h in workflow_handlers.values()):
+            await asyncio.to_thread(self.workflow_executor.start_process_pool)
+
         try:
             # clean up health state at start
             self.health_file.unlink(missing_ok=True)
@@ -202,11 +254,11 @@ class WorkerService:
                         await self._handle_health_check(msg)
 
             except grpc.RpcError as e:
-                self.connected = False
+                self._mark_disconnected()
                 logger.error(f"Stream error on attempt {self.retry_attempt + 1}/{self.MAX_RECONNECT_ATTEMPTS}: {e}")
 
             except Exception as e:
-                self.connected = False
+                self._mark_disconnected()
                 logger.error(f"Unexpected error: {e}")
 
             finally:
@@ -238,6 +290,11 @@ class WorkerService:
 
         await self._stop_heartbeat()
 
+        if self.workflow_executor:
+            self.workflow_executor.shutdown(wait=False)
+
+        self.event_sender.close()
+
     async def sync_workflows(self) -> None:
         # Prepare workflow configs
         _workflows = [convert_workflow_to_pb(WorkflowConfig.get(name).config) for name in WorkflowConfig.get_all()]
@@ -295,7 +352,7 @@ class WorkerService:
                 deployment_id=self.deployment_id,
                 type=pb.INBOUND_WORKER_MESSAGE_TYPE_WORKER_STATUS,
                 worker_status=pb.WorkerStatus(
-                    state=pb.WORKER_STATE_READY,
+                    state=pb.WORKER_STATE_BUSY if self.is_saturated else pb.WORKER_STATE_READY,
                     cpu_usage=cpu_usage,
                     memory_usage=memory_usage,
                     disk_usage=disk_usage,
@@ -310,7 +367,9 @@ class WorkerService:
             request = msg.workflow_request
             run_id = request.run_id
             workflow_name = request.workflow_name
-            input_parameters = struct_to_dict(request.struct_input)
+            handler = self._workflow_handlers.get(workflow_name)
+            argument_plan = handler.workflow.config.argument_plan if handler is not None else None
+            input_parameters = decode_workflow_input(request, argument_plan)
 
             # Extract tracing metadata
             carrier: dict[str, str] = getattr(msg, "metadata", {})
@@ -334,14 +393,103 @@ class WorkerService:
                     attributes={"run.id": run_id, "input_parameters": input_parameters},
                 )
 
-                await self.jobs_queue.put(workflow_job)
-                logger.debug(f"Queued workflow job: {request.run_id}")
+                if await self._enqueue_job(workflow_job):
+                    logger.debug(f"Queued workflow job: {request.run_id}")
+                else:
+                    span.add_event("job_rejected", attributes={"run.id": run_id})
 
             detach(token)
 
         except Exception as e:
             logger.error(f"Error handling workflow request: {e}")
 
+    @property
+    def available_job_slots(self) -> int:
+        """Number of jobs that can be started right away"""
+        return self.max_workers - len(self.active_jobs)
+
+    @property
+    def available_queue_slots(self) -> int:
+        """Number of jobs that can be queued before the queue full policy kicks in"""
+        if self.jobs_queue.maxsize <= 0:
+            return -1
+        return self.jobs_queue.maxsize - self.jobs_queue.qsize()
+
+    @property
+    def is_saturated(self) -> bool:
+        return self.jobs_queue.full()
+
+    def get_capacity_metrics(self) -> dict[str, int]:
+        return {
+            "max_concurrent_jobs": self.max_workers,
+            "available_job_slots": self.available_job_slots,
+            "max_queued_jobs": self.jobs_queue.maxsize,
+            "available_queue_slots": self.available_queue_slots,
+            "saturated": int(self.is_saturated),
+        }
+
+    async def _enqueue_job(self, job: WorkflowJob) -> bool:
+        """Queue a job according to the queue full policy. Returns False if the job was rejected."""
+        if self.queue_full_policy == QueueFullPolicy.BLOCK:
+            await self.jobs_queue.put(job)
+            return True
+
+        try:
+            self.jobs_queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.queue_full_policy == QueueFullPolicy.SHED_OLDEST:
+            try:
+                oldest = self.jobs_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                oldest = None
+            if oldest is not None:
+                logger.warning(f"Jobs queue full, shedding oldest job {oldest.run_id}")
+                await self._reject_job(oldest)
+            self.jobs_queue.put_nowait(job)
+            return True
+
+        logger.warning(f"Jobs queue full, rejecting job {job.run_id}")
+        await self._reject_job(job)
+        return False
+
+    async def _reject_job(self, job: WorkflowJob) -> None:
+        """Report a job that was not accepted by the worker and tell the gateway the worker is busy"""
+        error = AgentifyMeError(
+            message=f"Worker {self.worker_id} is saturated, workflow {job.run_id} was not accepted",
+            error_code="WORKER_SATURATED",
+            category=ErrorCategory.RESOURCE,
+            severity=ErrorSeverity.ERROR,
+        )
+        self.callback_handler.fire_event(
+            "workflow.execution",
+            "finished",
+            {
+                "name": job.workflow_name,
+                "request.id": job.run_id,
+                "timestamp": int(datetime.now().timestamp() * 1_000_000),
+                "error": error.as_dict,
+            },
+        )
+
+        if not self.connected or self._stream is None:
+            return
+
+        _msg = pb.InboundWorkerMessage(
+            msg_id=get_message_id(),
+            worker_id=self.worker_id,
+            deployment_id=self.deployment_id,
+            type=pb.INBOUND_WORKER_MESSAGE_TYPE_WORKER_STATUS,
+            timestamp=get_timestamp(),
+            worker_status=pb.WorkerStatus(
+                state=pb.WORKER_STATE_BUSY,
+                active_tasks=len(self.active_jobs),
+            ),
+        )
+        await self._stream.write(_msg)
+
     # async def _handle_run_command(self, msg: pb.OutboundWorkerMessage, command: pb.WorkflowCommand) -> None:
     #     """Handle run workflow commands"""
     #     carrier: dict[str, str] = getattr(msg, "metadata", {})
@@ -416,7 +564,8 @@ class WorkerService:
                 return pb.RuntimeEventStage.RUNTIME_EVENT_STAGE_INITIATED
             case "finished":
                 return pb.RuntimeEventStage.RUNTIME_EVENT_STAGE_FINISHED
-            case "started":
+            case "started" | "chunk":
+                # chunks of a streaming workflow are marked with a stream.chunk_index metadata entry
                 return pb.RuntimeEventStage.RUNTIME_EVENT_STAGE_STARTED
             case "completed":
                 return pb.RuntimeEventStage.RUNTIME_EVENT_STAGE_COMPLETED
@@ -439,107 +588,175 @@ class WorkerService:
                 error_type=error.get("error_type"),
             )
 
-    async def _send_events(self) -> None:
-        while not self.shutdown_event.is_set():
-            try:
-                if not self.connected or self._stream is None or self.events_queue.empty():
-                    await asyncio.sleep(1)
-                    continue
-
-                event = await self.events_queue.get()
-                try:
-                    if isinstance(event, dict):
-                        metadata = {}
-                        metadata["project.id"] = self.project_id
-                        metadata["deployment.id"] = self.deployment_id
-                        metadata["worker.id"] = self.worker_id
-
-                        event_stage = event.get("event_stage")
-
-                        runtime_event = pb.RuntimeEvent(
-                            event_type=self.get_event_type(event.get("event_type")),
-                            event_stage=self.get_event_stage(event_stage),
-                            event_name=event.get("event_name"),
-                            timestamp=event.get("timestamp"),
-                            event_id=event.get("step_id"),
-                            parent_event_id=event.get("parent_id"),
-                            run_id=event.get("run_id", "UNKNOWN"),
-                            request_id=event.get("request.id", "UNKNOWN"),
-                            idempotency_key=event.get("idempotency_key", "UNKNOWN"),
-                            status=pb.RuntimeEventStatus.RUNTIME_EVENT_STATUS_SUCCESS,
-                            retry_attempt=event.get("retry_attempt", 0),
-                            metadata=metadata,
-                            error=self._get_error(event),
-                        )
-
-                        if "input" in event:
-                            input_data = event.get("input")
-                            if isinstance(input_data, dict) or isinstance(input_data, BaseModel):
-                                struct = struct_pb2.Struct()
-                                struct.update(convert_for_protobuf(input_data))
-                                runtime_event.input_data_format = pb.DATA_FORMAT_STRUCT
-                                runtime_event.struct_input = struct
-                            elif isinstance(input_data, bytes):
-                                runtime_event.input_data_format = pb.DATA_FORMAT_BINARY
-                                runtime_event.binary_input = input_data
-                            elif isinstance(input_data, str):
-                                runtime_event.input_data_format = pb.DATA_FORMAT_STRING
-                                runtime_event.string_input = input_data
-                            else:
-                                logger.error(f"Received unexpected input type: {type(input_data)}")
-
-                        if "output" in event:
-                            output_data = event.get("output")
-                            if isinstance(output_data, dict) or isinstance(output_data, BaseModel):
-                                struct = struct_pb2.Struct()
-                                struct.update(convert_for_protobuf(output_data))
-                                runtime_event.output_data_format = pb.DATA_FORMAT_STRUCT
-                                runtime_event.struct_output = struct
-                            elif isinstance(output_data, bytes):
-                                runtime_event.output_data_format = pb.DATA_FORMAT_BINARY
-                                runtime_event.binary_output = output_data
-                            elif isinstance(output_data, str):
-                                runtime_event.output_data_format = pb.DATA_FORMAT_STRING
-                                runtime_event.string_output = output_data
-                            else:
-                                logger.error(f"Received unexpected output type: {type(output_data)}")
-
-                        msg = pb.InboundWorkerMessage(
-                            msg_id=get_message_id(),
-                            worker_id=self.worker_id,
-                            deployment_id=self.deployment_id,
-                            type=pb.INBOUND_WORKER_MESSAGE_TYPE_RUNTIME_EVENT,
-                            event=runtime_event,
-                            metadata=metadata,
-                        )
+    def _next_sequence(self, event: dict) -> int:
+        """Number the events of a run in the order they are sent, starting at 1"""
+        run_id = event.get("request.id", "UNKNOWN")
+        # re-inserting keeps the most recently active runs last
+        sequence = self._run_sequences.pop(run_id, 0) + 1
+        if not (event.get("event_type") == "workflow" and event.get("event_stage") == "finished"):
+            self._run_sequences[run_id] = sequence
+            if len(self._run_sequences) > self.MAX_TRACKED_RUNS:
+                del self._run_sequences[next(iter(self._run_sequences))]
+        return sequence
+
+    def _offload_payload(self, data: Any) -> Any:
+        """Replace a bytes or string payload above the inline threshold with a reference to its blob"""
+        if self.payload_offloader is None:
+            return data
+        ref = self.payload_offloader.offload(data)
+        if isinstance(ref, BlobRef):
+            return ref.as_dict()
+        return ref
+
+    def _encode_struct(self, data: dict | BaseModel) -> struct_pb2.Struct:
+        """Encode a payload, replaced by a reference to its blob if its encoding is above the inline threshold"""
+        struct = to_struct(data)
+        if self.payload_offloader is None or struct.ByteSize() <= self.payload_offloader.inline_threshold:
+            return struct
+        # only payloads too large to send inline are serialized again, for their blob
+        ref = self.payload_offloader.put(data)
+        return struct if ref is None else to_struct(ref.as_dict())
+
+    def _encode_event_input(self, event: dict, input_data: dict | BaseModel) -> struct_pb2.Struct:
+        """Encode an event's input, reusing the encoding from the initiated event on the finished one"""
+        key = (event.get("request.id"), event.get("step_id"))
+        stage = event.get("event_stage")
+
+        if stage == "finished":
+            cached = self._encoded_inputs.pop(key, None)
+            if cached is not None and cached[0] is input_data:
+                return cached[1]
+
+        struct = self._encode_struct(input_data)
+        if stage == "initiated":
+            self._encoded_inputs[key] = (input_data, struct)
+            if len(self._encoded_inputs) > self.MAX_ENCODED_INPUTS:
+                # drop the oldest, e.g. for runs whose finished event never arrived
+                del self._encoded_inputs[next(iter(self._encoded_inputs))]
+        return struct
+
+    def _build_event_message(self, event: Any) -> pb.InboundWorkerMessage | None:
+        """Convert a callback event into a runtime event message for the worker stream"""
+        if not isinstance(event, dict):
+            logger.debug(f"Received unexpected event type: {type(event)}")
+            return None
+
+        metadata = {}
+        metadata["project.id"] = self.project_id
+        metadata["deployment.id"] = self.deployment_id
+        metadata["worker.id"] = self.worker_id
+
+        event_stage = event.get("event_stage")
+
+        runtime_event = pb.RuntimeEvent(
+            event_type=self.get_event_type(event.get("event_type")),
+            event_stage=self.get_event_stage(event_stage),
+            event_name=event.get("event_name"),
+            timestamp=event.get("timestamp"),
+            event_id=event.get("step_id"),
+            parent_event_id=event.get("parent_id"),
+            run_id=event.get("run_id", "UNKNOWN"),
+            request_id=event.get("request.id", "UNKNOWN"),
+            idempotency_key=event.get("idempotency_key", "UNKNOWN"),
+            status=pb.RuntimeEventStatus.RUNTIME_EVENT_STATUS_SUCCESS,
+            retry_attempt=event.get("retry_attempt", 0),
+            metadata=metadata,
+            error=self._get_error(event),
+        )
+        runtime_event.metadata["event.sequence"] = str(self._next_sequence(event))
+        if "chunk_index" in event:
+            runtime_event.metadata["stream.chunk_index"] = str(event["chunk_index"])
+
+        if "input" in event:
+            input_data = event.get("input")
+            if isinstance(input_data, (bytes, str)):
+                input_data = self._offload_payload(input_data)
+            if isinstance(input_data, dict) or isinstance(input_data, BaseModel):
+                runtime_event.input_data_format = pb.DATA_FORMAT_STRUCT
+                runtime_event.struct_input.CopyFrom(self._encode_event_input(event, input_data))
+            elif isinstance(input_data, bytes):
+                runtime_event.input_data_format = pb.DATA_FORMAT_BINARY
+                runtime_event.binary_input = input_data
+            elif isinstance(input_data, str):
+                runtime_event.input_data_format = pb.DATA_FORMAT_STRING
+                runtime_event.string_input = input_data
+            else:
+                logger.error(f"Received unexpected input type: {type(input_data)}")
+
+        if "output" in event:
+            output_data = event.get("output")
+            if isinstance(output_data, (bytes, str)):
+                output_data = self._offload_payload(output_data)
+            if isinstance(output_data, dict) or isinstance(output_data, BaseModel):
+                runtime_event.output_data_format = pb.DATA_FORMAT_STRUCT
+                runtime_event.struct_output.CopyFrom(self._encode_struct(output_data))
+            elif isinstance(output_data, bytes):
+                runtime_event.output_data_format = pb.DATA_FORMAT_BINARY
+                runtime_event.binary_output = output_data
+            elif isinstance(output_data, str):
+                runtime_event.output_data_format = pb.DATA_FORMAT_STRING
+                runtime_event.string_output = output_data
+            else:
+                logger.error(f"Received unexpected output type: {type(output_data)}")
+
+        return pb.InboundWorkerMessage(
+            msg_id=get_message_id(),
+            worker_id=self.worker_id,
+            deployment_id=self.deployment_id,
+            type=pb.INBOUND_WORKER_MESSAGE_TYPE_RUNTIME_EVENT,
+            event=runtime_event,
+            metadata=metadata,
+        )
 
-                        await self._stream.write(msg)
+    async def _wait_for_stream(self) -> StreamStreamCall | None:
+        """Wait until the worker is connected and return the active stream"""
+        while not (self.connected and self._stream is not None):
+            if self.shutdown_event.is_set():
+                return None
+            if self.connection_event.is_set():
+                # Stale connection event from a stream that has since dropped
+                self.connection_event.clear()
+            try:
+                await asyncio.wait_for(self.connection_event.wait(), timeout=1.0)
+            except TimeoutError:
+                pass
+        return self._stream
 
-                    else:
-                        logger.debug(f"Received unexpected event type: {type(event)}")
+    def _mark_disconnected(self) -> None:
+        self.connected = False
+        self.connection_event.clear()
 
-                except grpc.aio.AioRpcError as e:
-                    logger.error(f"Stream error in send_events: {e}")
-                    self.connected = False  # Mark as disconnected on error
-                    # Put the event back in the queue
-                    await self.events_queue.put(event)
-                    continue
+    async def _send_events(self) -> None:
+        while not self.shutdown_event.is_set():
+            try:
+                await self.event_sender.run(self._wait_for_stream, self.shutdown_event)
 
-                except Exception as e:
-                    traceback.print_exc()
-                    logger.error(f"Error processing event: {e}")
-                    continue
+            except grpc.aio.AioRpcError as e:
+                # Unsent events are kept by the sender and retried once reconnected
+                logger.error(f"Stream error in send_events: {e}")
+                self._mark_disconnected()
 
-            except queue.Empty:
-                pass
+            except Exception as e:
+                traceback.print_exc()
+                logger.error(f"Error processing event: {e}")
+                await asyncio.sleep(1)
 
     async def process_jobs(self) -> None:
         """Process jobs from the queue"""
+        logger.info("Processing jobs from queue")
         while not self.shutdown_event.is_set():
-            logger.info("Processing jobs from queue")
             try:
-                job = await self.jobs_queue.get()
-                asyncio.create_task(self._handle_job(job))
+                # Only take a job off the queue once there is a free slot to run it, so that
+                # pending work stays bounded by the jobs queue instead of piling up as tasks.
+                await self.job_semaphore.acquire()
+                try:
+                    job = await self.jobs_queue.get()
+                except BaseException:
+                    self.job_semaphore.release()
+                    raise
+
+                task = asyncio.create_task(self._handle_job(job))
+                task.add_done_callback(lambda _: self.job_semaphore.release())
             except Exception as e:
                 logger.error(f"Error processing task: {e}")
                 await asyncio.sleep(1)
@@ -594,18 +811,22 @@ class WorkerService:
                                 raise Exception(f"Workflow handler not found for {job.workflow_name}")
 
                             logger.info(f"Workflow {job.run_id} executing")
-                            job = await _workflow_handler(job)
+                            # task outputs are journaled, so a retry of this run replays the tasks that completed
+                            with checkpointed_run(job.run_id, self.checkpoint_store) as journal:
+                                job = await _workflow_handler(job, on_chunk=self._chunk_forwarder(attributes))
+                            if journal is not None:
+                                span.set_attributes({"checkpoint.replayed": journal.replayed, "checkpoint.recorded": journal.recorded})
+                                if job.success:
+                                    await asyncio.to_thread(self.checkpoint_store.clear, job.run_id)
 
                             logger.info(f"SUCCESS ==> Workflow {job.run_id} result: {job.output}, job.success: {job.success}")
 
-                            span.add_event(
-                                "job_completed",
-                                attributes={
-                                    "request.id": job.run_id,
-                                    "output": orjson.dumps(job.output),
-                                    "success": job.success,
-                                },
-                            )
+                            if span.is_recording():
+                                completed_attributes = {"request.id": job.run_id, "success": job.success}
+                                capture_policy = get_capture_policy()
+                                if capture_policy.captures(span, failed=not job.success):
+                                    completed_attributes.update(capture_policy.attributes("output", job.output))
+                                span.add_event("job_completed", attributes=completed_attributes)
 
                             if job.success:
                                 span.set_status(StatusCode.OK)
@@ -616,8 +837,9 @@ class WorkerService:
                             # Send event
                             # await self.events_queue.put(job)
 
-                            # If the job is completed, break out of the loop.
-                            # TODO: Handle errors and retry scenario.
+                            # If the job is completed, break out of the loop. A failed run isn't retried
+                            # here: the gateway retries it by sending the job again with the same run_id,
+                            # and the checkpoint journal replays the tasks that completed before the failure.
                             if job.completed:
                                 break
 
@@ -661,7 +883,7 @@ class WorkerService:
                 raise
             except Exception as e:
                 logger.error(f"Workflow execution error: {e}, {type(e)}")
-                await self.events_queue.put({"workflow_id": job.run_id, "status": "error", "error": str(e)})
+                self.enqueue_event({"workflow_id": job.run_id, "status": "error", "error": str(e)})
 
     @asynccontextmanager
     async def _workflow_context(self, run_id: str):
@@ -686,12 +908,14 @@ class WorkerService:
                     metrics = {
                         "num_active_jobs": len(self.active_jobs),
                         "num_jobs_in_queue": self.jobs_queue.qsize(),
-                        "num_events_in_queue": self.events_queue.qsize(),
+                        "num_events_in_queue": self.event_sender.queue_depth,
+                        **self.event_sender.get_metrics(),
+                        **self.get_capacity_metrics(),
                     }
                     heartbeat_msg = pb.WorkerHeartbeatRequest(
                         worker_id=self.worker_id,
                         deployment_id=self.deployment_id,
-                        status="active",
+                        status="busy" if self.is_saturated else "active",
                         metrics=metrics,
                     )
                     _ = await self._stub.WorkerHeartbeat(heartbeat_msg)
@@ -731,19 +955,13 @@ class WorkerService:
         self.connected = False
         self.connection_event.clear()
 
-        # Clear queues
+        # Clear queued jobs, events are kept and sent once reconnected
         while not self.jobs_queue.empty():
             try:
                 self.jobs_queue.get_nowait()
             except asyncio.QueueEmpty:
                 break
 
-        while not self.events_queue.empty():
-            try:
-                self.events_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-
         # Cancel active jobs
         for job_id, task in list(self.active_jobs.items()):
             logger.info(f"Cancelling job {job_id} due to disconnect")
@@ -765,7 +983,7 @@ class WorkerService:
         _workflow_handlers = {}
         for workflow_name in WorkflowConfig.get_all():
             _workflow = WorkflowConfig.get(workflow_name)
-            _workflow_handler = WorkflowHandler(_workflow)
+            _workflow_handler = WorkflowHandler(_workflow, self.workflow_executor)
             _workflow_handlers[workflow_name] = _workflow_handler
 
         return _workflow_handlers
@@ -797,6 +1015,56 @@ class WorkerService:
     async def stream_events(self, data: dict):
         await self.events_queue.put(data)
 
+    def _chunk_forwarder(self, attributes: dict) -> Callable[[int, Any], Awaitable[None]]:
+        """Send each chunk of a streaming workflow as its own runtime event"""
+
+        async def forward(index: int, chunk: Any) -> None:
+            self.callback_handler.fire_event("workflow.execution", "chunk", {**attributes, "chunk_index": index, "output": chunk})
+            await self._wait_for_event_capacity()
+
+        return forward
+
+    async def _wait_for_event_capacity(self) -> None:
+        """Flow control for streamed chunks: wait while sent events back up behind the stream"""
+        if self._overflow_task is not None and not self._overflow_task.done():
+            await asyncio.shield(self._overflow_task)
+
+        limit = self.events_queue.maxsize
+        while self.event_sender.spool is not None and limit and self.event_sender.queue_depth >= limit and not self.shutdown_event.is_set():
+            await asyncio.sleep(0.01)
+
+    def enqueue_event(self, data: dict) -> None:
+        """Queue a callback event for the worker stream, keeping the order events are fired in"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is not self._event_loop:
+            # fired from a workflow thread
+            self._event_loop.call_soon_threadsafe(self.enqueue_event, data)
+            return
+
+        if self.event_sender.spool is not None:
+            self.event_sender.append(data)
+            return
+
+        if not self._overflow_events:
+            try:
+                self.events_queue.put_nowait(data)
+                return
+            except asyncio.QueueFull:
+                pass
+
+        # the queue is full: wait for space in the background, behind earlier overflow
+        self._overflow_events.append(data)
+        if self._overflow_task is None or self._overflow_task.done():
+            self._overflow_task = asyncio.create_task(self._drain_overflow_events())
+
+    async def _drain_overflow_events(self) -> None:
+        while self._overflow_events:
+            await self.events_queue.put(self._overflow_events[0])
+            self._overflow_events.popleft()
+
     async def _process_callback_events(self):
         """Process jobs from the queue"""
         while not self.shutdown_event.is_set():
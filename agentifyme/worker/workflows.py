@@ -1,21 +1,36 @@
 import asyncio
 import os
+import traceback
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
 from contextvars import ContextVar
-from typing import Any, TypeVar, get_type_hints
+from typing import Any, TypeVar, get_args, get_origin
 
 import orjson
 from grpc.aio import StreamStreamCall
 from loguru import logger
-from opentelemetry import trace
+from opentelemetry import propagate, trace
+from opentelemetry.context import attach, detach
 from opentelemetry.trace import Status, StatusCode
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 from pydantic import BaseModel
 
 import agentifyme.worker.pb.api.v1.gateway_pb2_grpc as pb_grpc
-from agentifyme.components.workflow import Workflow, WorkflowConfig
-from agentifyme.errors import AgentifyMeError, ErrorContext
+from agentifyme.components.workflow import ExecutionMode, Workflow, WorkflowConfig
+from agentifyme.errors import (
+    AgentifyMeError,
+    ErrorCategory,
+    ErrorContext,
+    ErrorSeverity,
+)
 from agentifyme.worker.context import trace_id, workflow_name, workflow_run_id
-from agentifyme.worker.helpers import build_args_from_signature
+from agentifyme.worker.executors import WorkflowExecutor
+from agentifyme.worker.telemetry.capture import get_capture_policy
 
 Input = TypeVar("Input")
 Output = TypeVar("Output")
@@ -45,32 +60,120 @@ class WorkflowJob:
         self.output = None
 
 
-class WorkflowHandler:
-    def __init__(self, workflow: Workflow):
-        self.workflow = workflow
-        self._propagator = TraceContextTextMapPropagator()
-
-    def _process_output(self, result: Any, return_type: type) -> dict[str, Any]:
-        """Process workflow output to ensure it's a valid JSON-serializable dictionary"""
-        if isinstance(result, BaseModel):
-            return result.model_dump()
-
-        if isinstance(result, dict):
-            if hasattr(return_type, "model_validate"):
-                validated = return_type.model_validate(result)
-                return validated.model_dump()
-            return result
-        if isinstance(result, str):
-            return result
+def process_output(result: Any, return_type: type) -> dict[str, Any]:
+    """Process workflow output to ensure it's a valid JSON-serializable dictionary"""
+    if isinstance(result, BaseModel):
+        return result.model_dump()
 
+    if isinstance(result, dict):
         if hasattr(return_type, "model_validate"):
             validated = return_type.model_validate(result)
             return validated.model_dump()
+        return result
+    if isinstance(result, str):
+        return result
+
+    if hasattr(return_type, "model_validate"):
+        validated = return_type.model_validate(result)
+        return validated.model_dump()
+
+    raise ValueError(f"Unsupported output type: {type(result)}")
+
+
+def stream_item_type(return_type: Any) -> Any:
+    """Return the chunk type of a streaming workflow annotated as `AsyncIterator[T]` or similar."""
+    if get_origin(return_type) in (AsyncIterator, AsyncIterable, AsyncGenerator):
+        return get_args(return_type)[0]
+    return None
+
+
+def aggregate_chunks(chunks: list[Any]) -> str | dict[str, Any]:
+    """Combine the chunks of a streaming workflow into its final output."""
+    if all(isinstance(chunk, str) for chunk in chunks):
+        return "".join(chunks)
+    return {"chunks": chunks}
+
 
-        raise ValueError(f"Unsupported output type: {type(result)}")
+def run_workflow_in_process(name: str, input_json: bytes, carrier: dict[str, str] | None = None) -> bytes:
+    """Run a synchronous workflow inside a pool process.
 
-    async def __call__(self, job: WorkflowJob) -> WorkflowJob:
-        """Handle workflow execution with serialization/deserialization"""
+    Inputs and outputs are exchanged as orjson encoded bytes, errors are returned
+    in the same envelope instead of being pickled across the process boundary.
+    `carrier` holds the caller's trace context and baggage, like the run id, so the
+    spans and callback events of the workflow belong to the caller's run.
+    """
+    token = attach(propagate.extract(carrier)) if carrier else None
+    try:
+        _workflow = WorkflowConfig.get(name)
+        argument_plan = _workflow.config.argument_plan
+        func_args = argument_plan.build(orjson.loads(input_json))
+        result = _workflow.run(**func_args)
+        output_data = process_output(result, argument_plan.return_type)
+        return orjson.dumps({"status": "success", "data": output_data})
+    except AgentifyMeError as e:
+        return orjson.dumps({"status": "error", "error": e.as_dict})
+    except Exception as e:
+        error_dict = {"message": str(e), "error_type": type(e).__name__, "traceback": traceback.format_exc()}
+        return orjson.dumps({"status": "error", "error": error_dict})
+    finally:
+        if token is not None:
+            detach(token)
+
+
+# Called with the index and processed value of each chunk of a streaming workflow
+ChunkCallback = Callable[[int, Any], Awaitable[None]]
+
+
+class WorkflowHandler:
+    def __init__(self, workflow: Workflow, executor: WorkflowExecutor | None = None):
+        self.workflow = workflow
+        self.executor = executor
+        self._propagator = TraceContextTextMapPropagator()
+
+    def _process_output(self, result: Any, return_type: type) -> dict[str, Any]:
+        """Process workflow output to ensure it's a valid JSON-serializable dictionary"""
+        return process_output(result, return_type)
+
+    @property
+    def execution_mode(self) -> ExecutionMode:
+        if self.executor is None or self.workflow.config.is_async:
+            return ExecutionMode.INLINE
+        return self.workflow.config.execution_mode
+
+    async def _run_in_process(self, job: WorkflowJob) -> Any:
+        carrier: dict[str, str] = {}
+        propagate.inject(carrier)
+        payload = orjson.loads(await self.executor.run_in_process(run_workflow_in_process, job.workflow_name, orjson.dumps(job.input_parameters), carrier))
+        if payload["status"] == "error":
+            error = payload["error"]
+            raise AgentifyMeError(
+                message=error.get("message", ""),
+                error_code=error.get("error_code"),
+                category=ErrorCategory(error["category"]) if error.get("category") else None,
+                severity=ErrorSeverity(error["severity"]) if error.get("severity") else ErrorSeverity.ERROR,
+                context=ErrorContext(component_type="workflow", component_id=job.workflow_name),
+                error_type=error.get("error_type") or "AgentifyMeError",
+                tb=error.get("traceback"),
+            )
+        return payload["data"]
+
+    async def _run_streaming(self, func_args: dict[str, Any], return_type: Any, on_chunk: ChunkCallback | None) -> tuple[Any, int]:
+        """Forward each chunk of a streaming workflow as it is produced, returning the aggregate and chunk count"""
+        chunk_type = stream_item_type(return_type)
+        chunks = []
+        async for item in self.workflow.astream(**func_args):
+            chunk = process_output(item, chunk_type)
+            if on_chunk is not None:
+                # awaiting lets the caller hold the workflow back while its chunks are sent
+                await on_chunk(len(chunks), chunk)
+            chunks.append(chunk)
+        return aggregate_chunks(chunks), len(chunks)
+
+    async def __call__(self, job: WorkflowJob, on_chunk: ChunkCallback | None = None) -> WorkflowJob:
+        """Handle workflow execution with serialization/deserialization
+
+        Streaming workflows call `on_chunk` for every chunk and set the combined chunks as the output.
+        """
         with tracer.start_as_current_span("workflow_execution") as span:
             try:
                 # Get workflow configuration
@@ -82,34 +185,47 @@ class WorkflowHandler:
                 workflow_name.set(job.workflow_name)
                 trace_id.set(format(span.get_span_context().trace_id, "032x"))
 
-                func_args = build_args_from_signature(_workflow_config.func, job.input_parameters)
-
                 # Log input
-                span.add_event(
-                    name="workflow.input",
-                    attributes={"input": orjson.dumps(job.input_parameters).decode()},
-                )
+                capture_policy = get_capture_policy()
+                if span.is_recording() and capture_policy.should_capture(span):
+                    span.add_event(name="workflow.input", attributes=capture_policy.attributes("input", job.input_parameters))
 
-                logger.info(f"Executing workflow {job.run_id} with input: {func_args}")
-                # Execute workflow
-                if asyncio.iscoroutinefunction(_workflow_config.func):
-                    result = await self.workflow.arun(**func_args)
-                else:
-                    result = self.workflow.run(**func_args)
+                execution_mode = self.execution_mode
+                span.set_attribute("workflow.execution_mode", execution_mode.value)
 
-                # Get return type and process output
-                return_type = get_type_hints(_workflow_config.func).get("return")
-                output_data = self._process_output(result, return_type)
+                if execution_mode == ExecutionMode.PROCESS:
+                    # Arguments are built and the output processed inside the pool process
+                    logger.info(f"Executing workflow {job.run_id} in process pool with input: {job.input_parameters}")
+                    output_data = await self._run_in_process(job)
+                else:
+                    argument_plan = _workflow_config.argument_plan
+                    func_args = argument_plan.build(job.input_parameters)
+
+                    logger.info(f"Executing workflow {job.run_id} with input: {func_args}")
+                    # Execute workflow
+                    if _workflow_config.is_streaming:
+                        output_data, num_chunks = await self._run_streaming(func_args, argument_plan.return_type, on_chunk)
+                        span.set_attribute("workflow.stream_chunks", num_chunks)
+                    else:
+                        if asyncio.iscoroutinefunction(_workflow_config.func):
+                            result = await self.workflow.arun(**func_args)
+                        elif execution_mode == ExecutionMode.THREAD:
+                            result = await self.executor.run_in_thread(self.workflow.run, **func_args)
+                        else:
+                            result = self.workflow.run(**func_args)
+
+                        # Process output
+                        output_data = self._process_output(result, argument_plan.return_type)
 
                 # Verify JSON serializable
-                orjson.dumps(output_data)  # Will raise TypeError if not serializable
+                output_size = len(orjson.dumps(output_data))  # Will raise TypeError if not serializable
 
                 job.output = output_data
                 job.success = True
 
                 # Record success
                 span.set_status(Status(StatusCode.OK))
-                span.add_event(name="workflow.complete", attributes={"output_size": len(str(output_data))})
+                span.add_event(name="workflow.complete", attributes={"output_size": output_size})
 
             except AgentifyMeError as e:
                 logger.error(f"AgentifyMeError: {e.message}")
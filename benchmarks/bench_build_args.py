@@ -0,0 +1,98 @@
+"""Benchmark building workflow arguments from request input.
+
+Compares the per-call overhead of introspecting the workflow function on every
+request (`inspect.signature` + `get_type_hints`, as `build_args_from_signature`
+used to do) with applying the precomputed `ArgumentPlan`, for a typical
+workflow taking a pydantic model plus a few scalar and optional parameters.
+
+Usage:
+    python benchmarks/bench_build_args.py [--iterations 100000]
+"""
+
+import argparse
+import time
+from inspect import signature
+from typing import Any, get_type_hints
+
+from pydantic import BaseModel
+
+from agentifyme.components.arguments import compile_converter, get_argument_plan
+from agentifyme.worker.helpers import build_args_from_signature
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    zip_code: str
+
+
+class Customer(BaseModel):
+    name: str
+    email: str
+    address: Address
+    tags: list[str] = []
+
+
+def onboard_customer(customer: Customer, plan: str, seats: int, discount: float | None = None, notes: str = "") -> dict:
+    return {}
+
+
+INPUT = {
+    "customer": {
+        "name": "Ada Lovelace",
+        "email": "ada@example.com",
+        "address": {"street": "1 Analytical Way", "city": "London", "zip_code": "N1"},
+        "tags": ["vip", "beta"],
+    },
+    "plan": "enterprise",
+    "seats": "25",
+    "discount": 0.1,
+}
+
+
+def introspect_per_call(func: Any, input_dict: dict[str, Any]) -> dict[str, Any]:
+    """What every request paid before argument plans: introspection plus conversion."""
+    sig = signature(func)
+    type_hints = get_type_hints(func)
+    type_hints.pop("return", None)
+    args = {}
+    for param_name, param in sig.parameters.items():
+        param_type = type_hints.get(param_name)
+        if not param_type or (param_name not in input_dict and param.default is not param.empty):
+            continue
+        value = input_dict.get(param_name)
+        if value is None:
+            args[param_name] = None
+            continue
+        args[param_name] = compile_converter(param_type)(value)
+    return args
+
+
+def bench(label: str, fn: Any, iterations: int) -> float:
+    for _ in range(min(1000, iterations)):
+        fn(onboard_customer, INPUT)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(onboard_customer, INPUT)
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{label:<32} {per_call_us:8.2f} us/call")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    plan = get_argument_plan(onboard_customer)
+    assert plan.build(INPUT) == introspect_per_call(onboard_customer, INPUT)
+
+    before = bench("introspect per call", introspect_per_call, args.iterations)
+    after = bench("build_args_from_signature", build_args_from_signature, args.iterations)
+    bench("ArgumentPlan.build", lambda _, input_dict: plan.build(input_dict), args.iterations)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark callback dispatch in `CallbackHandler`.
+
+Fires task events through `fire_event` from inside a running event loop, as the
+instrumented tasks and workflows do, and reports events per second with sync-only,
+async-only and mixed callbacks registered.
+
+Usage:
+    python benchmarks/bench_callbacks.py [--events 200000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from agentifyme.worker.callback import CallbackHandler
+
+
+def make_handler(sync_callbacks: int, async_callbacks: int) -> tuple[CallbackHandler, list[int]]:
+    handler = CallbackHandler()
+    received = [0]
+
+    def on_event(data: dict) -> None:
+        received[0] += 1
+
+    async def on_event_async(data: dict) -> None:
+        received[0] += 1
+
+    for _ in range(sync_callbacks):
+        handler.register_default(on_event)
+    for _ in range(async_callbacks):
+        handler.register("task", on_event_async, "completed")
+    return handler, received
+
+
+async def run_case(sync_callbacks: int, async_callbacks: int, num_events: int) -> float:
+    handler, received = make_handler(sync_callbacks, async_callbacks)
+    expected = num_events * (sync_callbacks + async_callbacks)
+    data = {"name": "summarize", "request.id": "run_1", "input": {"text": "lorem ipsum"}}
+
+    start = time.perf_counter()
+    for i in range(num_events):
+        handler.fire_event("task.run", "completed", data)
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    while received[0] < expected:
+        await asyncio.sleep(0)
+    return num_events / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'callbacks':<20} {'events/s':>12}")
+    for label, sync_callbacks, async_callbacks in [("1 sync", 1, 0), ("1 async", 0, 1), ("2 sync + 1 async", 2, 1)]:
+        rate = await run_case(sync_callbacks, async_callbacks, args.events)
+        print(f"{label:<20} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
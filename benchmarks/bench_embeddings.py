@@ -0,0 +1,74 @@
+"""Benchmark `EmbeddingModel.arun_batch` against a simulated embeddings API.
+
+The API answers each request after a fixed latency plus a per-text cost, with
+base64 encoded float32 vectors like the OpenAI API. Reports documents per second
+for one request at a time, concurrent requests, and a corpus with duplicates.
+
+Usage:
+    python benchmarks/bench_embeddings.py [--docs 100000] [--latency 0.2] [--dimensions 1536]
+"""
+
+import argparse
+import asyncio
+import base64
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from agentifyme.ml.embedding.embeddings import OpenAIEmbeddingModel
+from agentifyme.ml.embedding.providers import EmbeddingModelType
+
+
+class SimulatedEmbeddings:
+    def __init__(self, latency: float, per_text: float, dimensions: int):
+        self.latency = latency
+        self.per_text = per_text
+        self.vector = base64.b64encode(np.random.default_rng(0).random(dimensions, dtype=np.float32).tobytes()).decode()
+
+    async def create(self, input, model, dimensions, encoding_format):
+        await asyncio.sleep(self.latency + self.per_text * len(input))
+        return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=self.vector) for i in range(len(input))])
+
+
+async def run_case(texts: list[str], args: argparse.Namespace, max_concurrency: int) -> float:
+    model = OpenAIEmbeddingModel(
+        EmbeddingModelType.OPENAI_TEXT_EMBEDDING_3_SMALL,
+        api_key="benchmark",
+        max_batch_size=args.batch_size,
+        max_concurrency=max_concurrency,
+    )
+    model.async_client = SimpleNamespace(embeddings=SimulatedEmbeddings(args.latency, args.per_text, args.dimensions))
+
+    start = time.perf_counter()
+    matrix = await model.arun_batch(texts)
+    elapsed = time.perf_counter() - start
+    assert matrix.shape == (len(texts), args.dimensions)
+    return len(texts) / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per request")
+    parser.add_argument("--per-text", type=float, default=0.0002, help="seconds per text in a request")
+    args = parser.parse_args()
+
+    unique = [f"document {i} about topic {i % 97}" for i in range(args.docs)]
+    duplicated = [unique[i % (args.docs // 4)] for i in range(args.docs)]
+
+    print(f"{'case':<28} {'docs/s':>12}")
+    for label, texts, concurrency in [
+        ("sequential requests", unique, 1),
+        ("8 concurrent requests", unique, 8),
+        ("32 concurrent requests", unique, 32),
+        ("8 concurrent, 75% dupes", duplicated, 8),
+    ]:
+        rate = await run_case(texts, args, concurrency)
+        print(f"{label:<28} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
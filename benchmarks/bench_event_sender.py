@@ -0,0 +1,104 @@
+"""Benchmark the worker event sender.
+
+Pushes synthetic runtime events through `WorkerService` into a local fake
+`GatewayServiceStub` and reports throughput, batch sizes and flush latency.
+
+Usage:
+    python benchmarks/bench_event_sender.py [--events 100000] [--batch-size 100]
+"""
+
+import argparse
+import asyncio
+import time
+
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.worker_service import WorkerService
+
+
+class FakeWorkerStream:
+    def __init__(self):
+        self.count = 0
+        self.nbytes = 0
+
+    async def write(self, msg):
+        self.count += 1
+        self.nbytes += msg.ByteSize()
+
+
+class FakeGatewayServiceStub:
+    def __init__(self):
+        self.stream = FakeWorkerStream()
+
+    def WorkerStream(self):
+        return self.stream
+
+
+def synthetic_event(i: int) -> dict:
+    return {
+        "event_type": "task",
+        "event_stage": "completed",
+        "event_name": "task.run.completed",
+        "timestamp": int(time.time() * 1_000_000),
+        "step_id": f"{i:016x}",
+        "parent_id": "0" * 16,
+        "request.id": f"run_{i % 100}",
+        "name": "summarize",
+        "input": {"text": "lorem ipsum dolor sit amet", "max_words": 50, "tags": ["a", "b", "c"]},
+        "output": {"summary": "lorem ipsum", "score": 0.87},
+    }
+
+
+async def run_benchmark(num_events: int, batch_size: int, batch_delay: float) -> None:
+    stub = FakeGatewayServiceStub()
+    service = WorkerService(
+        stub,
+        CallbackHandler(),
+        api_gateway_url="localhost:0",
+        project_id="bench",
+        deployment_id="bench",
+        worker_id="bench",
+        event_batch_size=batch_size,
+        event_batch_delay=batch_delay,
+    )
+    service._stream = stub.WorkerStream()
+    service.connected = True
+    service.connection_event.set()
+
+    sender_task = asyncio.create_task(service._send_events())
+
+    start = time.perf_counter()
+    for i in range(num_events):
+        await service.stream_events(synthetic_event(i))
+        if i % 1000 == 0:
+            # let the sender interleave with the producer like it would under load
+            await asyncio.sleep(0)
+
+    while stub.stream.count < num_events:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+
+    service.shutdown_event.set()
+    await sender_task
+
+    metrics = service.event_sender.get_metrics()
+    print(f"events:            {num_events}")
+    print(f"batch size/delay:  {batch_size} / {batch_delay * 1000:.1f} ms")
+    print(f"elapsed:           {elapsed:.2f} s")
+    print(f"throughput:        {num_events / elapsed:,.0f} events/s")
+    print(f"bytes written:     {stub.stream.nbytes:,}")
+    print(f"batches:           {metrics['num_event_batches_sent']}")
+    print(f"avg batch size:    {num_events / max(metrics['num_event_batches_sent'], 1):.1f}")
+    print(f"last flush:        {metrics['last_event_flush_latency_ms']} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--batch-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.events, args.batch_size, args.batch_delay_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
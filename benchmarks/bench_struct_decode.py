@@ -0,0 +1,82 @@
+"""Benchmark decoding workflow request inputs.
+
+Compares `MessageToDict` (the previous `struct_to_dict`), the direct Struct walker
+now used by `struct_to_dict`, and the orjson-encoded `DATA_FORMAT_BINARY` path on
+nested payloads of roughly 1 KB, 100 KB and 5 MB.
+
+Usage:
+    python benchmarks/bench_struct_decode.py [--min-time 1.0]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import MessageToDict
+
+from agentifyme.worker.helpers import dict_to_struct, struct_to_dict
+
+SIZES = {"1KB": 1_000, "100KB": 100_000, "5MB": 5_000_000}
+
+
+def make_record(i: int) -> dict[str, Any]:
+    return {
+        "id": i,
+        "name": f"customer-{i}",
+        "active": i % 2 == 0,
+        "score": i * 0.37,
+        "tags": ["alpha", "beta", "gamma"],
+        "address": {"street": f"{i} Main St", "zip": 10_000 + i, "geo": {"lat": 40.7, "lng": -74.0}},
+        "notes": None,
+    }
+
+
+def make_payload(target_bytes: int) -> dict[str, Any]:
+    records = []
+    payload = {"request_id": "bench", "records": records}
+    record_size = len(orjson.dumps(make_record(0)))
+    for i in range(max(1, target_bytes // record_size)):
+        records.append(make_record(i))
+    return payload
+
+
+def bench(fn: Callable[[], Any], min_time: float) -> float:
+    """Return the mean seconds per call, running for at least `min_time` seconds."""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to run each case for")
+    args = parser.parse_args()
+
+    print(f"{'payload':<8} {'decoder':<16} {'ms/call':>10} {'MB/s':>10}")
+    for label, target in SIZES.items():
+        payload = make_payload(target)
+        json_bytes = orjson.dumps(payload)
+        struct: struct_pb2.Struct = dict_to_struct(payload)
+        assert struct_to_dict(struct) == payload
+
+        cases = {
+            "MessageToDict": lambda struct=struct: MessageToDict(struct),
+            "struct_to_dict": lambda struct=struct: struct_to_dict(struct),
+            "orjson (binary)": lambda json_bytes=json_bytes: orjson.loads(json_bytes),
+        }
+        for name, fn in cases.items():
+            seconds = bench(fn, args.min_time)
+            print(f"{label:<8} {name:<16} {seconds * 1000:>10.3f} {len(json_bytes) / seconds / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
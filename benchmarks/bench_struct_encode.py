@@ -0,0 +1,88 @@
+"""Benchmark encoding event payloads into protobuf Structs.
+
+Compares `Struct.update(convert_for_protobuf(data))`, which converts the payload and
+then walks the converted copy again, with the single pass `to_struct` on nested
+payloads of roughly 1 KB, 100 KB and 5 MB.
+
+Usage:
+    python benchmarks/bench_struct_encode.py [--min-time 1.0]
+"""
+
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import orjson
+from google.protobuf import struct_pb2
+
+from agentifyme.utilities.grpc import convert_for_protobuf, to_struct
+
+SIZES = {"1KB": 1_000, "100KB": 100_000, "5MB": 5_000_000}
+
+
+def make_record(i: int) -> dict[str, Any]:
+    return {
+        "id": i,
+        "uuid": uuid.UUID(int=i),
+        "name": f"customer-{i}",
+        "active": i % 2 == 0,
+        "score": i * 0.37,
+        "created_at": datetime(2024, 1, 1),
+        "tags": ["alpha", "beta", "gamma"],
+        "address": {"street": f"{i} Main St", "zip": 10_000 + i, "geo": {"lat": 40.7, "lng": -74.0}},
+        "notes": None,
+    }
+
+
+def make_payload(target_bytes: int) -> dict[str, Any]:
+    records = []
+    payload = {"request_id": "bench", "records": records}
+    record_size = len(orjson.dumps(make_record(0)))
+    for i in range(max(1, target_bytes // record_size)):
+        records.append(make_record(i))
+    return payload
+
+
+def bench(fn: Callable[[], Any], min_time: float) -> float:
+    """Return the mean seconds per call, running for at least `min_time` seconds."""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def update_converted(data: dict[str, Any]) -> struct_pb2.Struct:
+    struct = struct_pb2.Struct()
+    struct.update(convert_for_protobuf(data))
+    return struct
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to run each case for")
+    args = parser.parse_args()
+
+    print(f"{'payload':<8} {'encoder':<16} {'ms/call':>10}")
+    for label, target in SIZES.items():
+        payload = make_payload(target)
+        assert to_struct(payload) == update_converted(payload)
+
+        cases = {
+            "update+convert": lambda payload=payload: update_converted(payload),
+            "to_struct": lambda payload=payload: to_struct(payload),
+        }
+        for name, fn in cases.items():
+            seconds = bench(fn, args.min_time)
+            print(f"{label:<8} {name:<16} {seconds * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark recall and latency of `LocalVectorDocumentStore` search on synthetic data.
+
+Vectors are drawn around random cluster centers, like embeddings of documents on a
+number of topics. Queries are perturbed copies of stored vectors. Recall@k is
+measured against an exact search, for the exhaustive search and for the IVF index
+with several values of nprobe.
+
+Usage:
+    python benchmarks/bench_vector_store.py [--docs 200000] [--dimensions 384] [--queries 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agentifyme.document_stores.types import VectorDocument
+from agentifyme.document_stores.vector.local import LocalVectorDocumentStore
+
+
+def synthetic(docs: int, dimensions: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    matrix = centers[rng.integers(0, clusters, docs)] + 0.5 * rng.standard_normal((docs, dimensions)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def run_case(store: LocalVectorDocumentStore, queries: np.ndarray, truth: list[set[int]], k: int) -> tuple[float, float, float]:
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth, strict=True):
+        start = time.perf_counter()
+        results = store.search("bench", query, k=k)
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(result.document.id) for result in results} & expected)
+    latencies = np.asarray(latencies) * 1000
+    return hits / (k * len(queries)), float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = synthetic(args.docs, args.dimensions, args.clusters, rng)
+    queries = matrix[rng.choice(args.docs, args.queries, replace=False)] + 0.05 * rng.standard_normal((args.queries, args.dimensions)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    truth = [set(np.argpartition(-(matrix @ query), args.k)[: args.k].tolist()) for query in queries]
+    documents = [VectorDocument.model_construct(id=str(i), content="", metadata={}, embedding=row) for i, row in enumerate(matrix)]
+
+    store = LocalVectorDocumentStore(ivf_threshold=args.docs + 1)
+    start = time.perf_counter()
+    store.add_documents("bench", documents)
+    print(f"added {args.docs:,} documents in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'case':<24} {'recall@' + str(args.k):>10} {'p50 ms':>10} {'p99 ms':>10}")
+    recall, p50, p99 = run_case(store, queries, truth, args.k)
+    print(f"{'exhaustive':<24} {recall:>10.3f} {p50:>10.2f} {p99:>10.2f}")
+
+    start = time.perf_counter()
+    store.build_index("bench")
+    print(f"built the IVF index in {time.perf_counter() - start:.2f}s")
+    for nprobe in [1, 4, 16, 64]:
+        store.nprobe = nprobe
+        recall, p50, p99 = run_case(store, queries, truth, args.k)
+        print(f"{f'ivf nprobe={nprobe}':<24} {recall:>10.3f} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from agentifyme.cache import CacheType, MemoryCache, cache, make_key
+
+
+class Query(BaseModel):
+    text: str
+    limit: int = 10
+
+
+def test_make_key_is_stable():
+    assert make_key({"a": 1, "b": 2}) == make_key({"b": 2, "a": 1})
+    assert make_key(Query(text="x")) == make_key(Query(limit=10, text="x"))
+    assert make_key({1, 2, 3}) == make_key({3, 2, 1})
+    assert make_key(1, b=2) != make_key(1, 2)
+
+    with pytest.raises(TypeError):
+        make_key(object())
+
+
+def test_sync_decorator_caches_none_results():
+    calls = []
+
+    @cache(CacheType.MEMORY)
+    def lookup(name: str):
+        calls.append(name)
+
+    assert lookup("a") is None
+    assert lookup("a") is None
+    assert calls == ["a"]
+
+
+def test_cache_none_can_be_disabled():
+    calls = []
+
+    @cache(cache_instance=MemoryCache(), cache_none=False)
+    def lookup(name: str):
+        calls.append(name)
+
+    lookup("a")
+    lookup("a")
+    assert calls == ["a", "a"]
+
+
+def test_methods_are_keyed_without_self():
+    class Service:
+        def __init__(self):
+            self.calls = 0
+
+        @cache(CacheType.MEMORY)
+        def fetch(self, query: Query) -> int:
+            self.calls += 1
+            return query.limit
+
+    first, second = Service(), Service()
+    assert first.fetch(Query(text="x")) == 10
+    assert second.fetch(Query(text="x")) == 10
+    assert first.calls + second.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_decorator_coalesces_concurrent_calls():
+    calls = 0
+
+    @cache(CacheType.MEMORY, ttl=60)
+    async def fetch(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    results = await asyncio.gather(*(fetch(2) for _ in range(5)))
+    assert results == [4] * 5
+    assert calls == 1
+    assert await fetch(2) == 4
+    assert fetch.cache.stats.hits >= 1
+
+
+@pytest.mark.asyncio
+async def test_async_decorator_cancelled_call_does_not_cancel_waiters():
+    calls = 0
+
+    @cache(CacheType.MEMORY)
+    async def fetch(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    first = asyncio.create_task(fetch(2))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(fetch(2))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == 4
+    assert first.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_async_decorator_does_not_cache_exceptions():
+    calls = 0
+
+    @cache(CacheType.MEMORY)
+    async def fail() -> int:
+        nonlocal calls
+        calls += 1
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await fail()
+    assert calls == 2
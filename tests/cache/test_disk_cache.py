@@ -0,0 +1,69 @@
+import os
+import time
+
+import pytest
+
+from agentifyme.cache import MISSING, DiskCache
+
+
+def test_round_trip_is_sharded(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set("key", {"value": 1})
+
+    assert cache.get("key") == {"value": 1}
+    files = [os.path.relpath(os.path.join(root, name), tmp_path) for root, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 1
+    assert len(files[0].split(os.sep)) == 3
+
+
+def test_index_survives_restart_and_evicts_lru(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.set(key, key * 100)
+        time.sleep(0.01)
+
+    reopened = DiskCache(str(tmp_path), max_entries=2)
+    assert len(reopened) == 3
+    reopened.get("a")
+    reopened.set("d", "d")
+
+    assert reopened.lookup("b") is MISSING
+    assert reopened.lookup("c") is MISSING
+    assert reopened.get("a") == "a" * 100
+    assert reopened.stats.evictions == 2
+
+
+def test_ttl_and_delete(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), ttl=10)
+    cache.set("a", None)
+    assert cache.lookup("a") is None
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.lookup("a") is MISSING
+    assert len(cache) == 0
+
+    cache.set("b", 1)
+    assert cache.delete("b")
+    assert not cache.delete("b")
+
+
+def test_leftover_temp_files_are_removed(tmp_path):
+    shard = tmp_path / "ab" / "cd"
+    shard.mkdir(parents=True)
+    (shard / "partial.tmp").write_bytes(b"x")
+
+    cache = DiskCache(str(tmp_path))
+    assert len(cache) == 0
+    assert not (shard / "partial.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_async_access(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    await cache.aset("a", [1, 2, 3])
+    assert await cache.aget("a") == [1, 2, 3]
+    assert await cache.aget("b", "default") == "default"
+
+    await cache.aset_many({"b": "x", "c": None})
+    assert await cache.alookup_many(["a", "b", "c", "d"]) == [[1, 2, 3], "x", None, MISSING]
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from agentifyme.cache import MISSING, EvictionPolicy, MemoryCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = MemoryCache(max_entries=2, policy=EvictionPolicy.LFU)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    for _ in range(3):
+        cache.get("a")
+    cache.get("b")
+    cache.get("b")
+    cache.set("c", 3)
+    cache.set("d", 4)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") == 2
+    assert "c" not in cache
+
+
+def test_ttl_policy_evicts_soonest_expiring():
+    cache = MemoryCache(max_entries=2, policy="ttl")
+    cache.set("long", 1, ttl=100)
+    cache.set("short", 2, ttl=10)
+    cache.set("forever", 3)
+
+    assert "short" not in cache
+    assert cache.get("long") == 1
+    assert cache.get("forever") == 3
+
+
+def test_entries_expire(monkeypatch):
+    cache = MemoryCache(ttl=10)
+    cache.set("a", 1)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+
+    assert cache.lookup("a") is MISSING
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_max_bytes_bound():
+    cache = MemoryCache(max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.set("c", b"123")
+
+    assert "a" not in cache
+    assert cache.size_bytes == 8
+
+    cache.set("huge", b"x" * 11)
+    assert "huge" not in cache
+
+
+def test_none_is_a_cached_value():
+    cache = MemoryCache()
+    cache.set("a", None)
+
+    assert cache.lookup("a") is None
+    assert cache.get("missing", "default") == "default"
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_concurrent_writers_stay_within_bounds():
+    cache = MemoryCache(max_entries=50)
+
+    def write(offset: int):
+        for i in range(500):
+            cache.set(f"{offset}-{i}", i)
+            cache.get(f"{offset}-{i // 2}")
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
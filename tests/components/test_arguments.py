@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from agentifyme.components.arguments import get_argument_plan
+from agentifyme.components.workflow import WorkflowConfig, workflow
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def order(item: Item, count: int, note: str | None, priority: Optional[int] = None, channel: str = "web") -> Item:
+    return item
+
+
+@pytest.fixture(autouse=True)
+def restore_workflow_registry():
+    registry = dict(WorkflowConfig.get_registry())
+    yield
+    WorkflowConfig._registry = registry
+
+
+def test_plan_is_compiled_once_per_function():
+    plan = get_argument_plan(order)
+    assert get_argument_plan(order) is plan
+    assert plan.return_type is Item
+    assert [p.name for p in plan.params] == ["item", "count", "note", "priority", "channel"]
+    assert [p.optional for p in plan.params] == [False, False, True, True, False]
+
+
+def test_plan_builds_converted_arguments():
+    args = get_argument_plan(order).build({"item": {"name": "pen", "quantity": "2"}, "count": "3", "note": None})
+
+    assert args == {"item": Item(name="pen", quantity=2), "count": 3, "note": None}
+
+
+def test_plan_rejects_missing_required_values():
+    with pytest.raises(ValueError, match="Required parameter count cannot be None"):
+        get_argument_plan(order).build({"item": {"name": "pen", "quantity": 1}})
+
+
+def test_workflow_registration_compiles_the_plan():
+    @workflow(name="plan-workflow")
+    def plan_workflow(item: Item) -> Item:
+        return item
+
+    config = WorkflowConfig.get("plan-workflow").config
+    assert config.argument_plan is get_argument_plan(config.func)
+    assert config.argument_plan.signature.parameters["item"].annotation == "Item"
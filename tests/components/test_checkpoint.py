@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+import pytest
+
+from agentifyme.cache import MISSING
+from agentifyme.components.checkpoint import (
+    RunJournal,
+    SQLiteCheckpointStore,
+    checkpointed_run,
+    get_journal,
+)
+from agentifyme.components.task import TaskConfig, task
+from agentifyme.worker.entrypoint import get_worker_options
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    registry = dict(TaskConfig.get_registry())
+    yield
+    TaskConfig._registry = registry
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    yield store
+    store.close()
+
+
+def test_store_persists_outputs_per_run(tmp_path, store):
+    store.put("run-1", "a", {"value": [1, 2]})
+    store.put("run-2", "a", "other run")
+
+    reopened = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    assert reopened.get("run-1", "a") == {"value": [1, 2]}
+    assert reopened.get("run-1", "b") is MISSING
+
+    reopened.clear("run-1")
+    assert reopened.get("run-1", "a") is MISSING
+    assert reopened.get("run-2", "a") == "other run"
+    assert reopened.prune(older_than=-1) == 1
+    reopened.close()
+
+
+def test_journal_keys_count_repeated_calls(store):
+    journal = RunJournal("run-1", store)
+
+    first = journal.key("summarize", {"text": "a"})
+    second = journal.key("summarize", {"text": "a"})
+
+    assert first != second
+    assert first.endswith(":0") and second.endswith(":1")
+    assert journal.key("summarize", {"text": object()}) is None
+
+
+@pytest.mark.asyncio
+async def test_retried_run_replays_completed_tasks(store):
+    calls = []
+
+    @task
+    async def expensive(prompt: str) -> str:
+        calls.append(prompt)
+        return prompt.upper()
+
+    @task
+    def cheap(value: int) -> int:
+        calls.append(value)
+        return value + 1
+
+    async def run(fail: bool):
+        with checkpointed_run("run-1", store) as journal:
+            assert get_journal() is journal
+            first = await expensive("hello")
+            second = cheap(1)
+            if fail:
+                raise RuntimeError("connection lost")
+            third = await expensive("world")
+        return journal, [first, second, third]
+
+    with pytest.raises(RuntimeError):
+        await run(fail=True)
+    assert calls == ["hello", 1]
+
+    journal, outputs = await run(fail=False)
+
+    assert outputs == ["HELLO", 2, "WORLD"]
+    assert calls == ["hello", 1, "world"]
+    assert (journal.replayed, journal.recorded) == (2, 1)
+    assert get_journal() is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_use_their_own_journal(store):
+    @task
+    async def identity(value: int) -> int:
+        await asyncio.sleep(0)
+        return value
+
+    async def run(run_id: str, value: int):
+        with checkpointed_run(run_id, store):
+            return await identity(value)
+
+    assert await asyncio.gather(run("run-a", 1), run("run-b", 2)) == [1, 2]
+    assert store.get("run-a", RunJournal("run-a", store).key("identity", {"value": 1})) == 1
+    assert store.get("run-b", RunJournal("run-b", store).key("identity", {"value": 2})) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_tasks_use_the_store_off_the_event_loop(store, mocker):
+    threads = []
+    get, put = store.get, store.put
+    mocker.patch.object(store, "get", side_effect=lambda *args: threads.append(threading.get_ident()) or get(*args))
+    mocker.patch.object(store, "put", side_effect=lambda *args: threads.append(threading.get_ident()) or put(*args))
+
+    @task
+    async def identity(value: int) -> int:
+        return value
+
+    with checkpointed_run("run-1", store):
+        assert await identity(1) == 1
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+def test_worker_options_prune_expired_checkpoints(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoints.db")
+    store = SQLiteCheckpointStore(path)
+    store.put("run-1", "a", "stale")
+    store.close()
+    monkeypatch.setenv("AGENTIFYME_CHECKPOINT_DB", path)
+    monkeypatch.setenv("AGENTIFYME_CHECKPOINT_TTL", "0")
+
+    store = get_worker_options()["checkpoint_store"]
+
+    assert store.get("run-1", "a") is MISSING
+    store.close()
+
+
+def test_no_store_disables_checkpointing():
+    with checkpointed_run("run-1", None) as journal:
+        assert journal is None
+        assert get_journal() is None
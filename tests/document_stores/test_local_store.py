@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from agentifyme.document_stores.types import VectorDocument
+from agentifyme.document_stores.vector.local import LocalVectorDocumentStore
+from agentifyme.ml.embedding.vector import Vector
+
+
+@pytest.fixture
+def matrix() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal((500, 32)).astype(np.float32)
+
+
+def make_documents(matrix: np.ndarray) -> list[VectorDocument]:
+    return [
+        VectorDocument(id=f"doc-{i}", content=f"document {i}", metadata={"parity": i % 2, "group": i % 5}, embedding=row)
+        for i, row in enumerate(matrix)
+    ]
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> list[str]:
+    normalized = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return [f"doc-{i}" for i in np.argsort(-scores)[:k]]
+
+
+def test_search_returns_the_closest_documents_first(matrix):
+    store = LocalVectorDocumentStore()
+    store.add_documents("docs", make_documents(matrix))
+
+    results = store.search("docs", matrix[3], k=5)
+
+    assert [result.document.id for result in results] == exact_top_k(matrix, matrix[3], 5)
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+    assert [result.score for result in results] == sorted((result.score for result in results), reverse=True)
+    assert isinstance(results[0].document.embedding, Vector)
+
+
+@pytest.mark.parametrize("metric", ["dot", "l2"])
+def test_search_uses_the_metric(matrix, metric):
+    store = LocalVectorDocumentStore(metric=metric)
+    store.add_documents("docs", make_documents(matrix))
+
+    results = store.search("docs", matrix[10], k=3)
+
+    if metric == "dot":
+        expected = np.argsort(-(matrix @ matrix[10]))[:3]
+    else:
+        expected = np.argsort(((matrix - matrix[10]) ** 2).sum(axis=1))[:3]
+    assert [result.document.id for result in results] == [f"doc-{i}" for i in expected]
+
+
+def test_search_filters_on_metadata(matrix):
+    store = LocalVectorDocumentStore()
+    store.add_documents("docs", make_documents(matrix))
+
+    even = store.search("docs", matrix[1], k=10, filter={"parity": 0})
+    groups = store.search("docs", matrix[1], k=500, filter={"group": [1, 2]})
+    custom = store.search("docs", matrix[1], k=10, filter=lambda metadata: metadata["group"] == 4)
+
+    assert len(even) == 10 and all(result.document.metadata["parity"] == 0 for result in even)
+    assert len(groups) == 200 and {result.document.metadata["group"] for result in groups} == {1, 2}
+    assert all(result.document.metadata["group"] == 4 for result in custom)
+
+
+def test_documents_are_replaced_and_deleted(matrix):
+    store = LocalVectorDocumentStore()
+    store.add_documents("docs", make_documents(matrix[:10]))
+
+    store.add_document("docs", VectorDocument(id="doc-0", content="replaced", metadata={}, embedding=matrix[20]))
+    store.delete_document("docs", "doc-1")
+
+    assert len(store.get_collection("docs")) == 9
+    assert store.get_document("docs", "doc-0").content == "replaced"
+    assert "doc-1" not in [result.document.id for result in store.search("docs", matrix[1], k=10)]
+    with pytest.raises(KeyError):
+        store.get_document("docs", "doc-1")
+
+
+def test_rejects_vectors_of_other_dimensions(matrix):
+    store = LocalVectorDocumentStore()
+    store.add_documents("docs", make_documents(matrix[:5]))
+
+    with pytest.raises(ValueError):
+        store.add_document("docs", VectorDocument(id="x", content="", metadata={}, embedding=[1.0, 2.0]))
+    with pytest.raises(ValueError):
+        store.search("docs", [1.0, 2.0])
+
+
+def test_large_collections_are_searched_through_an_ivf_index():
+    rng = np.random.default_rng(1)
+    centers = rng.standard_normal((40, 32)).astype(np.float32) * 4
+    matrix = (centers[rng.integers(0, 40, 4000)] + rng.standard_normal((4000, 32))).astype(np.float32)
+    store = LocalVectorDocumentStore(ivf_threshold=1000, nprobe=8)
+    store.add_documents("docs", make_documents(matrix))
+
+    hits = 0
+    for query in matrix[:50]:
+        results = store.search("docs", query, k=10)
+        hits += len({result.document.id for result in results} & set(exact_top_k(matrix, query, 10)))
+
+    collection = store._collections["docs"]
+    assert collection.centroids is not None
+    assert hits / 500 > 0.9
+    # documents added after training are assigned to the existing lists
+    store.add_document("docs", VectorDocument(id="new", content="", metadata={}, embedding=matrix[0] * 2))
+    assert store.search("docs", matrix[0], k=1)[0].document.id in {"doc-0", "new"}
+
+
+def test_collections_are_saved_and_memory_mapped(tmp_path, matrix):
+    store = LocalVectorDocumentStore(path=str(tmp_path))
+    store.add_documents("docs", make_documents(matrix))
+    store.delete_document("docs", "doc-2")
+    store.save()
+
+    reopened = LocalVectorDocumentStore(path=str(tmp_path))
+
+    assert reopened.list_collections() == ["docs"]
+    assert reopened._collections["docs"] is None
+    assert len(reopened.get_collection("docs")) == 499
+    assert isinstance(reopened._collections["docs"].matrix, np.memmap)
+    assert reopened._collections["docs"]._norms is None
+    assert [r.document.id for r in reopened.search("docs", matrix[3], k=5)] == [r.document.id for r in store.search("docs", matrix[3], k=5)]
+
+    reopened.add_document("docs", VectorDocument(id="new", content="added", metadata={}, embedding=matrix[2]))
+    assert reopened.search("docs", matrix[2], k=1)[0].document.id == "new"
+
+    reopened.delete_collection("docs")
+    assert not (tmp_path / "docs").exists()
+
+
+def test_saves_replace_the_vectors_only_with_their_documents(tmp_path, matrix):
+    store = LocalVectorDocumentStore(path=str(tmp_path), metric="l2")
+    store.add_documents("docs", make_documents(matrix[:10]))
+    store.save()
+    store.add_documents("docs", make_documents(matrix))
+    store.save()
+
+    assert sorted(p.name for p in (tmp_path / "docs").iterdir()) == ["documents.json", "vectors.2.bin"]
+    reopened = LocalVectorDocumentStore(path=str(tmp_path))
+    assert len(reopened.get_collection("docs")) == 500
+    assert reopened.search("docs", matrix[7], k=1)[0].document.id == "doc-7"
@@ -0,0 +1,118 @@
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from agentifyme.cache import DiskCache, MemoryCache
+from agentifyme.ml.embedding.embeddings import OpenAIEmbeddingModel, estimate_tokens
+from agentifyme.ml.embedding.providers import EmbeddingModelType
+from agentifyme.utilities.ratelimit import AsyncRateLimiter
+
+
+def fake_vector(text: str) -> np.ndarray:
+    return np.array([len(text), ord(text[0]), 1.0], dtype=np.float32)
+
+
+class FakeEmbeddings:
+    def __init__(self, encode_base64: bool = True):
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self.encode_base64 = encode_base64
+
+    async def create(self, input, model, dimensions, encoding_format):
+        self.requests.append(list(input))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        data = []
+        # out of order, like the index field allows
+        for index, text in reversed(list(enumerate(input))):
+            vector = fake_vector(text)
+            embedding = base64.b64encode(vector.tobytes()).decode() if self.encode_base64 else vector.tolist()
+            data.append(SimpleNamespace(index=index, embedding=embedding))
+        return SimpleNamespace(data=data)
+
+
+def make_model(**kwargs) -> tuple[OpenAIEmbeddingModel, FakeEmbeddings]:
+    model = OpenAIEmbeddingModel(EmbeddingModelType.OPENAI_TEXT_EMBEDDING_3_SMALL, api_key="test", **kwargs)
+    fake = FakeEmbeddings()
+    model.async_client = SimpleNamespace(embeddings=fake)
+    return model, fake
+
+
+@pytest.mark.asyncio
+async def test_arun_batch_returns_float32_matrix_in_input_order():
+    model, fake = make_model(max_batch_size=2, max_concurrency=2)
+    texts = ["alpha", "beta", "gamma\nray", "delta", "epsilon"]
+
+    matrix = await model.arun_batch(texts)
+
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix.shape == (5, 3)
+    np.testing.assert_array_equal(matrix, np.stack([fake_vector(text.replace("\n", " ")) for text in texts]))
+    assert [len(request) for request in fake.requests] == [2, 2, 1]
+    assert fake.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_arun_batch_dedupes_and_caches_by_content():
+    cache = MemoryCache()
+    model, fake = make_model(cache=cache)
+
+    first = await model.arun_batch(["same", "other", "same"])
+    assert fake.requests == [["same", "other"]]
+    np.testing.assert_array_equal(first[0], first[2])
+
+    second = await model.arun_batch(["other", "new", "same"])
+    assert fake.requests[1] == ["new"]
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[2], first[0])
+
+
+@pytest.mark.asyncio
+async def test_arun_batch_reads_the_cache_in_one_call(tmp_path, mocker):
+    cache = DiskCache(str(tmp_path))
+    model, fake = make_model(cache=cache)
+    await model.arun_batch(["a", "b"])
+    lookup = mocker.spy(cache, "lookup")
+    lookup_many = mocker.spy(cache, "lookup_many")
+
+    await model.arun_batch(["a", "b", "c"])
+
+    assert fake.requests == [["a", "b"], ["c"]]
+    lookup_many.assert_called_once()
+    assert lookup.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_batches_are_bounded_by_estimated_tokens():
+    model, fake = make_model(max_batch_tokens=estimate_tokens("x" * 40) * 2)
+
+    await model.arun_batch(["a" * 40, "b" * 40, "c" * 40])
+
+    assert [len(request) for request in fake.requests] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_charged_per_request(mocker):
+    limiter = AsyncRateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    acquire = mocker.spy(limiter, "acquire")
+    model, _ = make_model(max_batch_size=1, rate_limiter=limiter)
+
+    await model.arun_batch(["one", "two"])
+
+    assert [call.args[0] for call in acquire.call_args_list] == [estimate_tokens("one"), estimate_tokens("two")]
+
+
+@pytest.mark.asyncio
+async def test_list_encoded_responses_and_empty_input():
+    model, fake = make_model(dimensions=3)
+    fake.encode_base64 = False
+
+    np.testing.assert_array_equal(await model.arun_batch(["hi"]), fake_vector("hi")[None, :])
+    assert (await model.arun_batch([])).shape == (0, 3)
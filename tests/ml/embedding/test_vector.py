@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from agentifyme.document_stores.types import VectorDocument
+from agentifyme.ml.embedding.embeddings import Embedding
+from agentifyme.ml.embedding.vector import Quantization, Vector, VectorBatch
+
+
+@pytest.fixture
+def matrix() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal((50, 64)).astype(np.float32)
+
+
+def test_vector_reads_like_a_list():
+    vector = Vector([0.5, 1.0, -2.0])
+
+    assert len(vector) == 3
+    assert vector[1] == 1.0
+    assert vector[1:] == [1.0, -2.0]
+    assert list(vector) == [0.5, 1.0, -2.0]
+    assert vector == [0.5, 1.0, -2.0]
+    assert vector.tolist() == [0.5, 1.0, -2.0]
+    assert vector.to_numpy().dtype == np.float32
+
+
+def test_embedding_models_accept_and_dump_lists():
+    embedding = Embedding(embedding=[1, 2], metadata={})
+    document = VectorDocument(id="1", content="text", metadata={}, embedding=np.array([3.0, 4.0]))
+
+    assert isinstance(embedding.embedding, Vector)
+    assert embedding.model_dump() == {"embedding": [1.0, 2.0], "metadata": {}}
+    assert document.model_dump_json() == '{"id":"1","content":"text","metadata":{},"embedding":[3.0,4.0]}'
+    assert VectorDocument.model_validate_json(document.model_dump_json()).embedding == [3.0, 4.0]
+
+
+def test_embeddings_view_rows_of_one_matrix(matrix):
+    embeddings = Embedding.from_matrix(matrix)
+
+    assert len(embeddings) == 50
+    assert embeddings[7].metadata["index"] == 7
+    assert np.shares_memory(embeddings[7].embedding.to_numpy(), matrix)
+    np.testing.assert_array_equal(embeddings[7].embedding.to_numpy(), matrix[7])
+
+
+@pytest.mark.parametrize(("quantization", "tolerance", "bytes_per_component"), [("float16", 1e-2, 2), ("int8", 5e-2, 1)])
+def test_quantization_shrinks_and_roughly_preserves(matrix, quantization, tolerance, bytes_per_component):
+    batch = VectorBatch(matrix).quantize(quantization)
+
+    assert batch.quantization == Quantization(quantization)
+    assert batch.matrix.nbytes == matrix.size * bytes_per_component
+    np.testing.assert_allclose(batch.to_numpy(), matrix, atol=tolerance * np.abs(matrix).max())
+    np.testing.assert_allclose(batch[3].to_numpy(), batch.to_numpy()[3])
+
+    vector = Vector(matrix[0]).quantize(quantization)
+    np.testing.assert_allclose(vector.to_numpy(), batch.to_numpy()[0])
+
+
+@pytest.mark.parametrize("quantization", list(Quantization))
+def test_vector_bytes_round_trip(matrix, quantization):
+    vector = Vector(matrix[0]).quantize(quantization)
+
+    restored = Vector.from_bytes(vector.to_bytes())
+
+    assert restored.quantization == quantization
+    np.testing.assert_array_equal(restored.to_numpy(), vector.to_numpy())
+    assert Embedding(embedding=vector.to_bytes(), metadata={}).embedding == restored
+
+
+@pytest.mark.parametrize("quantization", list(Quantization))
+def test_batch_round_trips_through_bytes_and_memory_mapped_files(tmp_path, matrix, quantization):
+    batch = VectorBatch(matrix[:, :63]).quantize(quantization)
+    path = str(tmp_path / "vectors.bin")
+
+    batch.save(path)
+    loaded = VectorBatch.load(path)
+    from_bytes = VectorBatch.from_bytes(batch.to_bytes())
+
+    assert isinstance(loaded.matrix, np.memmap)
+    for restored in (loaded, from_bytes, VectorBatch.load(path, mmap=False)):
+        assert restored.quantization == quantization
+        np.testing.assert_array_equal(restored.to_numpy(), batch.to_numpy())
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError):
+        Vector([[1.0, 2.0]])
+    with pytest.raises(ValueError):
+        Vector(np.zeros(3, dtype=np.int8))
+    with pytest.raises(ValueError):
+        Vector.from_bytes(b"nope" * 4)
@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+
+class FakeStream:
+    """An async stream of provider chunks, hanging after the last one if `hang` is set."""
+
+    def __init__(self, items, hang=False):
+        self.items = items
+        self.hang = hang
+        self.closed = False
+
+    async def __aiter__(self):
+        for item in self.items:
+            yield item
+        if self.hang:
+            await asyncio.Event().wait()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_stream() -> type[FakeStream]:
+    return FakeStream
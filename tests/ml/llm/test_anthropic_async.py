@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agentifyme.ml.llm import (
+    LanguageModelType,
+    Message,
+    RequestScheduler,
+    Role,
+    ToolCall,
+    ToolCallDelta,
+)
+from agentifyme.ml.llm.anthropic import AnthropicLanguageModel
+
+
+def anthropic_message(*blocks, input_tokens=12, output_tokens=7):
+    return SimpleNamespace(content=list(blocks), usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens))
+
+
+STREAM_EVENTS = [
+    SimpleNamespace(type="message_start", message=SimpleNamespace(usage=SimpleNamespace(input_tokens=20))),
+    SimpleNamespace(type="content_block_start", index=0, content_block=SimpleNamespace(type="text")),
+    SimpleNamespace(type="content_block_delta", index=0, delta=SimpleNamespace(type="text_delta", text="Let me ")),
+    SimpleNamespace(type="content_block_delta", index=0, delta=SimpleNamespace(type="text_delta", text="check.")),
+    SimpleNamespace(type="content_block_start", index=1, content_block=SimpleNamespace(type="tool_use", id="toolu_1", name="get_weather")),
+    SimpleNamespace(type="content_block_delta", index=1, delta=SimpleNamespace(type="input_json_delta", partial_json='{"location": ')),
+    SimpleNamespace(type="content_block_delta", index=1, delta=SimpleNamespace(type="input_json_delta", partial_json='"Paris"}')),
+    SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=15)),
+    SimpleNamespace(type="message_stop"),
+]
+
+
+@pytest.fixture
+def anthropic_model(mocker) -> AnthropicLanguageModel:
+    model = AnthropicLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU, api_key="test-key", scheduler=RequestScheduler())
+    model.async_client = mocker.MagicMock()
+    model.async_client.messages.create = mocker.AsyncMock()
+    return model
+
+
+@pytest.mark.asyncio
+async def test_anthropic_agenerate_parses_text_tools_and_usage(anthropic_model: AnthropicLanguageModel):
+    anthropic_model.async_client.messages.create.return_value = anthropic_message(
+        SimpleNamespace(type="text", text="Checking the weather."),
+        SimpleNamespace(type="tool_use", id="toolu_1", name="get_weather", input={"location": "Paris"}),
+    )
+    weather = ToolCall(name="get_weather", description="Get the weather", parameters={"type": "object", "properties": {"location": {"type": "string"}}})
+
+    response = await anthropic_model.agenerate(
+        [Message(role=Role.SYSTEM, content="Be brief."), Message(role=Role.USER, content="Weather in Paris?")],
+        tools=[weather],
+    )
+
+    request = anthropic_model.async_client.messages.create.await_args.kwargs
+    assert request["model"] == "claude-3-haiku-20240307"
+    assert request["system"] == "Be brief."
+    assert request["messages"] == [{"role": "user", "content": "Weather in Paris?"}]
+    assert request["tools"] == [{"name": "get_weather", "description": "Get the weather", "input_schema": weather.parameters}]
+    assert response.message == "Checking the weather."
+    assert response.tool_calls == [ToolCall(name="get_weather", arguments={"location": "Paris"}, tool_call_id="toolu_1")]
+    assert (response.usage.prompt_tokens, response.usage.completion_tokens, response.usage.calls) == (12, 7, 1)
+    assert response.usage.cost > 0
+
+
+@pytest.mark.asyncio
+async def test_anthropic_agenerate_stream(anthropic_model: AnthropicLanguageModel, fake_stream):
+    anthropic_model.async_client.messages.create.return_value = fake_stream(STREAM_EVENTS)
+
+    chunks = [chunk async for chunk in anthropic_model.agenerate_stream([Message(role=Role.USER, content="Weather in Paris?")])]
+
+    assert anthropic_model.async_client.messages.create.await_args.kwargs["stream"] is True
+    assert [chunk.message for chunk in chunks if chunk.message] == ["Let me ", "check."]
+    assert [delta for chunk in chunks for delta in chunk.tool_call_deltas or []] == [
+        ToolCallDelta(index=1, tool_call_id="toolu_1", name="get_weather"),
+        ToolCallDelta(index=1, arguments='{"location": '),
+        ToolCallDelta(index=1, arguments='"Paris"}'),
+    ]
+    assert chunks[-1].tool_calls == [ToolCall(name="get_weather", arguments={"location": "Paris"}, tool_call_id="toolu_1")]
+    assert (chunks[-1].usage.prompt_tokens, chunks[-1].usage.completion_tokens) == (20, 15)
+
+
+def test_anthropic_generate_stream(anthropic_model: AnthropicLanguageModel, mocker):
+    anthropic_model.client = mocker.MagicMock()
+    stream = anthropic_model.client.messages.create.return_value
+    stream.__iter__.return_value = iter(STREAM_EVENTS)
+
+    chunks = list(anthropic_model.generate_stream([Message(role=Role.USER, content="Weather in Paris?")]))
+
+    assert "".join(chunk.message for chunk in chunks if chunk.message) == "Let me check."
+    assert chunks[-1].usage.completion_tokens == 15
+    stream.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_stream_is_closed_when_the_consumer_stops(anthropic_model: AnthropicLanguageModel, fake_stream):
+    stream = fake_stream(STREAM_EVENTS)
+    anthropic_model.async_client.messages.create.return_value = stream
+
+    chunks = anthropic_model.agenerate_stream([Message(role=Role.USER, content="Weather in Paris?")])
+    assert (await anext(chunks)).message == "Let me "
+    await chunks.aclose()
+
+    assert stream.closed
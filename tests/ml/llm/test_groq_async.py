@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agentifyme.ml.llm import (
+    LanguageModelType,
+    Message,
+    RequestScheduler,
+    Role,
+    ToolCall,
+)
+from agentifyme.ml.llm.groq import GroqLanguageModel
+
+
+def groq_completion(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(prompt_tokens=9, completion_tokens=4))
+
+
+def groq_chunk(content=None, tool_calls=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None, x_groq=SimpleNamespace(usage=usage) if usage else None)
+
+
+@pytest.fixture
+def groq_model(mocker) -> GroqLanguageModel:
+    model = GroqLanguageModel(LanguageModelType.GROQ_LLAMA_3_1_8B_INSTANT, api_key="test-key", scheduler=RequestScheduler())
+    model.async_client = mocker.MagicMock()
+    model.async_client.chat.completions.create = mocker.AsyncMock()
+    return model
+
+
+@pytest.mark.asyncio
+async def test_groq_agenerate_parses_tools_and_usage(groq_model: GroqLanguageModel):
+    function = SimpleNamespace(name="get_weather", arguments='{"location": "London"}')
+    groq_model.async_client.chat.completions.create.return_value = groq_completion(tool_calls=[SimpleNamespace(id="call_1", function=function)])
+    weather = ToolCall(name="get_weather", parameters={"type": "object", "properties": {"location": {"type": "string"}}})
+
+    response = await groq_model.agenerate([Message(role=Role.USER, content="Weather in London?")], tools=[weather])
+
+    request = groq_model.async_client.chat.completions.create.await_args.kwargs
+    assert request["model"] == "llama-3.1-8b-instant"
+    assert request["tools"][0]["function"]["name"] == "get_weather"
+    assert response.tool_calls == [ToolCall(name="get_weather", arguments={"location": "London"}, tool_call_id="call_1")]
+    assert (response.usage.prompt_tokens, response.usage.completion_tokens, response.usage.calls) == (9, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_groq_agenerate_returns_errors(groq_model: GroqLanguageModel):
+    groq_model.async_client.chat.completions.create.side_effect = RuntimeError("boom")
+
+    response = await groq_model.agenerate([Message(role=Role.USER, content="Hello")])
+
+    assert response.error == "Groq API call failed: boom"
+
+
+@pytest.mark.asyncio
+async def test_groq_agenerate_stream(groq_model: GroqLanguageModel, fake_stream):
+    def tool_delta(**function):
+        tool_id = function.pop("id", None)
+        return [SimpleNamespace(index=0, id=tool_id, function=SimpleNamespace(**{"name": None, "arguments": None, **function}))]
+
+    groq_model.async_client.chat.completions.create.return_value = fake_stream(
+        [
+            groq_chunk(content="1, "),
+            groq_chunk(content="2"),
+            groq_chunk(tool_calls=tool_delta(id="call_1", name="count")),
+            groq_chunk(tool_calls=tool_delta(arguments='{"to": ')),
+            groq_chunk(tool_calls=tool_delta(arguments="5}"), usage=SimpleNamespace(prompt_tokens=11, completion_tokens=6)),
+        ],
+    )
+
+    chunks = [chunk async for chunk in groq_model.agenerate_stream([Message(role=Role.USER, content="Count")])]
+
+    assert [chunk.message for chunk in chunks if chunk.message] == ["1, ", "2"]
+    assert "".join(delta.arguments for chunk in chunks for delta in chunk.tool_call_deltas or []) == '{"to": 5}'
+    assert chunks[-1].tool_calls == [ToolCall(name="count", arguments={"to": 5}, tool_call_id="call_1")]
+    assert (chunks[-1].usage.prompt_tokens, chunks[-1].usage.completion_tokens) == (11, 6)
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agentifyme.ml.llm import (
+    HedgedLanguageModel,
+    LanguageModel,
+    LanguageModelConfig,
+    LanguageModelResponse,
+    LanguageModelType,
+    Message,
+    Role,
+    get_language_model,
+)
+from agentifyme.ml.llm import hedged as hedged_module
+from agentifyme.ml.llm.base import TokenUsage
+
+MESSAGES = [Message(role=Role.USER, content="Summarize the plot of Hamlet.")]
+
+
+class FakeLanguageModel(LanguageModel):
+    def __init__(self, llm_model, message=None, delay=0.0, error=None, cost=0.01):
+        super().__init__(llm_model)
+        self.message = message or llm_model.value
+        self.delay = delay
+        self.error = error
+        self.cost = cost
+        self.started = 0
+        self.cancelled = False
+
+    def _response(self):
+        if isinstance(self.error, Exception):
+            raise self.error
+        usage = TokenUsage(prompt_tokens=10, completion_tokens=5, cost=self.cost, calls=1)
+        return LanguageModelResponse(message=None if self.error else self.message, error=self.error, usage=usage)
+
+    def generate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        self.started += 1
+        return self._response()
+
+    async def agenerate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._response()
+
+    def generate_stream(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        self.started += 1
+        if self.error:
+            raise ValueError(self.error)
+        yield LanguageModelResponse(message=self.message)
+
+
+def test_token_usage_adds_up():
+    total = TokenUsage(prompt_tokens=1, completion_tokens=2, cost=0.5, calls=1) + TokenUsage(prompt_tokens=3, completion_tokens=4, cost=0.25, calls=1)
+    assert total == TokenUsage(prompt_tokens=4, completion_tokens=6, cost=0.75, calls=2)
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_does_not_hedge():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI)
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU)
+    model = HedgedLanguageModel([primary, secondary], hedge_after=0.5)
+
+    response = await model.agenerate(MESSAGES)
+
+    assert response.message == primary.message
+    assert response.usage.calls == 1
+    assert secondary.started == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, delay=5)
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU, delay=0.01)
+    model = HedgedLanguageModel([primary, secondary], hedge_after=0.05)
+
+    response = await model.agenerate(MESSAGES)
+
+    assert response.message == secondary.message
+    assert primary.started == secondary.started == 1
+    assert primary.cancelled
+
+
+@pytest.mark.asyncio
+async def test_fails_over_on_errors_and_counts_their_cost():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, error=RuntimeError("boom"))
+    secondary = FakeLanguageModel(LanguageModelType.GROQ_LLAMA_3_1_8B_INSTANT, error="overloaded", cost=0.02)
+    tertiary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU, cost=0.03)
+    model = HedgedLanguageModel([primary, secondary, tertiary])
+
+    response = await model.agenerate(MESSAGES)
+
+    assert response.message == tertiary.message
+    # the failed request without a response has no usage, the error response does
+    assert response.usage.calls == 2
+    assert response.usage.cost == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_fails_over_on_timeout():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, delay=5)
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU)
+    model = HedgedLanguageModel([primary, secondary], timeout=0.05)
+
+    response = await model.agenerate(MESSAGES)
+
+    assert response.message == secondary.message
+    assert primary.cancelled
+
+
+@pytest.mark.asyncio
+async def test_all_models_failing_returns_error():
+    models = [
+        FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, error=RuntimeError("boom")),
+        FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU, error="overloaded"),
+    ]
+    response = await HedgedLanguageModel(models, hedge_after=0.05).agenerate(MESSAGES)
+
+    assert response.message is None
+    assert "boom" in response.error and "overloaded" in response.error
+
+
+@pytest.mark.asyncio
+async def test_attempts_are_traced(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(hedged_module, "tracer", provider.get_tracer("test"))
+
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, delay=5)
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU, delay=0.01)
+    await HedgedLanguageModel([primary, secondary], hedge_after=0.05).agenerate(MESSAGES)
+
+    spans = {span.attributes["llm.model_name"]: span.attributes for span in exporter.get_finished_spans()}
+    assert spans[primary.llm_model.value]["llm.attempt.outcome"] == "cancelled"
+    assert spans[secondary.llm_model.value]["llm.attempt.reason"] == "hedge"
+    assert spans[secondary.llm_model.value]["llm.attempt.outcome"] == "won"
+    assert spans[secondary.llm_model.value]["llm.attempt.cost"] == 0.01
+
+
+def test_generate_falls_back():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, error=RuntimeError("boom"))
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU)
+    response = HedgedLanguageModel([primary, secondary]).generate(MESSAGES)
+
+    assert response.message == secondary.message
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_before_first_chunk():
+    primary = FakeLanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, error="overloaded")
+    secondary = FakeLanguageModel(LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU)
+    model = HedgedLanguageModel([primary, secondary])
+
+    chunks = [chunk async for chunk in model.agenerate_stream(MESSAGES)]
+
+    assert [chunk.message for chunk in chunks] == [secondary.message]
+    assert [chunk.message for chunk in model.generate_stream(MESSAGES)] == [secondary.message]
+
+
+def test_config_builds_hedged_model(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    config = LanguageModelConfig(
+        model=LanguageModelType.OPENAI_GPT4o_MINI,
+        fallback_models=[LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU],
+        hedge_after=2.0,
+        attempt_timeout=30.0,
+    )
+    model = get_language_model(config)
+
+    assert isinstance(model, HedgedLanguageModel)
+    assert [m.llm_model for m in model.models] == [LanguageModelType.OPENAI_GPT4o_MINI, LanguageModelType.ANTHROPIC_CLAUDE_3_HAIKU]
+    assert model.hedge_after == 2.0 and model.timeout == 30.0
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from agentifyme.ml.llm import (
+    LanguageModelType,
+    Message,
+    OpenAILanguageModel,
+    RequestScheduler,
+    Role,
+    ToolCall,
+    ToolCallDelta,
+)
+
+MESSAGES = [Message(role=Role.USER, content="What's the weather in Paris?")]
+
+
+def chunk(content=None, tool_calls=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))] if content or tool_calls else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def tool_delta(index=0, id=None, name=None, arguments=None):
+    return [SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))]
+
+
+CHUNKS = [
+    chunk(content="Checking"),
+    chunk(tool_calls=tool_delta(id="call_1", name="get_weather", arguments="")),
+    chunk(tool_calls=tool_delta(arguments='{"location"')),
+    chunk(tool_calls=tool_delta(arguments=': "Paris"}')),
+    chunk(usage=SimpleNamespace(prompt_tokens=30, completion_tokens=12)),
+]
+
+
+@pytest.fixture
+def openai_model(mocker) -> OpenAILanguageModel:
+    model = OpenAILanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, api_key="test-key", scheduler=RequestScheduler())
+    model.async_client = mocker.MagicMock()
+    model.async_client.chat.completions.create = mocker.AsyncMock()
+    return model
+
+
+@pytest.mark.asyncio
+async def test_agenerate_stream_yields_deltas_then_tool_calls_and_usage(openai_model: OpenAILanguageModel, fake_stream):
+    openai_model.async_client.chat.completions.create.return_value = fake_stream(CHUNKS)
+
+    chunks = [chunk async for chunk in openai_model.agenerate_stream(MESSAGES)]
+
+    request = openai_model.async_client.chat.completions.create.await_args.kwargs
+    assert request["stream"] is True
+    assert request["stream_options"] == {"include_usage": True}
+    assert chunks[0].message == "Checking"
+    assert [delta for chunk in chunks[1:-1] for delta in chunk.tool_call_deltas] == [
+        ToolCallDelta(index=0, tool_call_id="call_1", name="get_weather", arguments=""),
+        ToolCallDelta(index=0, arguments='{"location"'),
+        ToolCallDelta(index=0, arguments=': "Paris"}'),
+    ]
+    assert chunks[-1].tool_calls == [ToolCall(name="get_weather", arguments={"location": "Paris"}, tool_call_id="call_1")]
+    assert (chunks[-1].usage.prompt_tokens, chunks[-1].usage.completion_tokens, chunks[-1].usage.calls) == (30, 12, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_consumer_closes_the_stream(openai_model: OpenAILanguageModel, fake_stream):
+    stream = fake_stream([chunk(content="first")], hang=True)
+    openai_model.async_client.chat.completions.create.return_value = stream
+    received = asyncio.Event()
+
+    async def consume():
+        async for _ in openai_model.agenerate_stream(MESSAGES):
+            received.set()
+
+    task = asyncio.create_task(consume())
+    await received.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_agenerate_stream_reports_errors(openai_model: OpenAILanguageModel):
+    openai_model.async_client.chat.completions.create.side_effect = openai.OpenAIError("bad request")
+
+    chunks = [chunk async for chunk in openai_model.agenerate_stream(MESSAGES)]
+
+    assert [chunk.error for chunk in chunks] == ["OpenAI Error: bad request"]
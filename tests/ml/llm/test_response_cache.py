@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+
+from agentifyme.cache import CacheType
+from agentifyme.ml.llm import (
+    DiskResponseCache,
+    LanguageModel,
+    LanguageModelResponse,
+    LanguageModelType,
+    MemoryResponseCache,
+    Message,
+    Role,
+)
+from agentifyme.ml.llm.cache import get_response_cache, response_cache_key
+
+
+class CountingLanguageModel(LanguageModel):
+    def __init__(self, **kwargs):
+        super().__init__(LanguageModelType.OPENAI_GPT4o_MINI, **kwargs)
+        self.calls = 0
+
+    def generate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        def _generate():
+            self.calls += 1
+            return LanguageModelResponse(message=f"answer {self.calls}")
+
+        return self._generate_cached(messages, tools, _generate, max_tokens=max_tokens, temperature=temperature)
+
+    async def agenerate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        async def _agenerate():
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            if kwargs.get("fail"):
+                return LanguageModelResponse(error="upstream error")
+            return LanguageModelResponse(message=f"answer {self.calls}")
+
+        return await self._agenerate_cached(messages, tools, _agenerate, max_tokens=max_tokens, temperature=temperature, **kwargs)
+
+    def generate_stream(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        yield self.generate(messages, tools, max_tokens, temperature, top_p, **kwargs)
+
+
+MESSAGES = [Message(role=Role.USER, content="What is the capital of France?")]
+
+
+def test_cache_key_is_canonical():
+    key = response_cache_key("openai/gpt-4o", MESSAGES, None, temperature=0.5, extra={"b": 1, "a": 2})
+    same = response_cache_key("openai/gpt-4o", [Message(content="What is the capital of France?", role="user")], [], extra={"a": 2, "b": 1}, temperature=0.5)
+    assert key == same
+    assert key != response_cache_key("openai/gpt-4o", MESSAGES, None, temperature=0.7, extra={"b": 1, "a": 2})
+
+
+def test_memory_cache_evicts_lru_and_expires(monkeypatch):
+    cache = MemoryResponseCache(max_entries=2, ttl=10)
+    cache.set("a", LanguageModelResponse(message="a"))
+    cache.set("b", LanguageModelResponse(message="b"))
+    assert cache.get("a").message == "a"
+
+    cache.set("c", LanguageModelResponse(message="c"))
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None
+
+
+def test_disk_cache_round_trip_and_ttl(tmp_path, monkeypatch):
+    cache = DiskResponseCache(cache_dir=str(tmp_path), ttl=10)
+    key = response_cache_key("openai/gpt-4o", MESSAGES)
+    cache.set(key, LanguageModelResponse(message="Paris"))
+
+    assert len(cache) == 1
+    assert cache.get(key).message == "Paris"
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_sync_generate_marks_hits_as_cached():
+    model = CountingLanguageModel(response_cache=MemoryResponseCache())
+    first = model.generate(MESSAGES)
+    second = model.generate(MESSAGES)
+
+    assert model.calls == 1
+    assert not first.cached
+    assert second.cached
+    assert second.message == first.message
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    model = CountingLanguageModel(response_cache=MemoryResponseCache())
+    responses = await asyncio.gather(*(model.agenerate(MESSAGES) for _ in range(5)))
+
+    assert model.calls == 1
+    assert {r.message for r in responses} == {"answer 1"}
+    assert sum(not r.cached for r in responses) == 1
+
+    hit = await model.agenerate(MESSAGES)
+    assert hit.cached
+    assert model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_does_not_cancel_waiters():
+    model = CountingLanguageModel(response_cache=MemoryResponseCache())
+    leader = asyncio.create_task(model.agenerate(MESSAGES))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(model.agenerate(MESSAGES))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    response = await waiter
+
+    assert leader.cancelled()
+    assert response.message == "answer 2"
+    assert model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_cache_write_still_returns_response(mocker):
+    cache = MemoryResponseCache()
+    mocker.patch.object(cache.backend, "aset", side_effect=OSError("disk full"))
+    model = CountingLanguageModel(response_cache=cache)
+
+    responses = await asyncio.gather(*(model.agenerate(MESSAGES) for _ in range(3)))
+
+    assert {r.message for r in responses} == {"answer 1"}
+    assert model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    model = CountingLanguageModel(response_cache=MemoryResponseCache())
+    await model.agenerate(MESSAGES, fail=True)
+    await model.agenerate(MESSAGES, fail=True)
+    assert model.calls == 2
+
+
+def test_cache_type_selects_shared_cache():
+    assert CountingLanguageModel().response_cache is None
+    model = CountingLanguageModel(llm_cache_type=CacheType.MEMORY)
+    assert model.response_cache is get_response_cache(CacheType.MEMORY)
+    assert CountingLanguageModel(llm_cache_type=CacheType.MEMORY).response_cache is model.response_cache
@@ -0,0 +1,208 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agentifyme.ml.llm import (
+    LanguageModel,
+    LanguageModelResponse,
+    LanguageModelType,
+    Message,
+    Priority,
+    RequestScheduler,
+    Role,
+    scheduling_priority,
+)
+from agentifyme.ml.llm import scheduler as scheduler_module
+from agentifyme.ml.llm.base import TokenUsage
+from agentifyme.ml.llm.scheduler import estimate_request_tokens
+
+MESSAGES = [Message(role=Role.USER, content="Summarize the plot of Hamlet.")]
+
+
+def rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class SchedulerLanguageModel(LanguageModel):
+    def __init__(self, respond, **kwargs):
+        super().__init__(LanguageModelType.OPENAI_GPT4o_MINI, **kwargs)
+        self.respond = respond
+
+    def generate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        raise NotImplementedError
+
+    async def agenerate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        return await self._agenerate_cached(messages, tools, self.respond, max_tokens=max_tokens, temperature=temperature)
+
+    def generate_stream(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    scheduler = RequestScheduler(max_concurrency=3)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(scheduler.run(call) for _ in range(20)))
+
+    assert results == ["ok"] * 20
+    assert peak == 3
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_started_before_batch_ones():
+    scheduler = RequestScheduler(max_concurrency=1)
+    started = []
+    gate = asyncio.Event()
+
+    async def call(name):
+        started.append(name)
+        await gate.wait()
+
+    first = asyncio.create_task(scheduler.run(lambda: call("first")))
+    await asyncio.sleep(0)
+    batch = [asyncio.create_task(scheduler.run(lambda i=i: call(f"batch-{i}"), priority=Priority.BATCH)) for i in range(2)]
+    await asyncio.sleep(0)
+    with scheduling_priority(Priority.INTERACTIVE):
+        interactive = asyncio.create_task(scheduler.run(lambda: call("interactive")))
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(first, interactive, *batch)
+
+    assert started == ["first", "interactive", "batch-0", "batch-1"]
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_skip_batch_requests_waiting_for_the_rate_limit():
+    scheduler = RequestScheduler(requests_per_minute=600, max_concurrency=64)
+    scheduler.limiter.requests.tokens = 0  # each request waits 0.1s for the next one
+    started = []
+
+    async def call(name):
+        started.append(name)
+
+    batch = [asyncio.create_task(scheduler.run(lambda i=i: call(f"batch-{i}"), priority=Priority.BATCH)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    interactive = asyncio.create_task(scheduler.run(lambda: call("interactive"), priority=Priority.INTERACTIVE))
+    await asyncio.gather(interactive, *batch)
+
+    assert started == ["batch-0", "interactive", "batch-1", "batch-2"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_shrink_the_concurrency_limit_and_pause(mocker):
+    scheduler = RequestScheduler(max_concurrency=8, min_concurrency=2)
+    sleep = mocker.patch("agentifyme.ml.llm.scheduler.asyncio.sleep", autospec=True)
+
+    async def limited():
+        raise ValueError("OpenAI API call failed") from rate_limit_error(retry_after="5")
+
+    with pytest.raises(ValueError):
+        await scheduler.run(limited)
+    assert scheduler.limit == 4
+
+    with pytest.raises(ValueError):
+        await scheduler.run(limited)
+    with pytest.raises(ValueError):
+        await scheduler.run(limited)
+    assert scheduler.limit == 2
+
+    async def ok():
+        return "ok"
+
+    assert await scheduler.run(ok) == "ok"
+    assert sleep.await_args.args[0] == pytest.approx(5, abs=0.5)
+    assert scheduler.limit == pytest.approx(2.5)
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_shrink_the_concurrency_limit():
+    scheduler = RequestScheduler(max_concurrency=10, target_latency=0.001)
+
+    async def slow():
+        await asyncio.sleep(0.01)
+
+    await scheduler.run(slow)
+
+    assert scheduler.limit == pytest.approx(9)
+
+
+@pytest.mark.asyncio
+async def test_unused_tokens_are_refunded():
+    scheduler = RequestScheduler(tokens_per_minute=1000)
+
+    async def call():
+        return LanguageModelResponse(message="ok", usage=TokenUsage(prompt_tokens=50, completion_tokens=50))
+
+    await scheduler.run(call, tokens=400)
+
+    assert scheduler.limiter.tokens.tokens == pytest.approx(900, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_agenerate_goes_through_the_model_scheduler():
+    scheduler = RequestScheduler(tokens_per_minute=10_000)
+    run = scheduler.run
+
+    async def respond():
+        return LanguageModelResponse(message="Hamlet dies.")
+
+    calls = []
+
+    async def spy(call, tokens=0, priority=None):
+        calls.append((tokens, priority))
+        return await run(call, tokens, priority)
+
+    scheduler.run = spy
+    model = SchedulerLanguageModel(respond, scheduler=scheduler, priority=Priority.BATCH)
+
+    response = await model.agenerate(MESSAGES, max_tokens=100)
+
+    assert response.message == "Hamlet dies."
+    assert calls == [(estimate_request_tokens(MESSAGES, 100), Priority.BATCH)]
+
+
+def test_models_share_the_scheduler_of_their_model():
+    first = SchedulerLanguageModel(None)
+    second = SchedulerLanguageModel(None)
+
+    assert first.scheduler is second.scheduler
+    assert SchedulerLanguageModel(None, scheduler=RequestScheduler()).scheduler is not first.scheduler
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_a_span_attribute(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(scheduler_module, "tracer", provider.get_tracer("test"))
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    async def call():
+        await asyncio.sleep(0.02)
+
+    await asyncio.gather(scheduler.run(call, tokens=10), scheduler.run(call, tokens=10, priority="batch"))
+
+    spans = exporter.get_finished_spans()
+    waits = sorted(span.attributes["llm.queue_wait"] for span in spans)
+    assert [span.name for span in spans] == ["llm.scheduled_request"] * 2
+    assert waits[0] < 0.01 <= waits[1]
+    assert {span.attributes["llm.priority"] for span in spans} == {"interactive", "batch"}
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic
+import groq
+import openai
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from agentifyme.ml import clients
+from agentifyme.ml.clients import clear_clients, configure_http_pool, get_client
+from agentifyme.ml.embedding.embeddings import OpenAIEmbeddingModel
+from agentifyme.ml.embedding.providers import EmbeddingModelType
+from agentifyme.ml.llm import (
+    LanguageModelConfig,
+    LanguageModelType,
+    OpenAILanguageModel,
+    get_language_model,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    clear_clients()
+    yield
+    configure_http_pool()
+    clear_clients()
+
+
+def test_clients_are_shared_per_credentials():
+    first = get_client(OpenAI, "key-1", organization="org")
+    assert get_client(OpenAI, "key-1", organization="org") is first
+    assert get_client(OpenAI, "key-2", organization="org") is not first
+    assert get_client(OpenAI, "key-1", organization="other") is not first
+    assert get_client(OpenAI, "key-1", "https://proxy.example.com/v1", organization="org") is not first
+    assert isinstance(get_client(AsyncOpenAI, "key-1", organization="org")._client, openai.DefaultAsyncHttpxClient)
+    assert get_client(OpenAI, "key-3", organization=None) is get_client(OpenAI, "key-3")
+
+
+def test_options_share_the_connection_pool():
+    client = get_client(OpenAI, "key", timeout=5, max_retries=0)
+
+    assert client.timeout == 5
+    assert client.max_retries == 0
+    assert client._client is get_client(OpenAI, "key")._client
+
+
+def test_pool_limits_are_configurable(mocker):
+    configure_http_pool(max_connections=7, max_keepalive_connections=3, http2=False)
+    create = mocker.spy(clients, "_http_client")
+
+    # async clients are created on first use
+    assert get_client(anthropic.AsyncAnthropic, "key")._client is not None
+    get_client(groq.Groq, "key")
+
+    assert [call.kwargs["asynchronous"] for call in create.call_args_list] == [True, False]
+    assert [client._transport._pool._max_connections for client in create.spy_return_list] == [7, 7]
+
+
+def test_http2_needs_h2(mocker):
+    mocker.patch.object(clients, "HTTP2_AVAILABLE", False)
+
+    with pytest.raises(ImportError):
+        configure_http_pool(http2=True)
+
+
+class ChatCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive, so the second loop would reuse them
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+            },
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatCompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_clients_work_across_event_loops(chat_server):
+    client = get_client(AsyncOpenAI, "key", chat_server, timeout=5)
+
+    async def ask():
+        response = await client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hello"}])
+        return response.choices[0].message.content
+
+    assert asyncio.run(ask()) == "hi"
+    assert asyncio.run(ask()) == "hi"
+
+
+@pytest.mark.asyncio
+async def test_async_clients_are_shared_within_a_loop():
+    first = get_client(AsyncOpenAI, "key", timeout=5)
+    second = get_client(AsyncOpenAI, "key")
+
+    assert first._client is second._client
+
+
+def test_models_with_the_same_key_share_clients():
+    model = OpenAILanguageModel(LanguageModelType.OPENAI_GPT4o_MINI, api_key="key")
+    other = OpenAILanguageModel(LanguageModelType.OPENAI_GPT4o, api_key="key")
+    embeddings = OpenAIEmbeddingModel(EmbeddingModelType.OPENAI_TEXT_EMBEDDING_3_SMALL, api_key="key")
+
+    assert model.async_client._client is other.async_client._client
+    assert model.async_client._client is embeddings.async_client._client
+
+
+def test_models_built_from_identical_configs_share_clients_only():
+    config = LanguageModelConfig(model=LanguageModelType.OPENAI_GPT4o_MINI, api_key="key")
+
+    model = get_language_model(config)
+    other = get_language_model(config.model_copy())
+
+    # each caller gets its own model, with its own prompt and scheduling settings
+    assert other is not model
+    assert other.client is model.client
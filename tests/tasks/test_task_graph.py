@@ -0,0 +1,149 @@
+# pylint: disable=missing-function-docstring
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agentifyme.components import dag
+from agentifyme.components.dag import TaskGraph
+from agentifyme.components.task import TaskConfig, task
+from agentifyme.components.utils import DependencyCycleError, find_cycle
+from agentifyme.errors import AgentifyMeError
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    registry = dict(TaskConfig.get_registry())
+    TaskConfig._registry = {}
+    yield
+    TaskConfig._registry = registry
+
+
+def test_find_cycle():
+    assert find_cycle({"a": ["b"], "b": ["c"], "c": []}) is None
+    assert find_cycle({"a": ["b"], "b": ["c"], "c": ["a"]}) == ["a", "b", "c", "a"]
+    assert find_cycle({"a": ["a"]}) == ["a", "a"]
+    assert find_cycle({"a": ["missing"]}) is None
+
+
+def test_cycle_is_rejected_at_registration():
+    @task(dependencies=["second"])
+    def first() -> int:
+        return 1
+
+    with pytest.raises(DependencyCycleError, match="first -> second -> first|second -> first -> second"):
+
+        @task(dependencies=["first"])
+        def second() -> int:
+            return 2
+
+    assert "second" not in TaskConfig.get_registry()
+    assert TaskConfig.get("first").config.dependencies == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_graph_runs_independent_tasks_concurrently_and_passes_outputs():
+    started = []
+
+    @task
+    async def fetch(url: str) -> str:
+        started.append("fetch")
+        await asyncio.sleep(0.05)
+        return f"page at {url}"
+
+    @task
+    async def load_config() -> dict:
+        started.append("load_config")
+        await asyncio.sleep(0.01)
+        return {"words": 2}
+
+    @task(dependencies=["fetch", "load_config"])
+    def summarize(fetch: str, load_config: dict) -> str:
+        return " ".join(fetch.split()[: load_config["words"]])
+
+    graph = TaskGraph.from_registry()
+    assert graph.topological_order()[-1] == "summarize"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = await graph.run({"url": "example.com", "unused": 1}, executor=executor)
+
+    assert result.ok
+    assert sorted(started) == ["fetch", "load_config"]
+    assert result.outputs["summarize"] == "page at"
+    assert result.critical_path == ["fetch", "summarize"]
+    assert result.critical_path_duration >= result.durations["fetch"]
+
+
+@pytest.mark.asyncio
+async def test_failure_skips_dependents_only():
+    @task
+    async def broken() -> int:
+        raise ValueError("boom")
+
+    @task
+    async def fine() -> int:
+        return 1
+
+    @task(dependencies=["broken"])
+    async def after_broken(broken: int) -> int:
+        return broken
+
+    @task(dependencies=["after_broken", "fine"])
+    async def last(after_broken: int, fine: int) -> int:
+        return after_broken + fine
+
+    result = await TaskGraph.from_registry().run()
+
+    assert list(result.errors) == ["broken"]
+    assert sorted(result.skipped) == ["after_broken", "last"]
+    assert result.outputs == {"fine": 1}
+    with pytest.raises(AgentifyMeError, match="first failure in broken"):
+        result.raise_for_errors()
+
+
+def test_from_registry_targets_and_unknown_dependencies():
+    @task
+    def base() -> int:
+        return 1
+
+    @task(dependencies=["base"])
+    def derived(base: int) -> int:
+        return base + 1
+
+    @task
+    def unrelated() -> int:
+        return 0
+
+    @task(dependencies=["not-registered"])
+    def orphan() -> int:
+        return 0
+
+    assert set(TaskGraph.from_registry(["derived"]).tasks) == {"base", "derived"}
+    with pytest.raises(AgentifyMeError, match="unknown tasks: not-registered"):
+        TaskGraph.from_registry(["orphan"])
+
+
+@pytest.mark.asyncio
+async def test_run_records_critical_path_on_span(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(dag, "tracer", provider.get_tracer("test"))
+
+    @task
+    async def step_one() -> int:
+        return 1
+
+    @task(dependencies=["step_one"])
+    async def step_two(step_one: int) -> int:
+        return step_one + 1
+
+    await TaskGraph.from_registry().run()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["dag.run"].attributes["dag.critical_path"] == ("step_one", "step_two")
+    assert spans["step_two"].parent.span_id == spans["dag.run"].context.span_id
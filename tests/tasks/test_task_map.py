@@ -0,0 +1,116 @@
+# pylint: disable=missing-function-docstring
+
+import asyncio
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agentifyme.components import fanout
+from agentifyme.components.fanout import fan_out
+from agentifyme.components.task import TaskConfig, task
+from agentifyme.errors import AgentifyMeError
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    registry = dict(TaskConfig.get_registry())
+    yield
+    TaskConfig._registry = registry
+
+
+@pytest.mark.asyncio
+async def test_map_bounds_concurrency_and_keeps_order():
+    running = 0
+    peak = 0
+
+    @task
+    async def double(value: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (value % 3))
+        running -= 1
+        return value * 2
+
+    result = await double.map(range(20), concurrency=4)
+
+    assert peak == 4
+    assert result.ok
+    assert result.values == [value * 2 for value in range(20)]
+    assert [item.index for item in result] == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_map_accounts_for_partial_failures():
+    @task
+    async def parse(text: str) -> int:
+        return int(text)
+
+    result = await parse.map(["1", "x", "3", "y"], concurrency=2)
+
+    assert result.values == [1, 3]
+    assert [item.index for item in result.failed] == [1, 3]
+    assert [item.input for item in result.failed] == ["x", "y"]
+    assert len(result.succeeded) == 2
+    with pytest.raises(AgentifyMeError, match="2 of 4 invocations of parse failed"):
+        result.raise_for_errors()
+
+
+@pytest.mark.asyncio
+async def test_map_item_forms_and_sync_tasks():
+    @task
+    def greet(greeting: str, name: str = "world") -> str:
+        return f"{greeting}, {name}!"
+
+    result = await greet.gather("Hello", ("Hi", "there"), {"greeting": "Hey", "name": "you"})
+
+    assert result.values == ["Hello, world!", "Hi, there!", "Hey, you!"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_keep_their_own_result():
+    @task
+    async def echo(value: int) -> int:
+        await asyncio.sleep(0.01 * (3 - value))
+        return value
+
+    task_instance = TaskConfig.get("echo")
+
+    async def run_and_read(value: int) -> int:
+        await task_instance.arun(value)
+        await asyncio.sleep(0.05)
+        return task_instance.result
+
+    assert await asyncio.gather(*(run_and_read(value) for value in range(3))) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_rejects_invalid_concurrency():
+    async def identity(value):
+        return value
+
+    with pytest.raises(ValueError):
+        await fan_out("identity", identity, [1], concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_records_a_span_per_item(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(fanout, "tracer", provider.get_tracer("test"))
+
+    async def check(value):
+        if value < 0:
+            raise ValueError("negative")
+        return value
+
+    await fan_out("check", check, [1, -1], concurrency=2)
+
+    spans = {span.name: span for span in exporter.get_finished_spans() if span.name == "check.map"}
+    items = sorted((span for span in exporter.get_finished_spans() if span.name == "check.map_item"), key=lambda span: span.attributes["task.map.index"])
+    assert [span.status.is_ok for span in items] == [True, False]
+    assert all(span.parent.span_id == spans["check.map"].context.span_id for span in items)
+    assert spans["check.map"].attributes["task.map.failed"] == 1
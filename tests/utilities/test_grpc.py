@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+from google.protobuf import struct_pb2
+from pydantic import BaseModel
+
+from agentifyme.utilities import grpc as grpc_utils
+from agentifyme.utilities.grpc import (
+    convert_for_protobuf,
+    register_type_converter,
+    to_struct,
+)
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+def legacy_struct(data):
+    struct = struct_pb2.Struct()
+    struct.update(convert_for_protobuf(data))
+    return struct
+
+
+def test_to_struct_matches_update_of_converted_data():
+    data = {
+        "int": 1,
+        "float": 2.5,
+        "bool": True,
+        "none": None,
+        "str": "text",
+        "list": [1, "a", {"nested": []}],
+        "tuple": (1, 2),
+        "empty": {},
+        "uuid": uuid.uuid4(),
+        "datetime": datetime(2024, 1, 2, 3, 4, 5),
+        "decimal": Decimal("1.25"),
+        "enum": Color.RED,
+        "model": Point(x=1, y=2),
+        "other": object,
+    }
+
+    assert to_struct(data) == legacy_struct(data)
+
+
+def test_to_struct_encodes_models_and_rejects_scalars():
+    assert to_struct(Point(x=1, y=2)) == legacy_struct({"x": 1, "y": 2})
+    assert to_struct({1: "a"}).fields["1"].string_value == "a"
+
+    with pytest.raises(TypeError):
+        to_struct([1, 2])
+
+
+def test_register_type_converter_takes_priority():
+    class Celsius(float):
+        pass
+
+    class Reading:
+        def __init__(self, value):
+            self.value = value
+
+    saved = dict(grpc_utils.TYPE_CONVERTERS)
+    try:
+        assert convert_for_protobuf(Reading(1)).startswith("<")
+        register_type_converter(Reading, lambda r: {"value": r.value})
+
+        assert convert_for_protobuf(Reading(1)) == {"value": 1}
+        assert to_struct({"r": Reading(Celsius(3.5))}).fields["r"].struct_value.fields["value"].number_value == 3.5
+    finally:
+        grpc_utils.TYPE_CONVERTERS.clear()
+        grpc_utils.TYPE_CONVERTERS.update(saved)
+        grpc_utils._converter_cache.clear()
+        grpc_utils._value_writers.clear()
+        grpc_utils._value_writers.update(grpc_utils._BASE_WRITERS)
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from agentifyme.utilities.ratelimit import AsyncRateLimiter, TokenBucket
+
+
+def test_token_bucket_refills_over_time(mocker):
+    now = mocker.patch("agentifyme.utilities.ratelimit.time.monotonic", return_value=100.0)
+    bucket = TokenBucket(rate=10, capacity=20)
+
+    bucket.consume(20)
+    assert bucket.wait_time(5) == pytest.approx(0.5)
+
+    now.return_value = 100.5
+    assert bucket.wait_time(5) == 0
+    # requests above the capacity only wait for a full bucket
+    assert bucket.wait_time(50) == pytest.approx(1.5)
+
+    bucket.refund(100)
+    assert bucket.tokens == 20
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_for_token_budget():
+    limiter = AsyncRateLimiter(tokens_per_minute=6000)  # 100 tokens per second
+
+    assert await limiter.acquire(6000) < 0.01
+    start = time.monotonic()
+    await limiter.acquire(5)
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_serves_waiters_in_order():
+    limiter = AsyncRateLimiter(requests_per_minute=600)  # 10 per second, bursts of 600
+    limiter.requests.consume(600)
+    order = []
+
+    async def call(name):
+        await limiter.acquire()
+        order.append(name)
+
+    await asyncio.gather(call("first"), call("second"), call("third"))
+    assert order == ["first", "second", "third"]
@@ -0,0 +1,21 @@
+import grpc
+import pytest
+
+
+class FakeStream:
+    """A worker stream recording the messages written, dropping once after `fail_after` of them."""
+
+    def __init__(self, fail_after: int | None = None):
+        self.messages = []
+        self.fail_after = fail_after
+
+    async def write(self, msg):
+        if self.fail_after is not None and len(self.messages) >= self.fail_after:
+            self.fail_after = None
+            raise grpc.aio.AioRpcError(grpc.StatusCode.UNAVAILABLE, None, None, "stream dropped")
+        self.messages.append(msg)
+
+
+@pytest.fixture
+def fake_stream() -> type[FakeStream]:
+    return FakeStream
@@ -0,0 +1,107 @@
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import NonRecordingSpan, SpanContext
+
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.telemetry import capture
+from agentifyme.worker.telemetry.capture import CaptureMode, PayloadCapturePolicy
+from agentifyme.worker.telemetry.instrumentor import create_instrumentation_wrapper
+
+
+def span_with_trace_id(trace_id: int) -> NonRecordingSpan:
+    return NonRecordingSpan(SpanContext(trace_id=trace_id, span_id=1, is_remote=False))
+
+
+@pytest.fixture
+def use_policy():
+    saved = capture.get_capture_policy()
+    yield capture.set_capture_policy
+    capture.set_capture_policy(saved)
+
+
+@pytest.fixture
+def tracer(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch("agentifyme.worker.telemetry.instrumentor.trace.get_tracer", return_value=provider.get_tracer("test"))
+    return exporter
+
+
+def instrumented(func, events):
+    handler = CallbackHandler()
+    handler.register_default(events.append)
+    return lambda *args, **kwargs: create_instrumentation_wrapper(handler, "task", "t")(func, None, args, kwargs)
+
+
+def test_head_sampling_is_decided_by_trace_id():
+    policy = PayloadCapturePolicy(mode=CaptureMode.HEAD_SAMPLED, sample_rate=0.25)
+
+    assert policy.should_capture(span_with_trace_id(1))
+    assert not policy.should_capture(span_with_trace_id((1 << 63) + 5))
+    assert not PayloadCapturePolicy(mode=CaptureMode.METADATA_ONLY).captures(span_with_trace_id(1), failed=True)
+    assert PayloadCapturePolicy(mode=CaptureMode.TAIL_ON_ERROR).captures(span_with_trace_id(1), failed=True)
+
+
+def test_attributes_are_truncated_per_field():
+    policy = PayloadCapturePolicy(max_field_bytes=8)
+
+    attributes = policy.attributes("input", {"short": "abc", "long": "x" * 20})
+
+    assert attributes["input.short"] == "abc"
+    assert attributes["input.long"].startswith("xxxxxxxx...")
+
+
+def test_full_capture_sends_inputs_and_outputs_in_events_only(tracer, use_policy, mocker):
+    use_policy(PayloadCapturePolicy())
+    preview = mocker.patch("agentifyme.worker.telemetry.capture.payload_preview")
+    events = []
+
+    assert instrumented(lambda text: {"summary": text[:3]}, events)("hello") == {"summary": "hel"}
+
+    assert [e["input"] for e in events] == [{"text": "hello"}, {"text": "hello"}]
+    assert events[1]["output"] == {"summary": "hel"}
+    preview.assert_not_called()
+    assert "input.text" not in tracer.get_finished_spans()[0].attributes
+
+
+def test_head_sampled_capture_records_inputs_and_outputs(tracer, use_policy):
+    use_policy(PayloadCapturePolicy(mode=CaptureMode.HEAD_SAMPLED, max_field_bytes=64))
+    events = []
+
+    instrumented(lambda text: {"summary": text[:3]}, events)("hello")
+
+    assert events[1]["output"] == {"summary": "hel"}
+    span = tracer.get_finished_spans()[0]
+    assert span.attributes["input.text"] == "hello"
+    assert span.attributes["output.summary"] == "hel"
+
+
+def test_metadata_only_skips_serialization(tracer, use_policy, mocker):
+    use_policy(PayloadCapturePolicy(mode=CaptureMode.METADATA_ONLY))
+    preview = mocker.patch("agentifyme.worker.telemetry.capture.payload_preview")
+    events = []
+
+    instrumented(lambda text: text, events)("hello")
+
+    assert all("input" not in e and "output" not in e for e in events)
+    preview.assert_not_called()
+    assert "input.text" not in tracer.get_finished_spans()[0].attributes
+
+
+def test_tail_on_error_captures_failed_calls_only(tracer, use_policy):
+    use_policy(PayloadCapturePolicy(mode=CaptureMode.TAIL_ON_ERROR))
+    events = []
+
+    def fail(text):
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        instrumented(fail, events)("hello")
+
+    assert "input" not in events[0]
+    assert events[1]["input"] == {"text": "hello"}
+    assert events[1]["error"] == "bad input"
+    assert tracer.get_finished_spans()[0].attributes["input.text"] == "hello"
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agentifyme.ml.llm import (
+    LanguageModel,
+    LanguageModelResponse,
+    LanguageModelType,
+    Message,
+    Role,
+)
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.telemetry import language_model
+from agentifyme.worker.telemetry.language_model import llm_stream_telemetry
+
+MESSAGES = [Message(role=Role.USER, content="Count to three")]
+
+
+class StreamingLanguageModel(LanguageModel):
+    def __init__(self):
+        super().__init__(LanguageModelType.OPENAI_GPT4o_MINI)
+        self.closed = False
+
+    def generate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        return LanguageModelResponse(message="1 2 3")
+
+    async def agenerate(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        return LanguageModelResponse(message="1 2 3")
+
+    def generate_stream(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        yield from (LanguageModelResponse(message=token) for token in ["1", "2", "3"])
+
+    async def agenerate_stream(self, messages, tools=None, max_tokens=256, temperature=0.5, top_p=1.0, **kwargs):
+        try:
+            for token in ["1", "2", "3"]:
+                await asyncio.sleep(0.01)
+                yield LanguageModelResponse(message=token)
+            yield LanguageModelResponse(message=None)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def spans(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch("agentifyme.worker.telemetry.language_model.trace.get_tracer", return_value=provider.get_tracer("test"))
+    return exporter
+
+
+@pytest.fixture
+def histograms(mocker):
+    return (
+        mocker.patch.object(language_model, "time_to_first_token"),
+        mocker.patch.object(language_model, "inter_token_latency"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_streams_record_time_to_first_token_and_inter_token_latency(spans, histograms):
+    model = StreamingLanguageModel()
+    stream = llm_stream_telemetry("agenerate_stream", CallbackHandler())(StreamingLanguageModel.agenerate_stream)
+
+    chunks = [chunk async for chunk in stream(model, MESSAGES)]
+
+    time_to_first_token, inter_token_latency = histograms
+    assert [chunk.message for chunk in chunks] == ["1", "2", "3", None]
+    assert time_to_first_token.record.call_count == 1
+    assert inter_token_latency.record.call_count == 2
+    assert all(call.args[0] >= 5 for call in inter_token_latency.record.call_args_list)
+    (span,) = spans.get_finished_spans()
+    assert span.name == "openai.agenerate_stream"
+    assert span.attributes["llm.time_to_first_token"] >= 5
+    assert span.attributes["llm.stream.chunks"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stopping_an_instrumented_stream_closes_the_provider_stream(spans, histograms):
+    model = StreamingLanguageModel()
+    stream = llm_stream_telemetry("agenerate_stream", CallbackHandler())(StreamingLanguageModel.agenerate_stream)(model, MESSAGES)
+
+    assert (await anext(stream)).message == "1"
+    await stream.aclose()
+
+    assert model.closed
+    assert len(spans.get_finished_spans()) == 1
+
+
+def test_sync_streams_are_timed(spans, histograms):
+    stream = llm_stream_telemetry("generate_stream", CallbackHandler())(StreamingLanguageModel.generate_stream)
+
+    assert [chunk.message for chunk in stream(StreamingLanguageModel(), MESSAGES)] == ["1", "2", "3"]
+    assert histograms[0].record.call_count == 1
+    assert histograms[1].record.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_models_without_async_streaming_yield_one_chunk():
+    class NonStreamingModel(StreamingLanguageModel):
+        agenerate_stream = LanguageModel.agenerate_stream
+
+    chunks = [chunk async for chunk in NonStreamingModel().agenerate_stream(MESSAGES)]
+
+    assert [chunk.message for chunk in chunks] == ["1 2 3"]
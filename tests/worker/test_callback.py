@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from agentifyme.worker.callback import CallbackHandler, Event, EventStage, EventType
+
+
+@pytest.mark.asyncio
+async def test_sync_callbacks_run_inline_in_registration_order():
+    handler = CallbackHandler()
+    calls = []
+    handler.register("task", lambda data: calls.append(("type", data["event_stage"])))
+    handler.register("task", lambda data: calls.append(("stage", data["event_stage"])), "completed")
+    handler.register_default(lambda data: calls.append(("default", data["event_name"])))
+
+    handler.fire_event("task.run", "completed", {"name": "t"})
+
+    assert calls == [("stage", "completed"), ("type", "completed"), ("default", "task.run.completed")]
+    assert not handler._tasks
+
+
+@pytest.mark.asyncio
+async def test_sync_callbacks_are_called_before_async_ones_of_the_same_event():
+    handler = CallbackHandler()
+    calls = []
+
+    async def on_stage(data):
+        calls.append(("async", data["step"]))
+
+    class OnType:
+        async def __call__(self, data):
+            calls.append(("async callable", data["step"]))
+
+    handler.register("task", on_stage, "started")
+    handler.register("task", OnType())
+    handler.register_default(lambda data: calls.append(("sync", data["step"])))
+
+    handler.fire_event("task.run", "started", {"step": 1})
+    handler.fire_event("task.run", "completed", {"step": 2})
+    await asyncio.gather(*handler._tasks)
+
+    # registered last, the sync default callback still gets both events first
+    assert calls[:2] == [("sync", 1), ("sync", 2)]
+    assert sorted(calls[2:]) == [("async", 1), ("async callable", 1), ("async callable", 2)]
+
+
+@pytest.mark.asyncio
+async def test_async_callbacks_are_scheduled():
+    handler = CallbackHandler()
+    received = []
+
+    async def on_event(data):
+        received.append(data)
+
+    handler.register("workflow", on_event, "initiated")
+    handler.fire_event("workflow.execution", "initiated", {"input": {"a": 1}})
+    handler.fire_event("workflow.execution", "finished", {})
+
+    assert received == []
+    await asyncio.sleep(0)
+    assert received == [{"event_type": "workflow", "event_stage": "initiated", "event_name": "workflow.execution.initiated", "input": {"a": 1}}]
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_stop_others():
+    handler = CallbackHandler()
+    received = []
+
+    def failing(data):
+        raise RuntimeError("boom")
+
+    async def on_event(data):
+        received.append(data["event_name"])
+
+    handler.register_default(failing)
+    handler.register_default(on_event)
+    handler.register_default(lambda _: received.append("sync"))
+
+    await handler.fire_event_async("llm", "started", {})
+    await handler.notify(Event(EventType.LLM, EventStage.COMPLETED, "llm.completed", {}))
+
+    assert received == ["sync", "llm.started", "sync", "llm.completed"]
+
+
+def test_fire_event_without_running_loop():
+    handler = CallbackHandler()
+    received = []
+
+    async def on_event(data):
+        received.append(data["event_stage"])
+
+    handler.register_default(on_event)
+    handler.fire_event("tool", "finished", {})
+
+    assert received == ["finished"]
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+
+import grpc
+import pytest
+
+import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
+from agentifyme.worker.event_sender import EventSender
+from agentifyme.worker.spool import EventSpool
+
+
+def identity(event):
+    return event
+
+
+@pytest.mark.asyncio
+async def test_next_batch_drains_up_to_max_batch_size():
+    queue = asyncio.Queue()
+    for i in range(25):
+        queue.put_nowait({"i": i})
+
+    sender = EventSender(queue, identity, max_batch_size=10, max_batch_delay=0)
+    batch = await sender.next_batch(asyncio.Event())
+
+    assert [e["i"] for e in batch] == list(range(10))
+    assert queue.qsize() == 15
+
+
+@pytest.mark.asyncio
+async def test_next_batch_waits_for_first_event():
+    queue = asyncio.Queue()
+    sender = EventSender(queue, identity, max_batch_size=10, max_batch_delay=0.05)
+
+    async def produce():
+        await asyncio.sleep(0.01)
+        queue.put_nowait({"i": 0})
+        await asyncio.sleep(0.01)
+        queue.put_nowait({"i": 1})
+
+    producer = asyncio.create_task(produce())
+    batch = await sender.next_batch(asyncio.Event())
+    await producer
+
+    assert [e["i"] for e in batch] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batch_in_order_and_skips_unencodable_events(fake_stream):
+    sender = EventSender(asyncio.Queue(), lambda e: None if e.get("skip") else e)
+    stream = fake_stream()
+
+    await sender.flush(stream, [{"i": 0}, {"skip": True}, {"i": 1}])
+
+    assert stream.messages == [{"i": 0}, {"i": 1}]
+    assert sender.get_metrics()["last_event_batch_size"] == 2
+    assert sender.get_metrics()["num_events_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_encodes_batches_off_the_event_loop(fake_stream):
+    threads = []
+
+    def encode(event):
+        threads.append(threading.get_ident())
+        return event
+
+    sender = EventSender(asyncio.Queue(), encode)
+    await sender.flush(fake_stream(), [{"i": 0}])
+
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_unsent_events_on_stream_error(fake_stream):
+    queue = asyncio.Queue()
+    sender = EventSender(queue, identity, max_batch_delay=0)
+    stream = fake_stream(fail_after=2)
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        await sender.flush(stream, [{"i": i} for i in range(5)])
+
+    assert sender.queue_depth == 3
+
+    queue.put_nowait({"i": 5})
+    batch = await sender.next_batch(asyncio.Event())
+    await sender.flush(stream, batch)
+
+    assert [m["i"] for m in stream.messages] == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_unsent_events_are_not_encoded_again(fake_stream):
+    sequence = iter(range(100))
+    encoded = []
+
+    def encode(event):
+        encoded.append(event["i"])
+        return {**event, "sequence": next(sequence)}
+
+    queue = asyncio.Queue()
+    sender = EventSender(queue, encode, max_batch_delay=0)
+    stream = fake_stream(fail_after=2)
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        await sender.flush(stream, [{"i": i} for i in range(5)])
+    assert sender.events_sent == 2
+
+    await sender.flush(stream, await sender.next_batch(asyncio.Event()))
+
+    assert encoded == list(range(5))
+    assert [m["sequence"] for m in stream.messages] == list(range(5))
+    assert sender.events_sent == 5
+
+
+@pytest.mark.asyncio
+async def test_run_sends_all_events_until_shutdown(fake_stream):
+    queue = asyncio.Queue()
+    sender = EventSender(queue, identity, max_batch_size=8)
+    stream = fake_stream()
+    shutdown_event = asyncio.Event()
+
+    async def wait_for_stream():
+        return stream
+
+    for i in range(50):
+        queue.put_nowait({"i": i})
+
+    task = asyncio.create_task(sender.run(wait_for_stream, shutdown_event))
+    while len(stream.messages) < 50:
+        await asyncio.sleep(0.001)
+    shutdown_event.set()
+    await asyncio.wait_for(task, timeout=2)
+
+    assert [m["i"] for m in stream.messages] == list(range(50))
+    assert sender.batches_sent < 50
+
+
+@pytest.mark.asyncio
+async def test_spooled_events_are_replayed_in_order_after_stream_error(tmp_path, fake_stream):
+    spool = EventSpool(str(tmp_path))
+    sender = EventSender(asyncio.Queue(), lambda e: pb.InboundWorkerMessage(msg_id=str(e["i"])), max_batch_size=10, spool=spool)
+    for i in range(5):
+        sender.append({"i": i})
+    assert spool.unread == 0 and sender.queue_depth == 5
+    await sender.write_appended()
+
+    stream = fake_stream(fail_after=2)
+    with pytest.raises(grpc.aio.AioRpcError):
+        await sender.flush_spooled(stream, await sender.next_spooled_batch(asyncio.Event()))
+
+    assert spool.acked_offset == 2
+    assert sender.queue_depth == 3
+
+    sender.append({"i": 5})
+    await sender.write_appended()
+    await sender.flush_spooled(stream, await sender.next_spooled_batch(asyncio.Event()))
+
+    assert [m.msg_id for m in stream.messages] == [str(i) for i in range(6)]
+    assert spool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_close_writes_appended_events_to_the_spool(tmp_path):
+    sender = EventSender(asyncio.Queue(), lambda e: pb.InboundWorkerMessage(msg_id=str(e["i"])), spool=EventSpool(str(tmp_path)))
+    sender.append({"i": 0})
+    sender.close()
+
+    assert [pb.InboundWorkerMessage.FromString(data).msg_id for _, data in EventSpool(str(tmp_path)).read(10)] == ["0"]
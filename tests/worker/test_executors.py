@@ -0,0 +1,175 @@
+import asyncio
+import os
+import threading
+
+import orjson
+import pytest
+
+from agentifyme.components.workflow import ExecutionMode, WorkflowConfig, workflow
+from agentifyme.errors import AgentifyMeError, ErrorCategory, ErrorSeverity
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.executors import WorkflowExecutor
+from agentifyme.worker.workflows import (
+    WorkflowHandler,
+    WorkflowJob,
+    run_workflow_in_process,
+)
+
+
+@pytest.fixture(autouse=True)
+def register_workflows():
+    WorkflowConfig.reset_registry()
+
+    @workflow(name="executor-thread-workflow", execution_mode="thread")
+    def thread_workflow(value: int) -> dict:
+        return {"value": value * 2, "thread": threading.current_thread().name}
+
+    @workflow(name="executor-failing-workflow", execution_mode=ExecutionMode.PROCESS)
+    def failing_workflow(value: int) -> dict:
+        raise ValueError(f"bad value {value}")
+
+
+def test_workflow_decorator_stores_execution_mode():
+    config = WorkflowConfig.get("executor-thread-workflow").config
+    assert config.execution_mode == ExecutionMode.THREAD
+    assert config.to_dict()["execution_mode"] == "thread"
+
+    with pytest.raises(ValueError):
+        workflow(lambda: None, execution_mode="fork")
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_runs_off_the_event_loop_thread():
+    executor = WorkflowExecutor()
+    try:
+        handler = WorkflowHandler(WorkflowConfig.get("executor-thread-workflow"), executor)
+        job = await handler(WorkflowJob(run_id="run-1", workflow_name="executor-thread-workflow", input_parameters={"value": 21}, metadata={}))
+    finally:
+        executor.shutdown()
+
+    assert job.success
+    assert job.output["value"] == 42
+    assert job.output["thread"].startswith("agentifyme-workflow")
+
+
+@pytest.mark.asyncio
+async def test_handler_without_executor_runs_inline():
+    handler = WorkflowHandler(WorkflowConfig.get("executor-thread-workflow"))
+    assert handler.execution_mode == ExecutionMode.INLINE
+
+    job = await handler(WorkflowJob(run_id="run-2", workflow_name="executor-thread-workflow", input_parameters={"value": 1}, metadata={}))
+    assert job.output["thread"] == threading.current_thread().name
+
+
+def test_run_workflow_in_process_returns_error_envelope():
+    payload = orjson.loads(run_workflow_in_process("executor-failing-workflow", orjson.dumps({"value": 3})))
+    assert payload["status"] == "error"
+    assert "bad value 3" in payload["error"]["message"]
+
+    payload = orjson.loads(run_workflow_in_process("executor-thread-workflow", orjson.dumps({"value": 3})))
+    assert payload == {"status": "success", "data": {"value": 6, "thread": threading.current_thread().name}}
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_uses_pool_processes():
+    executor = WorkflowExecutor(max_processes=1)
+    try:
+        executor.start_process_pool()
+        pid = await executor.run_in_process(os.getpid)
+    finally:
+        executor.shutdown()
+
+    assert pid != os.getpid()
+
+
+PROJECT_MODULE = """
+import time
+
+from agentifyme import task, workflow
+
+
+@task(name="relay-task")
+def double(value: int) -> int:
+    return value * 2
+
+
+@workflow(name="relay-workflow")
+def relay_workflow(value: int) -> dict:
+    return {"value": double(value)}
+
+
+@workflow(name="slow-relay-workflow")
+def slow_relay_workflow(value: int, started: str) -> dict:
+    open(started, "w").close()
+    time.sleep(0.5)
+    return {"value": double(value)}
+"""
+
+
+@pytest.mark.asyncio
+async def test_process_mode_relays_callback_events(tmp_path):
+    package = tmp_path / "relay_project"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "flows.py").write_text(PROJECT_MODULE)
+
+    events = []
+    callback_handler = CallbackHandler()
+    callback_handler.register_default(events.append)
+    executor = WorkflowExecutor(str(tmp_path), max_processes=1, callback_handler=callback_handler)
+    try:
+        payload = orjson.loads(await executor.run_in_process(run_workflow_in_process, "relay-workflow", orjson.dumps({"value": 2})))
+        for _ in range(200):
+            if len(events) >= 4:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        executor.shutdown()
+
+    assert payload == {"status": "success", "data": {"value": 4}}
+    assert [(event["event_type"], event["event_stage"]) for event in events] == [
+        ("workflow", "started"),
+        ("task", "started"),
+        ("task", "completed"),
+        ("workflow", "completed"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_without_wait_relays_the_events_of_running_jobs(tmp_path):
+    package = tmp_path / "relay_project"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "flows.py").write_text(PROJECT_MODULE)
+
+    events = []
+    callback_handler = CallbackHandler()
+    callback_handler.register_default(events.append)
+    executor = WorkflowExecutor(str(tmp_path), max_processes=1, callback_handler=callback_handler)
+    started = tmp_path / "started"
+    executor.process_pool.submit(run_workflow_in_process, "slow-relay-workflow", orjson.dumps({"value": 2, "started": str(started)}))
+    for _ in range(1000):
+        if started.exists():
+            break
+        await asyncio.sleep(0.01)
+    relay_thread = executor._relay_thread
+
+    executor.shutdown(wait=False)
+    await asyncio.to_thread(relay_thread.join, 10)
+
+    assert not relay_thread.is_alive()
+    assert (events[-1]["event_type"], events[-1]["event_stage"]) == ("workflow", "completed")
+
+
+@pytest.mark.asyncio
+async def test_process_errors_keep_category_and_severity(mocker):
+    error = AgentifyMeError(message="bad input", category=ErrorCategory.VALIDATION, severity=ErrorSeverity.WARNING)
+    executor = WorkflowExecutor()
+    mocker.patch.object(executor, "run_in_process", mocker.AsyncMock(return_value=orjson.dumps({"status": "error", "error": error.as_dict})))
+    handler = WorkflowHandler(WorkflowConfig.get("executor-failing-workflow"), executor)
+
+    with pytest.raises(AgentifyMeError) as exc_info:
+        await handler(WorkflowJob(run_id="run-3", workflow_name="executor-failing-workflow", input_parameters={"value": 1}, metadata={}))
+
+    assert exc_info.value.category == ErrorCategory.VALIDATION
+    assert exc_info.value.severity == ErrorSeverity.WARNING
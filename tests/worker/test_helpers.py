@@ -0,0 +1,86 @@
+import orjson
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import MessageToDict
+
+import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
+from agentifyme.components.arguments import get_argument_plan
+from agentifyme.worker.helpers import (
+    decode_workflow_input,
+    dict_to_struct,
+    struct_to_dict,
+)
+
+PAYLOAD = {
+    "count": 3,
+    "ratio": 0.5,
+    "big": 2**60,
+    "name": "order",
+    "active": True,
+    "missing": None,
+    "items": [{"sku": "a-1", "quantity": 2}, [1, 2.5, None], []],
+    "nested": {"empty": {}},
+}
+
+
+def test_struct_to_dict_matches_message_to_dict():
+    struct = dict_to_struct(PAYLOAD)
+    result = struct_to_dict(struct)
+
+    assert result == MessageToDict(struct)
+    # Struct numbers are doubles, only the argument plan knows which are ints
+    assert isinstance(result["count"], float)
+    assert isinstance(result["items"][0]["quantity"], float)
+    assert result["missing"] is None
+
+
+def test_argument_plan_restores_declared_ints():
+    def workflow(count: int, ids: list[int], ratio: float, extra: dict) -> None:
+        pass
+
+    args = get_argument_plan(workflow).build(struct_to_dict(dict_to_struct({"count": 3, "ids": [1, 2], "ratio": 3, "extra": {"n": 3}})))
+
+    assert args == {"count": 3, "ids": [1, 2], "ratio": 3.0, "extra": {"n": 3.0}}
+    assert isinstance(args["count"], int)
+    assert all(isinstance(i, int) for i in args["ids"])
+    assert isinstance(args["extra"]["n"], float)
+
+
+def test_struct_to_dict_handles_empty_struct():
+    assert struct_to_dict(struct_pb2.Struct()) == {}
+    assert struct_to_dict(None) == {}
+
+
+def test_decode_workflow_input_by_data_format():
+    struct_request = pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_STRUCT, struct_input=dict_to_struct({"a": 1}))
+    binary_request = pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_BINARY, binary_input=orjson.dumps(PAYLOAD))
+    json_request = pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_JSON, json_input=orjson.dumps({"a": 1}).decode())
+
+    assert decode_workflow_input(struct_request) == {"a": 1}
+    assert decode_workflow_input(binary_request) == PAYLOAD
+    assert decode_workflow_input(json_request) == {"a": 1}
+    assert decode_workflow_input(pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_BINARY)) == {}
+    assert decode_workflow_input(pb.WorkflowRequest()) == {}
+
+
+def test_decode_workflow_input_falls_back_to_struct_input():
+    struct = dict_to_struct({"a": "b"})
+
+    assert decode_workflow_input(pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_JSON, struct_input=struct)) == {"a": "b"}
+    assert decode_workflow_input(pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_STRING, struct_input=struct)) == {"a": "b"}
+    assert decode_workflow_input(pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_BINARY, struct_input=struct)) == {"a": "b"}
+
+
+def test_decode_workflow_input_plain_string():
+    def summarize(text: str) -> str:
+        return text
+
+    def translate(text: str, language: str) -> str:
+        return text
+
+    request = pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_STRING, json_input="Hello there")
+    json_object = pb.WorkflowRequest(input_data_format=pb.DATA_FORMAT_STRING, json_input='{"text": "Hi"}')
+
+    assert decode_workflow_input(request, get_argument_plan(summarize)) == {"text": "Hello there"}
+    assert decode_workflow_input(request, get_argument_plan(translate)) == {"input": "Hello there"}
+    assert decode_workflow_input(request) == {"input": "Hello there"}
+    assert decode_workflow_input(json_object, get_argument_plan(summarize)) == {"text": "Hi"}
@@ -0,0 +1,46 @@
+import pytest
+
+from agentifyme.worker.payloads import (
+    BLOB_REF_KEY,
+    BlobRef,
+    FileBlobStore,
+    PayloadOffloader,
+    payload_preview,
+)
+
+
+def test_file_blob_store_is_content_addressed(tmp_path):
+    store = FileBlobStore(str(tmp_path))
+
+    ref = store.put(b"hello", "text/plain")
+    again = store.put(b"hello", "text/plain")
+
+    assert ref == again
+    assert ref.size == 5
+    assert store.exists(ref.sha256)
+    assert store.get(ref.sha256) == b"hello"
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [ref.sha256]
+
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_offloader_keeps_small_payloads_inline(tmp_path):
+    offloader = PayloadOffloader(FileBlobStore(str(tmp_path)), inline_threshold=100)
+    data = {"question": "short"}
+
+    assert offloader.offload(data) is data
+    assert offloader.offload(b"abc") == b"abc"
+
+    ref = offloader.offload({"document": "x" * 200})
+    assert isinstance(ref, BlobRef)
+    assert ref.content_type == "application/json"
+    assert offloader.store.get(ref.sha256) == b'{"document":"' + b"x" * 200 + b'"}'
+    assert ref.as_dict()[BLOB_REF_KEY]["sha256"] == ref.sha256
+
+
+def test_payload_preview_truncates():
+    assert payload_preview({"a": 1}) == '{"a":1}'
+
+    preview = payload_preview("é" * 100, limit=11)
+    assert preview == "ééééé... [truncated, 200 bytes]"
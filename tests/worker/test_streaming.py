@@ -0,0 +1,87 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic import BaseModel
+
+import agentifyme.worker.pb.api.v1.gateway_pb2 as pb
+from agentifyme.components.workflow import WorkflowConfig, workflow
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.worker_service import WorkerService
+from agentifyme.worker.workflows import WorkflowHandler, WorkflowJob
+
+
+class Token(BaseModel):
+    text: str
+
+
+@pytest.fixture(autouse=True)
+def register_workflows():
+    registry = dict(WorkflowConfig.get_registry())
+
+    @workflow(name="stream-words")
+    async def stream_words(text: str) -> AsyncIterator[str]:
+        for word in text.split():
+            yield word + " "
+
+    @workflow(name="stream-tokens")
+    async def stream_tokens(count: int) -> AsyncIterator[Token]:
+        for i in range(count):
+            yield {"text": str(i)}
+
+    yield
+    WorkflowConfig._registry = registry
+
+
+def make_job(name: str, **input_parameters) -> WorkflowJob:
+    return WorkflowJob(run_id="run-1", workflow_name=name, input_parameters=input_parameters, metadata={})
+
+
+@pytest.mark.asyncio
+async def test_decorated_async_generator_streams_chunks():
+    config = WorkflowConfig.get("stream-words").config
+    assert config.is_streaming and config.is_async
+
+    chunks = [chunk async for chunk in config.func(text="a b")]
+    assert chunks == ["a ", "b "]
+
+
+@pytest.mark.asyncio
+async def test_handler_forwards_chunks_and_aggregates_output():
+    received = []
+
+    async def on_chunk(index, chunk):
+        received.append((index, chunk))
+
+    job = await WorkflowHandler(WorkflowConfig.get("stream-words"))(make_job("stream-words", text="hello streaming world"), on_chunk=on_chunk)
+
+    assert received == [(0, "hello "), (1, "streaming "), (2, "world ")]
+    assert job.success
+    assert job.output == "hello streaming world "
+
+
+@pytest.mark.asyncio
+async def test_structured_chunks_are_validated_and_collected():
+    job = await WorkflowHandler(WorkflowConfig.get("stream-tokens"))(make_job("stream-tokens", count=2))
+
+    assert job.output == {"chunks": [{"text": "0"}, {"text": "1"}]}
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_sent_as_runtime_events_with_flow_control():
+    service = WorkerService(object(), CallbackHandler(), "localhost:0", "project", "deployment", "worker", max_queued_events=1)
+    forward = service._chunk_forwarder({"request.id": "run-1", "step_id": "step-1"})
+
+    await forward(0, "hello ")
+    second = asyncio.create_task(forward(1, "world "))
+    await asyncio.sleep(0.01)
+    # the queue is full, so the workflow is held back until the first chunk is taken
+    assert not second.done()
+
+    first = service._build_event_message(service.events_queue.get_nowait())
+    await asyncio.wait_for(second, timeout=1)
+
+    assert first.event.event_stage == pb.RuntimeEventStage.RUNTIME_EVENT_STAGE_STARTED
+    assert first.event.metadata["stream.chunk_index"] == "0"
+    assert first.event.string_output == "hello "
+    assert service.events_queue.get_nowait()["chunk_index"] == 1
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+
+from agentifyme.worker import supervisor
+from agentifyme.worker.entrypoint import parse_args
+from agentifyme.worker.supervisor import WorkerSupervisor, health_file_for
+
+
+@pytest.fixture(autouse=True)
+def health_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(supervisor, "HEALTH_DIR", tmp_path)
+    return tmp_path
+
+
+def healthy_worker(worker_id: str) -> int:
+    health_file_for(worker_id).write_text("1")
+    time.sleep(30)
+    return 0
+
+
+def crashing_worker(worker_id: str) -> int:
+    return 3
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_children_get_suffixed_worker_ids_and_aggregate_health():
+    sup = WorkerSupervisor("worker", 2, healthy_worker)
+    try:
+        sup.check_children()
+        assert {p.pid for p in sup.children.values()}.isdisjoint({os.getpid()})
+        assert wait_until(lambda: health_file_for("worker-0").exists() and health_file_for("worker-1").exists())
+
+        sup.update_health_status()
+        assert sup.health_file.exists()
+
+        sup.children[1].kill()
+        sup.children[1].join()
+        sup.update_health_status()
+        assert not sup.health_file.exists()
+    finally:
+        sup.shutdown(timeout=2)
+
+    assert not health_file_for("worker-0").exists()
+
+
+def test_crashed_children_are_restarted_with_backoff():
+    sup = WorkerSupervisor("worker", 1, crashing_worker)
+    try:
+        sup.check_children()
+        first = sup.children[0]
+        first.join()
+        assert first.exitcode == 3
+
+        sup.check_children()
+        assert sup.restarts[0] == 1
+        assert 0 not in sup.children
+
+        sup._next_start[0] = 0
+        sup.check_children()
+        assert sup.children[0].pid != first.pid
+    finally:
+        sup.shutdown(timeout=2)
+
+
+def test_parse_processes_argument(monkeypatch):
+    monkeypatch.delenv("AGENTIFYME_WORKER_PROCESSES", raising=False)
+    assert parse_args([]).processes == 1
+    assert parse_args(["--processes", "4"]).processes == 4
@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+
+from agentifyme.components.checkpoint import SQLiteCheckpointStore
+from agentifyme.components.task import TaskConfig, task
+from agentifyme.components.workflow import WorkflowConfig, workflow
+from agentifyme.worker import payloads, worker_service
+from agentifyme.worker.callback import CallbackHandler
+from agentifyme.worker.payloads import BLOB_REF_KEY, FileBlobStore, PayloadOffloader
+from agentifyme.worker.spool import EventSpool
+from agentifyme.worker.worker_service import QueueFullPolicy, WorkerService
+from agentifyme.worker.workflows import WorkflowHandler, WorkflowJob
+
+
+class FakeWorkerStream:
+    def __init__(self):
+        self.messages = []
+
+    async def write(self, msg):
+        self.messages.append(msg)
+
+
+class FakeGatewayServiceStub:
+    def __init__(self):
+        self.stream = FakeWorkerStream()
+
+    def WorkerStream(self):
+        return self.stream
+
+
+def make_service(**kwargs) -> WorkerService:
+    stub = FakeGatewayServiceStub()
+    service = WorkerService(stub, CallbackHandler(), "localhost:0", "project", "deployment", "worker", **kwargs)
+    service._stream = stub.stream
+    service.connected = True
+    return service
+
+
+def make_job(run_id: str) -> WorkflowJob:
+    return WorkflowJob(run_id=run_id, workflow_name="wf", input_parameters={}, metadata={})
+
+
+@pytest.mark.asyncio
+async def test_reject_policy_nacks_when_jobs_queue_is_full():
+    service = make_service(max_queued_jobs=2, queue_full_policy="reject")
+
+    assert await service._enqueue_job(make_job("run_1"))
+    assert await service._enqueue_job(make_job("run_2"))
+    assert service.is_saturated
+    assert not await service._enqueue_job(make_job("run_3"))
+
+    assert service.jobs_queue.qsize() == 2
+    status = service._stream.messages[-1].worker_status
+    assert status.state == 2  # WORKER_STATE_BUSY
+
+    rejected = await asyncio.wait_for(service.events_queue.get(), timeout=1)
+    assert rejected["request.id"] == "run_3"
+    assert rejected["error"]["error_code"] == "WORKER_SATURATED"
+
+
+@pytest.mark.asyncio
+async def test_shed_oldest_policy_replaces_oldest_job():
+    service = make_service(max_queued_jobs=2, queue_full_policy=QueueFullPolicy.SHED_OLDEST)
+
+    for run_id in ("run_1", "run_2", "run_3"):
+        assert await service._enqueue_job(make_job(run_id))
+
+    queued = [service.jobs_queue.get_nowait().run_id for _ in range(2)]
+    assert queued == ["run_2", "run_3"]
+
+    assert (await asyncio.wait_for(service.events_queue.get(), timeout=1))["request.id"] == "run_1"
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_free_slot():
+    service = make_service(max_queued_jobs=1)
+    await service._enqueue_job(make_job("run_1"))
+
+    blocked = asyncio.create_task(service._enqueue_job(make_job("run_2")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    service.jobs_queue.get_nowait()
+    assert await asyncio.wait_for(blocked, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_capacity_metrics():
+    service = make_service(max_workers=4, max_queued_jobs=3)
+    await service._enqueue_job(make_job("run_1"))
+
+    metrics = service.get_capacity_metrics()
+    assert metrics["max_concurrent_jobs"] == 4
+    assert metrics["available_job_slots"] == 4
+    assert metrics["available_queue_slots"] == 2
+    assert metrics["saturated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_event_reuses_initiated_input_struct(mocker):
+    service = make_service()
+    input_parameters = {"question": "hi", "limit": 3}
+    attributes = {"request.id": "req-1", "step_id": "step-1", "event_type": "workflow"}
+    to_struct = mocker.spy(worker_service, "to_struct")
+
+    initiated = service._build_event_message({**attributes, "event_stage": "initiated", "input": input_parameters})
+    finished = service._build_event_message({**attributes, "event_stage": "finished", "input": input_parameters, "output": {"answer": "ok"}})
+
+    # once for the input, once for the output
+    assert to_struct.call_count == 2
+    assert finished.event.struct_input == initiated.event.struct_input
+    assert finished.event.struct_output.fields["answer"].string_value == "ok"
+    assert service._encoded_inputs == {}
+
+
+@pytest.mark.asyncio
+async def test_finished_event_reencodes_a_different_input():
+    service = make_service()
+    attributes = {"request.id": "req-1", "step_id": "step-1", "event_type": "workflow"}
+
+    service._build_event_message({**attributes, "event_stage": "initiated", "input": {"value": 1}})
+    finished = service._build_event_message({**attributes, "event_stage": "finished", "input": {"value": 2}})
+
+    assert finished.event.struct_input.fields["value"].number_value == 2
+
+
+@pytest.mark.asyncio
+async def test_large_payloads_are_sent_as_blob_references(tmp_path):
+    store = FileBlobStore(str(tmp_path))
+    service = make_service(payload_offloader=PayloadOffloader(store, inline_threshold=64))
+    attributes = {"request.id": "req-1", "step_id": "step-1", "event_type": "workflow", "event_stage": "finished"}
+
+    message = service._build_event_message({**attributes, "input": {"q": "small"}, "output": {"document": "x" * 100}})
+
+    assert message.event.struct_input.fields["q"].string_value == "small"
+    ref = message.event.struct_output.fields[BLOB_REF_KEY].struct_value.fields
+    assert ref["size"].number_value > 64
+    assert store.get(ref["sha256"].string_value).startswith(b'{"document":"xxx')
+
+
+@pytest.mark.asyncio
+async def test_small_payloads_are_not_serialized_for_their_size(tmp_path, mocker):
+    service = make_service(payload_offloader=PayloadOffloader(FileBlobStore(str(tmp_path)), inline_threshold=64))
+    serialize = mocker.spy(payloads, "serialize_payload")
+    attributes = {"request.id": "req-1", "step_id": "step-1", "event_type": "workflow", "event_stage": "finished"}
+
+    message = service._build_event_message({**attributes, "input": {"q": "small"}, "output": "ok"})
+
+    assert serialize.call_count == 0
+    assert message.event.struct_input.fields["q"].string_value == "small"
+
+
+@pytest.mark.asyncio
+async def test_callback_events_are_queued_without_tasks():
+    service = make_service(max_queued_events=1)
+
+    service.callback_handler.fire_event("task.run", "started", {"name": "t"})
+    assert service.events_queue.qsize() == 1
+    assert service._overflow_task is None
+
+    # full queue: wait for space in the background, keeping the order
+    service.callback_handler.fire_event("task.run", "completed", {"name": "t"})
+    service.callback_handler.fire_event("task.run", "finished", {"name": "t"})
+    assert len(service._overflow_events) == 2
+
+    stages = []
+    for _ in range(3):
+        stages.append((await asyncio.wait_for(service.events_queue.get(), timeout=1))["event_stage"])
+    assert stages == ["started", "completed", "finished"]
+
+
+@pytest.mark.asyncio
+async def test_events_are_numbered_per_run():
+    service = make_service()
+
+    def sequence(run_id, stage, event_type="task"):
+        message = service._build_event_message({"request.id": run_id, "event_type": event_type, "event_stage": stage})
+        return message.event.metadata["event.sequence"]
+
+    assert [sequence("a", "started"), sequence("b", "started"), sequence("a", "completed")] == ["1", "1", "2"]
+    assert sequence("a", "finished", "workflow") == "3"
+    assert "a" not in service._run_sequences
+
+
+@pytest.mark.asyncio
+async def test_spooled_events_bypass_the_events_queue(tmp_path):
+    spool = EventSpool(str(tmp_path))
+    service = make_service(event_spool=spool)
+
+    service.callback_handler.fire_event("task.run", "started", {"request.id": "a"})
+
+    assert service.events_queue.empty()
+    assert service.event_sender.queue_depth == 1
+    await service.event_sender.write_appended()
+    assert spool.pending == 1
+
+
+@pytest.mark.asyncio
+async def test_retried_job_replays_checkpointed_tasks(tmp_path):
+    workflow_registry = dict(WorkflowConfig.get_registry())
+    task_registry = dict(TaskConfig.get_registry())
+    calls = []
+    attempts = []
+
+    @task
+    async def call_llm(prompt: str) -> str:
+        calls.append(prompt)
+        return prompt[::-1]
+
+    @workflow(name="checkpointed-wf")
+    async def checkpointed_wf(prompt: str) -> str:
+        answer = await call_llm(prompt)
+        attempts.append(answer)
+        if len(attempts) == 1:
+            raise ConnectionError("stream reset")
+        return answer
+
+    try:
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+        service = make_service(checkpoint_store=store)
+        service._workflow_handlers = {"checkpointed-wf": WorkflowHandler(WorkflowConfig.get("checkpointed-wf"))}
+
+        def make_run():
+            return WorkflowJob(run_id="run-1", workflow_name="checkpointed-wf", input_parameters={"prompt": "abc"}, metadata={})
+
+        await service._handle_job(make_run())
+        assert calls == ["abc"]
+        assert store._conn.execute("SELECT COUNT(*) FROM checkpoints WHERE run_id = 'run-1'").fetchone() == (1,)
+
+        await service._handle_job(make_run())
+        assert calls == ["abc"]
+        assert attempts == ["cba", "cba"]
+
+        # the run succeeded, so its checkpoints are dropped
+        assert store._conn.execute("SELECT COUNT(*) FROM checkpoints WHERE run_id = 'run-1'").fetchone() == (0,)
+    finally:
+        WorkflowConfig._registry = workflow_registry
+        TaskConfig._registry = task_registry